@@ -0,0 +1,11 @@
+"""
+Core rekomendasi mata kuliah tanpa Streamlit.
+
+Modul-modul di paket ini hanya meng-import library standar dan numpy di level modul;
+pandas, scikit-learn, dan TextBlob baru dimuat saat pertama kali dibutuhkan, sehingga
+worker, tes, atau profiler bisa meng-import core ini dengan cepat.
+
+    from advisor.engine import RecommendationEngine
+    engine = RecommendationEngine.from_csv()
+    result = engine.search("suka desain tapi tidak suka hitungan")
+"""
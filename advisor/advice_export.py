@@ -0,0 +1,62 @@
+"""
+Ekspor "mata kuliah -> kategori tips" untuk staf konseling, langsung dari tabel CourseDetails
+yang juga dipakai aplikasi (tanpa membangun indeks TF-IDF).
+
+Contoh:
+    python -m advisor.advice_export -o kategori_tips.csv
+    python -m advisor.advice_export -o kategori_tips.jsonl --with-tips --program "Informatika (S1)"
+"""
+import argparse
+import csv
+import json
+import sys
+from collections import Counter
+
+from .catalog import CATALOG_PATH, load_catalog
+from .content import ADVICE_TABLE, CourseDetails
+
+EXPORT_FIELDS = ['Program', 'Semester', 'Course', 'advice_category']
+TIP_FIELDS = ['advice_desc', 'advice_tip']
+
+def advice_records(df, details, with_tips=False):
+    """Satu dict per baris katalog; kategori diambil dari kode int, tanpa pencocokan string."""
+    for program, semester, course, code in zip(df['Program'], df['Semester'], df['Course'], details.advice_codes.tolist()):
+        advice = ADVICE_TABLE[code]
+        record = {'Program': program, 'Semester': int(semester), 'Course': course, 'advice_category': advice['category']}
+        if with_tips:
+            record['advice_desc'] = advice['desc']
+            record['advice_tip'] = advice['tip']
+        yield record
+
+def run(args):
+    df = load_catalog(args.catalog)
+    if args.program:
+        df = df[df['Program'] == args.program].reset_index(drop=True)
+    if df.empty:
+        sys.exit("Katalog kosong, tidak ada yang bisa diekspor.")
+    details = CourseDetails(df)
+
+    fields = EXPORT_FIELDS + (TIP_FIELDS if args.with_tips else [])
+    with open(args.output, 'w', encoding='utf-8', newline='') as out:
+        if args.output.endswith('.csv'):
+            writer = csv.DictWriter(out, fieldnames=fields)
+            writer.writeheader()
+            writer.writerows(advice_records(df, details, args.with_tips))
+        else:
+            for record in advice_records(df, details, args.with_tips):
+                out.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+    counts = Counter(details.advice_categories())
+    summary = ', '.join(f"{category}={count}" for category, count in counts.most_common())
+    print(f"{len(df)} mata kuliah ditulis ke {args.output} ({summary})", file=sys.stderr)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ekspor kategori tips per mata kuliah untuk konseling.")
+    parser.add_argument('-o', '--output', required=True, help="File hasil: .csv atau .jsonl")
+    parser.add_argument('--catalog', default=CATALOG_PATH, help="File CSV katalog mata kuliah")
+    parser.add_argument('--program', default=None, help="Hanya satu Program Studi (nama persis seperti di katalog)")
+    parser.add_argument('--with-tips', action='store_true', help="Sertakan teks deskripsi dan tips")
+    run(parser.parse_args(argv))
+
+if __name__ == '__main__':
+    main()
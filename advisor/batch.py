@@ -0,0 +1,134 @@
+"""
+Rekomendasi batch (tanpa UI) untuk ribuan jawaban survei minat sekaligus.
+
+Pipeline sama dengan tombol "Cari" di aplikasi: parse_negation -> vektor query (teks + ekspansi keyword) -> skor TF-IDF,
+tetapi semua query dalam satu chunk di-vectorize menjadi satu matriks sparse dan diskor
+dengan satu perkalian matriks terhadap katalog. Hasil top-N ditulis bertahap ke CSV/JSONL.
+
+Contoh:
+    python -m advisor.batch survei.csv -o hasil.jsonl --column jawaban --top-n 5
+    python -m advisor.batch jawaban.txt -o hasil.csv --program "Informatika (S1)"
+"""
+import argparse
+import csv
+import json
+import sys
+import time
+
+from .catalog import CATALOG_PATH, load_catalog
+from .engine import RecommendationEngine
+from .index import DEFAULT_QUERY_WEIGHTS, QueryWeights
+from .snapshot import load_engine, load_snapshot
+
+RESULT_FIELDS = ['query_id', 'query', 'rank', 'Program', 'Semester', 'Course', 'Similarity Score']
+
+def read_queries(path, column='query', id_column=None, chunk_size=1000):
+    """
+    Membaca query per chunk: list (query_id, teks).
+    CSV memakai kolom `column`, JSONL memakai key `column`, selain itu satu query per baris.
+    """
+    if path.endswith('.csv'):
+        import pandas as pd
+
+        offset = 0
+        for chunk in pd.read_csv(path, chunksize=chunk_size, dtype=str, keep_default_na=False):
+            ids = chunk[id_column] if id_column else range(offset, offset + len(chunk))
+            yield list(zip(ids, chunk[column]))
+            offset += len(chunk)
+        return
+
+    batch = []
+    with open(path, encoding='utf-8') as f:
+        for i, line in enumerate(f):
+            line = line.strip()
+            if not line:
+                continue
+            if path.endswith('.jsonl'):
+                record = json.loads(line)
+                batch.append((record.get(id_column, i) if id_column else i, record.get(column, '')))
+            else:
+                batch.append((i, line))
+            if len(batch) >= chunk_size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+def parse_query_weights(value):
+    """'1,0.5,2' -> QueryWeights(text=1.0, implicit=0.5, explicit=2.0)."""
+    parts = [float(part) for part in value.split(',')]
+    if len(parts) != len(QueryWeights._fields):
+        raise argparse.ArgumentTypeError("butuh 3 bobot: teks,implisit,eksplisit")
+    return QueryWeights(*parts)
+
+def run(args):
+    if args.snapshot:
+        engine = load_snapshot(args.snapshot, dense_weight=args.dense_weight, query_weights=args.query_weights)
+    elif args.no_snapshot:
+        engine = RecommendationEngine(load_catalog(args.catalog), dense_weight=args.dense_weight, query_weights=args.query_weights)
+    else:
+        engine = load_engine(args.catalog, dense_weight=args.dense_weight, query_weights=args.query_weights)
+    df = engine.df
+    if df.empty:
+        sys.exit("Katalog kosong, tidak ada yang bisa diskor.")
+    rows = engine.facets.select(args.program, args.semester)
+    selected_keywords = [k.strip() for k in args.keywords.split(',') if k.strip()] if args.keywords else None
+
+    as_csv = args.output.endswith('.csv')
+    total, started = 0, time.perf_counter()
+    with open(args.output, 'w', encoding='utf-8', newline='') as out:
+        writer = csv.writer(out) if as_csv else None
+        if writer:
+            writer.writerow(RESULT_FIELDS)
+        for chunk in read_queries(args.input, args.column, args.id_column, args.chunk_size):
+            ids, texts = zip(*chunk)
+            results = engine.recommend_batch(list(texts), rows, selected_keywords, args.top_n)
+            for query_id, text, (words_to_remove, ranked) in zip(ids, texts, results):
+                records = [
+                    {
+                        'Program': df.at[row, 'Program'],
+                        'Semester': int(df.at[row, 'Semester']),
+                        'Course': df.at[row, 'Course'],
+                        'Similarity Score': round(score * 100, 2),
+                    }
+                    for row, score in ranked
+                ]
+                if writer:
+                    for rank, record in enumerate(records, 1):
+                        writer.writerow([query_id, text, rank] + [record[k] for k in RESULT_FIELDS[3:]])
+                else:
+                    out.write(json.dumps({
+                        'query_id': query_id,
+                        'query': text,
+                        'excluded_words': words_to_remove,
+                        'results': records,
+                    }, ensure_ascii=False) + '\n')
+            total += len(chunk)
+            elapsed = time.perf_counter() - started
+            print(f"{total} query diproses ({total / elapsed:.1f} query/detik)", file=sys.stderr)
+
+    elapsed = time.perf_counter() - started
+    print(f"Selesai: {total} query dalam {elapsed:.2f} detik ({total / max(elapsed, 1e-9):.1f} query/detik)", file=sys.stderr)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rekomendasi mata kuliah batch dari file jawaban minat.")
+    parser.add_argument('input', help="File query: .csv, .jsonl, atau teks (satu query per baris)")
+    parser.add_argument('-o', '--output', required=True, help="File hasil: .csv atau .jsonl")
+    parser.add_argument('--column', default='query', help="Kolom/key teks query untuk input CSV/JSONL")
+    parser.add_argument('--id-column', default=None, help="Kolom/key ID responden (default: nomor baris)")
+    parser.add_argument('--catalog', default=CATALOG_PATH, help="File CSV katalog mata kuliah")
+    parser.add_argument('--snapshot', default=None, help="Direktori snapshot (mis. hasil advisor.ingest --snapshot) sebagai ganti --catalog")
+    parser.add_argument('--no-snapshot', action='store_true', help="Selalu parse CSV katalog, tanpa snapshot mmap")
+    parser.add_argument('--top-n', type=int, default=10)
+    parser.add_argument('--query-weights', type=parse_query_weights, default=DEFAULT_QUERY_WEIGHTS,
+                        help="Bobot teks,ekspansi implisit,keyword pilihan dalam vektor query, mis. 1,0.5,2 (default: 1,1,1)")
+    parser.add_argument('--dense-weight', type=float, default=None,
+                        help="Bobot skor dense LSA dalam skor hybrid, 0-1 (default: env ADVISOR_DENSE_WEIGHT, 0 = hanya TF-IDF)")
+    parser.add_argument('--chunk-size', type=int, default=1000)
+    parser.add_argument('--program', default=None, help="Filter Program Studi (nama persis seperti di katalog)")
+    parser.add_argument('--semester', type=int, default=None)
+    parser.add_argument('--keywords', default=None, help="Keyword pembantu dipisah koma, berlaku untuk semua query")
+    run(parser.parse_args(argv))
+
+if __name__ == '__main__':
+    main()
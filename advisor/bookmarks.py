@@ -0,0 +1,218 @@
+"""
+Bookmark mata kuliah per pengguna, disimpan sebagai course_id (advisor.catalog.course_ids) saja.
+
+Bookmarks adalah representasi per sesi: dict course_id -> None (urutan simpan terjaga, cek
+keanggotaan O(1)), tanpa salinan baris katalog; nama mata kuliah diambil dari engine saat dirender.
+Dengan SqliteBookmarkBackend (env ADVISOR_BOOKMARK_DB=bookmarks.sqlite) bookmark bertahan setelah
+restart: perubahan masuk antrian dan ditulis thread latar dalam satu transaksi per batch, jadi klik
+"Simpan" tidak menunggu disk.
+
+    python -m advisor.bookmarks --db bookmarks.sqlite -o bookmarks.csv   # ekspor semua bookmark
+"""
+import argparse
+import atexit
+import csv
+import json
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from collections import Counter
+
+BOOKMARK_DB_ENV = 'ADVISOR_BOOKMARK_DB'
+
+class Bookmarks:
+    """Bookmark satu pengguna; setiap perubahan diteruskan ke backend (jika ada)."""
+    def __init__(self, user, backend=None):
+        self.user = user
+        self.backend = backend
+        self._ids = dict.fromkeys(backend.load(user) if backend is not None else ())
+
+    def __contains__(self, course_id):
+        return course_id in self._ids
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __iter__(self):
+        return iter(list(self._ids))
+
+    def add(self, course_id):
+        if course_id not in self._ids:
+            self._ids[course_id] = None
+            if self.backend is not None:
+                self.backend.add(self.user, course_id)
+
+    def remove(self, course_id):
+        if course_id in self._ids:
+            del self._ids[course_id]
+            if self.backend is not None:
+                self.backend.remove(self.user, course_id)
+
+    def clear(self):
+        self._ids.clear()
+        if self.backend is not None:
+            self.backend.clear(self.user)
+
+class SqliteBookmarkBackend:
+    """
+    Tabel bookmarks(user, course_id, added_at) di SQLite (mode WAL). Penulisan lewat antrian ke satu
+    thread penulis yang menggabungkan hingga max_batch perubahan per transaksi; flush() menunggu
+    sampai antrian kosong. load(user) memakai koneksi sendiri dan hanya menunggu perubahan milik user
+    itu yang masih di antrian (hitungan per user), bukan antrian semua sesi.
+    """
+    def __init__(self, path, max_batch=500, max_wait=0.2):
+        self.path = path
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._queue = queue.Queue()
+        self._pending = Counter()
+        self._written = threading.Condition()
+        with self._connect() as connection:
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS bookmarks ('
+                'user TEXT NOT NULL, course_id INTEGER NOT NULL, added_at REAL NOT NULL, '
+                'PRIMARY KEY (user, course_id))'
+            )
+        connection.close()
+        self._writer = threading.Thread(target=self._write_loop, name='bookmark-writer', daemon=True)
+        self._writer.start()
+        # Perubahan yang masih di antrian tetap ditulis saat proses berhenti
+        atexit.register(self.close)
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+
+    def _enqueue(self, op, user, course_id, added_at):
+        with self._written:
+            self._pending[user] += 1
+        self._queue.put((op, user, course_id, added_at))
+
+    def add(self, user, course_id):
+        self._enqueue('add', user, course_id, time.time())
+
+    def remove(self, user, course_id):
+        self._enqueue('remove', user, course_id, None)
+
+    def clear(self, user):
+        self._enqueue('clear', user, None, None)
+
+    def flush(self):
+        """Menunggu semua perubahan (semua user) yang sudah masuk antrian tertulis."""
+        self._queue.join()
+
+    def close(self):
+        """flush lalu menghentikan thread penulis; backend tidak boleh dipakai lagi setelahnya."""
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+
+    def load(self, user):
+        """course_id milik user, urut waktu simpan; perubahan user ini yang masih antri ditunggu dulu."""
+        with self._written:
+            self._written.wait_for(lambda: not self._pending[user])
+        connection = self._connect()
+        try:
+            rows = connection.execute('SELECT course_id FROM bookmarks WHERE user = ? ORDER BY added_at, rowid', (user,))
+            return [course_id for course_id, in rows]
+        finally:
+            connection.close()
+
+    def export_rows(self):
+        """Semua bookmark (user, course_id, added_at), untuk ekspor massal."""
+        self.flush()
+        connection = self._connect()
+        try:
+            yield from connection.execute('SELECT user, course_id, added_at FROM bookmarks ORDER BY user, added_at, rowid')
+        finally:
+            connection.close()
+
+    def _next_batch(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch and batch[-1] is not None:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write_loop(self):
+        connection = self._connect()
+        while True:
+            batch = self._next_batch()
+            # None dari close(): tulis sisa batch ini lalu berhenti
+            changes = [change for change in batch if change is not None]
+            try:
+                # Urutan operasi dipertahankan (add lalu remove id yang sama tetap berakhir terhapus)
+                with connection:
+                    for op, user, course_id, added_at in changes:
+                        if op == 'add':
+                            connection.execute('INSERT OR IGNORE INTO bookmarks VALUES (?, ?, ?)', (user, course_id, added_at))
+                        elif op == 'remove':
+                            connection.execute('DELETE FROM bookmarks WHERE user = ? AND course_id = ?', (user, course_id))
+                        else:
+                            connection.execute('DELETE FROM bookmarks WHERE user = ?', (user,))
+            except sqlite3.Error as exc:
+                print(f"Gagal menulis {len(changes)} perubahan bookmark: {exc!r}", file=sys.stderr)
+            finally:
+                with self._written:
+                    for _, user, _, _ in changes:
+                        self._pending[user] -= 1
+                        if not self._pending[user]:
+                            del self._pending[user]
+                    self._written.notify_all()
+                for _ in batch:
+                    self._queue.task_done()
+            if len(changes) < len(batch):
+                connection.close()
+                return
+
+def export_bookmarks(backend, output, engine=None):
+    """
+    Menulis semua bookmark ke CSV/JSONL; jumlah baris yang ditulis. Dengan engine, Program/Semester/Course
+    ikut ditulis (kosong jika mata kuliah sudah tidak ada di katalog).
+    """
+    rows = list(backend.export_rows())
+    details = {}
+    if engine is not None:
+        details = {rec.course_id: rec for rec in engine.courses(sorted({course_id for _, course_id, _ in rows}))}
+    records = []
+    for user, course_id, added_at in rows:
+        rec = details.get(course_id)
+        records.append({
+            'user': user,
+            'course_id': course_id,
+            'added_at': added_at,
+            'Program': rec.program if rec else None,
+            'Semester': rec.semester if rec else None,
+            'Course': rec.course if rec else None,
+        })
+    with open(output, 'w', newline='', encoding='utf-8') as f:
+        if output.endswith('.csv'):
+            writer = csv.DictWriter(f, fieldnames=['user', 'course_id', 'added_at', 'Program', 'Semester', 'Course'])
+            writer.writeheader()
+            writer.writerows(records)
+        else:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+    return len(records)
+
+def main(argv=None):
+    from .catalog import CATALOG_PATH
+    from .snapshot import load_engine
+
+    parser = argparse.ArgumentParser(description="Ekspor semua bookmark dari database SQLite.")
+    parser.add_argument('--db', required=True, help="File SQLite bookmark (nilai ADVISOR_BOOKMARK_DB)")
+    parser.add_argument('-o', '--output', required=True, help="File hasil: .csv atau .jsonl")
+    parser.add_argument('--catalog', default=CATALOG_PATH, help="Katalog untuk melengkapi nama mata kuliah")
+    args = parser.parse_args(argv)
+
+    count = export_bookmarks(SqliteBookmarkBackend(args.db), args.output, load_engine(args.catalog))
+    print(f"{count} bookmark ditulis ke {args.output}", file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,223 @@
+"""
+Pemuatan katalog mata kuliah dan indeks baris yang dibangun sekali per katalog
+(facet Program/Semester dan inverted index untuk negasi).
+"""
+import hashlib
+import os
+import re
+from bisect import bisect_left
+
+import numpy as np
+
+CATALOG_FILENAME = 'List Mata Kuliah UBM.xlsx - Sheet1.csv'
+CATALOG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), CATALOG_FILENAME)
+CATALOG_COLUMNS = ['Program', 'Semester', 'Course', 'combined_features']
+
+def load_catalog(path=CATALOG_PATH):
+    """Membaca CSV katalog; FileNotFoundError diteruskan ke pemanggil (UI yang menampilkan pesan)."""
+    import pandas as pd
+
+    df = pd.read_csv(path)
+    df = df.dropna().reset_index(drop=True)
+    df['combined_features'] = catalog_features(df)
+    return df
+
+def catalog_features(df):
+    """Teks yang di-index per baris; dihitung dari Course + Program jika katalog tidak menyimpannya."""
+    if 'combined_features' in df:
+        return df['combined_features']
+    return df['Course'].astype(str) + ' ' + df['Program'].astype(str)
+
+def file_digest(path):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def catalog_version(df):
+    """Sidik jari isi katalog (Program, Semester, Course); berubah setiap kali isi katalog berubah."""
+    digest = hashlib.sha1()
+    for program, semester, course in zip(df['Program'], df['Semester'], df['Course']):
+        digest.update(f"{program}\t{semester}\t{course}\n".encode('utf-8'))
+    return digest.hexdigest()[:12]
+
+def course_ids(df):
+    """
+    ID stabil per baris (int64) dari isi Program, Semester, Course: sama untuk baris yang sama di
+    versi katalog mana pun dan di proses mana pun (hash pandas dengan kunci tetap, tanpa loop Python).
+    """
+    import pandas as pd
+
+    columns = pd.DataFrame({
+        'Program': df['Program'].astype(str),
+        'Semester': df['Semester'].astype(np.int64),
+        'Course': df['Course'].astype(str),
+    })
+    return pd.util.hash_pandas_object(columns, index=False).to_numpy().view(np.int64)
+
+def row_remap(n_rows, kept):
+    """Posisi lama -> posisi baru saat baris `kept` (terurut) dipertahankan; baris terhapus -> -1."""
+    remap = np.full(n_rows, -1, dtype=np.int64)
+    remap[kept] = np.arange(len(kept))
+    return remap
+
+def _remap_rows(rows, remap):
+    rows = remap[rows]
+    return rows[rows >= 0]
+
+def empty_catalog():
+    import pandas as pd
+
+    return pd.DataFrame(columns=CATALOG_COLUMNS)
+
+class FacetIndex:
+    """
+    Posisi baris per Program dan per Semester, dibangun sekali bersama load_catalog.
+    Filter sidebar cukup berupa irisan array integer, tanpa copy DataFrame.
+    """
+    def __init__(self, df):
+        self.all_rows = np.arange(len(df))
+        self.program_rows = _facet_rows(df, 'Program')
+        self.semester_rows = _facet_rows(df, 'Semester')
+        self.programs = sorted(self.program_rows)
+        self.semesters = sorted(int(s) for s in self.semester_rows)
+
+    def updated(self, kept, added_df):
+        """
+        FacetIndex baru setelah baris lama `kept` dipertahankan dan `added_df` ditambahkan di belakang.
+        Hanya baris yang berubah yang diproses; indeks lama tetap utuh untuk sesi yang sedang berjalan.
+        """
+        remap = row_remap(len(self.all_rows), kept)
+        offset = len(kept)
+        added_programs = _facet_rows(added_df, 'Program')
+        added_semesters = _facet_rows(added_df, 'Semester')
+
+        facets = FacetIndex.__new__(FacetIndex)
+        facets.all_rows = np.arange(offset + len(added_df))
+        facets.program_rows = _merge_facet(self.program_rows, added_programs, remap, offset)
+        facets.semester_rows = _merge_facet(self.semester_rows, added_semesters, remap, offset)
+        facets.programs = sorted(facets.program_rows)
+        facets.semesters = sorted(int(s) for s in facets.semester_rows)
+        return facets
+
+    def select(self, program=None, semester=None):
+        """Posisi baris (terurut) yang lolos filter; None berarti tidak difilter."""
+        rows = self.all_rows
+        if program is not None:
+            rows = self.program_rows.get(program, rows[:0])
+        if semester is not None:
+            rows = np.intersect1d(rows, self.semester_rows.get(semester, rows[:0]), assume_unique=True)
+        return rows
+
+def _facet_rows(df, column):
+    # observed=True: kategori (mis. Program hasil ingest) yang tidak punya baris tidak ikut jadi facet
+    return df.groupby(column, observed=True).indices if len(df) else {}
+
+def _merge_facet(old, added, remap, offset):
+    merged = {}
+    for key in set(old) | set(added):
+        rows = _remap_rows(old[key], remap) if key in old else np.array([], dtype=np.int64)
+        if key in added:
+            rows = np.concatenate([rows, np.asarray(added[key]) + offset])
+        if len(rows):
+            merged[key] = rows
+    return merged
+
+def _token_postings(combined_features):
+    postings = {}
+    for row, text in enumerate(combined_features):
+        for token in set(re.findall(r'\w+', str(text).lower())):
+            postings.setdefault(token, []).append(row)
+    return postings
+
+class NegationIndex:
+    """
+    Inverted index token -> posisi baris atas combined_features (lowercase).
+    Semua sufiks token disimpan terurut, sehingga pencarian prefix atas sufiks memberi
+    hasil yang sama dengan str.contains(word) tanpa memindai seluruh kolom.
+    """
+    def __init__(self, combined_features):
+        postings = _token_postings(combined_features)
+        self._set_postings({token: np.array(rows, dtype=np.int64) for token, rows in postings.items()}, len(combined_features))
+
+    @classmethod
+    def from_postings(cls, postings, n_rows):
+        """NegationIndex dari dict token -> array posisi baris (terurut) yang sudah jadi."""
+        index = cls.__new__(cls)
+        index._set_postings(postings, n_rows)
+        return index
+
+    def _set_postings(self, postings, n_rows):
+        self.n_rows = n_rows
+        self.tokens = list(postings)
+        self.postings = [postings[token] for token in self.tokens]
+        suffixes = sorted(
+            (token[i:], token_id) for token_id, token in enumerate(self.tokens) for i in range(len(token))
+        )
+        self.suffixes = [suffix for suffix, _ in suffixes]
+        self.suffix_tokens = [token_id for _, token_id in suffixes]
+
+    def updated(self, kept, added_features):
+        """NegationIndex baru: posting lama di-remap, hanya baris tambahan yang ditokenisasi."""
+        remap = row_remap(self.n_rows, kept)
+        offset = len(kept)
+        added_postings = _token_postings(added_features)
+
+        index = NegationIndex.__new__(NegationIndex)
+        index.n_rows = offset + len(added_features)
+        index.tokens = list(self.tokens)
+        index.postings = [_remap_rows(rows, remap) for rows in self.postings]
+        index.suffixes = list(self.suffixes)
+        index.suffix_tokens = list(self.suffix_tokens)
+        token_ids = {token: token_id for token_id, token in enumerate(self.tokens)}
+        for token, rows in added_postings.items():
+            rows = np.array(rows, dtype=np.int64) + offset
+            token_id = token_ids.get(token)
+            if token_id is not None:
+                index.postings[token_id] = np.concatenate([index.postings[token_id], rows])
+                continue
+            token_id = len(index.tokens)
+            index.tokens.append(token)
+            index.postings.append(rows)
+            for i in range(len(token)):
+                position = bisect_left(index.suffixes, token[i:])
+                index.suffixes.insert(position, token[i:])
+                index.suffix_tokens.insert(position, token_id)
+        return index
+
+    def rows_containing(self, word):
+        """Posisi baris yang memuat word sebagai substring (word berupa satu kata tanpa spasi)."""
+        word = word.lower()
+        token_ids = set()
+        i = bisect_left(self.suffixes, word)
+        while i < len(self.suffixes) and self.suffixes[i].startswith(word):
+            token_ids.add(self.suffix_tokens[i])
+            i += 1
+        if not token_ids:
+            return np.array([], dtype=np.int64)
+        return np.unique(np.concatenate([self.postings[t] for t in token_ids]))
+
+    def exclude(self, rows, words):
+        """rows dikurangi semua baris yang memuat salah satu kata negasi."""
+        excluded = [self.rows_containing(word) for word in words]
+        excluded = [e for e in excluded if len(e)]
+        if not excluded:
+            return rows
+        return np.setdiff1d(rows, np.concatenate(excluded))
+
+
+class NegationIndexBuilder:
+    """Posting negasi per chunk (posisi baris global); build() menggabungkan sekali di akhir."""
+    def __init__(self):
+        self.parts = {}
+        self.n_rows = 0
+
+    def add(self, combined_features):
+        for token, rows in _token_postings(combined_features).items():
+            self.parts.setdefault(token, []).append(np.array(rows, dtype=np.int64) + self.n_rows)
+        self.n_rows += len(combined_features)
+
+    def build(self):
+        postings = {token: np.concatenate(parts) for token, parts in self.parts.items()}
+        return NegationIndex.from_postings(postings, self.n_rows)
@@ -0,0 +1,129 @@
+"""
+Klien tipis untuk advisor.service: UI Streamlit memakai RemoteEngine seperti RecommendationEngine
+(search, courses, suggest, facets, version, len, result_cache.stats), tanpa memuat katalog atau indeks sendiri.
+"""
+import http.client
+import json
+import threading
+import time
+from collections import namedtuple
+from urllib.parse import urlencode, urlsplit
+
+from .engine import Recommendation, SearchResult
+from .messages import Message
+from .suggest import Suggestion
+
+SERVICE_URL_ENV = 'ADVISOR_SERVICE_URL'
+
+RemoteFacets = namedtuple('RemoteFacets', ['programs', 'semesters'])
+
+class ServiceError(Exception):
+    """Layanan rekomendasi membalas dengan status selain 200."""
+
+class ServiceConnection:
+    """Koneksi HTTP keep-alive per thread (setiap sesi Streamlit berjalan di thread sendiri)."""
+    def __init__(self, url, timeout=10.0):
+        parts = urlsplit(url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = self._local.connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        return connection
+
+    def request(self, method, path, payload=None):
+        body = json.dumps(payload).encode('utf-8') if payload is not None else None
+        headers = {'Content-Type': 'application/json'} if body is not None else {}
+        for attempt in range(2):
+            connection = self._connection()
+            try:
+                connection.request(method, path, body, headers)
+                response = connection.getresponse()
+                data = response.read()
+                break
+            except (ConnectionError, http.client.HTTPException):
+                # Koneksi keep-alive ditutup server (mis. worker di-restart): sambung ulang sekali
+                connection.close()
+                self._local.connection = None
+                if attempt:
+                    raise
+        if response.status != 200:
+            raise ServiceError(f"{method} {path}: HTTP {response.status} {data[:200]!r}")
+        return json.loads(data)
+
+class RemoteCacheStats:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def stats(self):
+        """Statistik cache hasil dari worker yang menjawab request ini."""
+        return self.connection.request('GET', '/stats')['result_cache']
+
+class RemoteEngine:
+    def __init__(self, connection, info):
+        self.connection = connection
+        self.version = info['version']
+        self.rows = info['rows']
+        self.facets = RemoteFacets(info['programs'], info['semesters'])
+        self.result_cache = RemoteCacheStats(connection)
+
+    def __len__(self):
+        return self.rows
+
+    def search(self, user_input, program=None, semester=None, selected_keywords=None, top_n=10, page=0, page_size=None):
+        response = self.connection.request('POST', '/search', {
+            'user_input': user_input,
+            'program': program,
+            'semester': semester,
+            'selected_keywords': selected_keywords,
+            'top_n': top_n,
+            'page': page,
+            'page_size': page_size,
+        })
+        return SearchResult(
+            [Message(*message) for message in response['messages']],
+            [Recommendation(*fields) for fields in response['results']],
+            response['words_to_remove'],
+            response['total'],
+            response['page'],
+        )
+
+    def courses(self, ids):
+        response = self.connection.request('POST', '/courses', {'ids': list(ids)})
+        return [Recommendation(*fields) for fields in response['courses']]
+
+    def career_paths(self, ids, top_k=8):
+        return self.connection.request('POST', '/careers', {'ids': list(ids), 'top_k': top_k})['careers']
+
+    def suggest(self, prefix, top_k=None):
+        query = {'q': prefix} if top_k is None else {'q': prefix, 'k': top_k}
+        response = self.connection.request('GET', f"/suggest?{urlencode(query)}")
+        return [Suggestion(*fields) for fields in response['suggestions']]
+
+class ServiceClient:
+    """Pengganti CatalogWatcher di mode klien tipis: current() memberi RemoteEngine terbaru."""
+    def __init__(self, url, check_interval=5.0, timeout=10.0):
+        self.connection = ServiceConnection(url, timeout)
+        self.check_interval = check_interval
+        self.last_reload = None
+        self.last_error = None
+        self.engine = RemoteEngine(self.connection, self.connection.request('GET', '/info'))
+        self._last_check = time.monotonic()
+
+    def current(self):
+        if time.monotonic() - self._last_check >= self.check_interval:
+            self._last_check = time.monotonic()
+            try:
+                info = self.connection.request('GET', '/info')
+            except (OSError, ServiceError) as exc:
+                self.last_error = repr(exc)
+                return self.engine
+            self.last_error = None
+            if info['version'] != self.engine.version:
+                self.last_reload = {'version': info['version'], 'rows': info['rows']}
+                self.engine = RemoteEngine(self.connection, info)
+        return self.engine
@@ -0,0 +1,170 @@
+"""
+Penggabung (coalescer) request pencarian berbasis asyncio di depan engine.
+
+Query yang tiba dalam `max_wait` detik (paling banyak `max_batch`) digabung menjadi satu
+engine.search_batch, yaitu satu perkalian matriks sparse, lalu hasil dikirim ke future milik
+masing-masing pemanggil. Selama satu batch diskor (di thread executor), request baru menumpuk di
+antrian dan ikut batch berikutnya, jadi saat ramai batch membesar dengan sendirinya. Jika
+search_batch gagal, setiap request di batch itu diulang sendiri-sendiri dengan engine.search, jadi
+satu request rusak hanya menggagalkan pemanggilnya sendiri.
+
+Bisa dipakai dari kode async (`await coalescer.search(...)`) maupun dari thread biasa seperti sesi
+Streamlit atau handler HTTP (`coalescer.search_sync(...)`; event loop jalan di thread latar).
+Histogram kedalaman antrian dan ukuran batch tercatat di METRICS untuk menyetel latensi vs throughput.
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from .metrics import METRICS
+
+# Aktifkan di UI Streamlit dengan waktu tunggu batch dalam milidetik, mis. ADVISOR_COALESCE_MS=3
+COALESCE_ENV = 'ADVISOR_COALESCE_MS'
+
+def _settle(future, result=None, exception=None):
+    # Pemanggil yang sudah dibatalkan (mis. koneksi putus) dilewati
+    if future.done():
+        return
+    if exception is not None:
+        future.set_exception(exception)
+    else:
+        future.set_result(result)
+
+class SearchCoalescer:
+    """name menjadi prefix metrik: {name}.queue_depth, {name}.batch_size, {name}.wait."""
+    def __init__(self, get_engine, max_batch=64, max_wait=0.003, name='coalesce'):
+        self.get_engine = get_engine
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.name = name
+        self._loop = None
+        self._queue = None
+        self._task = None
+        self._owns_loop = False
+        self._lock = threading.Lock()
+        # Satu batch diskor pada satu waktu; event loop tetap bebas menerima request
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='coalesce-score')
+
+    def _bind(self, loop):
+        """Antrian dan task pengumpul terikat ke event loop pertama yang memakai coalescer ini."""
+        if self._loop is None:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._task = loop.create_task(self._collect())
+        elif self._loop is not loop:
+            raise RuntimeError("SearchCoalescer sudah terikat ke event loop lain; pakai search_sync dari thread lain")
+
+    async def search(self, user_input, program=None, semester=None, selected_keywords=None, top_n=10, page=0, page_size=None):
+        """Sama dengan engine.search, tetapi diskor bersama request lain yang tiba berdekatan."""
+        loop = asyncio.get_running_loop()
+        self._bind(loop)
+        future = loop.create_future()
+        request = {
+            'user_input': user_input,
+            'program': program,
+            'semester': semester,
+            'selected_keywords': selected_keywords,
+            'top_n': top_n,
+            'page': page,
+            'page_size': page_size,
+        }
+        self._queue.put_nowait((request, future, time.perf_counter()))
+        return await future
+
+    def search_sync(self, user_input, program=None, semester=None, selected_keywords=None, top_n=10, page=0, page_size=None):
+        """search() dari thread non-async; memblokir sampai batch berisi request ini selesai."""
+        loop = self._background_loop()
+        coroutine = self.search(user_input, program, semester, selected_keywords, top_n, page, page_size)
+        return asyncio.run_coroutine_threadsafe(coroutine, loop).result()
+
+    def _background_loop(self):
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name='search-coalescer', daemon=True).start()
+                self._owns_loop = True
+                # _bind harus berjalan di dalam loop itu sendiri
+                asyncio.run_coroutine_threadsafe(self._bind_async(), loop).result()
+            return self._loop
+
+    async def _bind_async(self):
+        self._bind(asyncio.get_running_loop())
+
+    async def aclose(self):
+        """Menghentikan task pengumpul (untuk pemakaian async sebelum event loop ditutup)."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def close(self):
+        """Menghentikan task pengumpul dan event loop latar milik search_sync."""
+        if self._loop is not None and self._owns_loop:
+            asyncio.run_coroutine_threadsafe(self.aclose(), self._loop).result()
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        self._executor.shutdown(wait=False)
+
+    async def _next_batch(self):
+        batch = [await self._queue.get()]
+        METRICS.observe_size(f"{self.name}.queue_depth", self._queue.qsize() + 1)
+        deadline = self._loop.time() + self.max_wait
+        while len(batch) < self.max_batch:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            remaining = deadline - self._loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _collect(self):
+        while True:
+            batch = await self._next_batch()
+            METRICS.observe_size(f"{self.name}.batch_size", len(batch))
+            now = time.perf_counter()
+            for _, _, queued_at in batch:
+                METRICS.observe(f"{self.name}.wait", now - queued_at)
+            requests = [request for request, _, _ in batch]
+            try:
+                engine = self.get_engine()
+                results = await self._loop.run_in_executor(self._executor, engine.search_batch, requests)
+            except Exception as exc:
+                if len(batch) == 1:
+                    _settle(batch[0][1], exception=exc)
+                else:
+                    METRICS.incr(f"{self.name}.batch_fallback")
+                    await self._search_each(batch)
+                continue
+            for (_, future, _), result in zip(batch, results):
+                _settle(future, result)
+
+    async def _search_each(self, batch):
+        """Batch gagal: ulang per request agar galat hanya sampai ke pemanggil yang menyebabkannya."""
+        for request, future, _ in batch:
+            if future.done():
+                continue
+            try:
+                engine = self.get_engine()
+                result = await self._loop.run_in_executor(self._executor, partial(engine.search, **request))
+            except Exception as exc:
+                _settle(future, exception=exc)
+            else:
+                _settle(future, result)
+
+    def stats(self):
+        return {
+            'max_batch': self.max_batch,
+            'max_wait_ms': self.max_wait * 1000,
+            'pending': self._queue.qsize() if self._queue is not None else 0,
+            'queue_depth': METRICS.size_stats(f"{self.name}.queue_depth"),
+            'batch_size': METRICS.size_stats(f"{self.name}.batch_size"),
+        }
@@ -0,0 +1,212 @@
+"""Konten per jurusan/mata kuliah: deskripsi jurusan, tips mata kuliah, dan rekomendasi karir."""
+import re
+
+import numpy as np
+
+from .text import COURSE_ADVICE_RULES, DEFAULT_COURSE_ADVICE, match_intents
+
+# --- DATA DESKRIPSI JURUSAN ---
+PROGRAM_DESCRIPTIONS = {
+    "Informatika": "Mempelajari pengembangan software, teknologi jaringan, dan komputasi cerdas untuk solusi masa depan.",
+    "Sistem Informasi": "Menggabungkan ilmu komputer dengan manajemen bisnis untuk mengelola sistem perusahaan.",
+    "Manajemen": "Fokus pada pengelolaan bisnis, strategi pemasaran, keuangan, dan kepemimpinan organisasi.",
+    "Akuntansi": "Ahli dalam pencatatan, analisis, dan pelaporan keuangan untuk keputusan bisnis yang akurat.",
+    "Ilmu Komunikasi": "Mempelajari strategi penyampaian pesan efektif melalui media digital, humas, dan jurnalistik.",
+    "Hospitality dan Pariwisata": "Menyiapkan profesional di bidang perhotelan, kuliner, dan manajemen destinasi wisata.",
+    "Desain Komunikasi Visual": "Mengembangkan solusi komunikasi visual yang kreatif, artistik, dan inovatif.",
+    "Bahasa Inggris": "Mendalami bahasa, sastra, dan budaya Inggris untuk komunikasi profesional global.",
+    "Bahasa Mandarin": "Mempelajari bahasa dan budaya Tiongkok untuk keunggulan bisnis internasional.",
+    "Bisnis Digital": "Mengintegrasikan teknologi digital canggih dalam strategi dan operasional bisnis modern.",
+    "Data Science": "Mengolah data besar (Big Data) menjadi wawasan berharga untuk prediksi dan keputusan.",
+    "Desain Interaktif": "Fokus pada perancangan pengalaman pengguna (UX) dan antarmuka (UI) game serta media interaktif.",
+    "Psikologi": "Mempelajari perilaku manusia dan proses mental untuk kesejahteraan individu dan organisasi."
+}
+
+DEFAULT_PROGRAM_DESCRIPTION = "Jurusan unggulan yang siap mencetak profesional handal di bidangnya."
+DEFAULT_ADVICE_CATEGORY = "umum"
+
+# Tabel kecil yang ditunjuk kode integer per baris katalog (lihat CourseDetails)
+PROGRAM_DESCRIPTION_TABLE = list(PROGRAM_DESCRIPTIONS.values()) + [DEFAULT_PROGRAM_DESCRIPTION]
+ADVICE_TABLE = [
+    {"category": rule['category'], "desc": rule['desc'], "tip": rule['tip']} for rule in COURSE_ADVICE_RULES
+] + [{"category": DEFAULT_ADVICE_CATEGORY, **DEFAULT_COURSE_ADVICE}]
+
+def program_description_code(program_name):
+    """Posisi di PROGRAM_DESCRIPTION_TABLE; jurusan pertama yang namanya terkandung di program_name."""
+    for code, key in enumerate(PROGRAM_DESCRIPTIONS):
+        if key in program_name:
+            return code
+    return len(PROGRAM_DESCRIPTION_TABLE) - 1
+
+def course_advice_code(course_name):
+    """Posisi di ADVICE_TABLE; aturan pertama (urutan COURSE_ADVICE_RULES) yang trigger-nya cocok."""
+    matched = match_intents(course_name)['advice']
+    for code, rule in enumerate(COURSE_ADVICE_RULES):
+        if rule['category'] in matched:
+            return code
+    return len(ADVICE_TABLE) - 1
+
+def get_program_description(program_name):
+    """Mencari deskripsi yang cocok berdasarkan nama jurusan."""
+    return PROGRAM_DESCRIPTION_TABLE[program_description_code(program_name)]
+
+def get_course_advice(course_name):
+    """
+    Memberikan tips dan deskripsi umum berdasarkan kata kunci pada nama mata kuliah.
+    Ini adalah 'Smart Logic' karena kita tidak punya data tips spesifik per matkul.
+    """
+    advice = ADVICE_TABLE[course_advice_code(course_name)]
+    return {"desc": advice['desc'], "tip": advice['tip']}
+
+def _encode(values, code_of):
+    """Kode per baris; code_of dipanggil sekali per nilai unik, bukan per baris."""
+    import pandas as pd
+
+    codes, uniques = pd.factorize(values)
+    table = np.array([code_of(value) for value in uniques], dtype=np.int8)
+    return table[codes]
+
+class CourseDetails:
+    """
+    Deskripsi jurusan + tips matkul per baris katalog sebagai kolom int8 yang menunjuk ke
+    PROGRAM_DESCRIPTION_TABLE / ADVICE_TABLE. Pencocokan string hanya terjadi saat katalog dimuat;
+    merender hasil cukup mengambil elemen tabel.
+    """
+    def __init__(self, df):
+        self.program_codes = _encode(df['Program'], program_description_code)
+        self.advice_codes = _encode(df['Course'], course_advice_code)
+
+    def updated(self, kept, added_df):
+        """CourseDetails baru: kode baris lama `kept` dipakai ulang, hanya added_df yang dicocokkan."""
+        added = CourseDetails(added_df)
+        details = CourseDetails.__new__(CourseDetails)
+        details.program_codes = np.concatenate([self.program_codes[kept], added.program_codes])
+        details.advice_codes = np.concatenate([self.advice_codes[kept], added.advice_codes])
+        return details
+
+    def program_descriptions(self, rows):
+        return [PROGRAM_DESCRIPTION_TABLE[code] for code in self.program_codes[rows].tolist()]
+
+    def advice(self, rows):
+        return [ADVICE_TABLE[code] for code in self.advice_codes[rows].tolist()]
+
+    def advice_categories(self, rows=None):
+        codes = self.advice_codes if rows is None else self.advice_codes[rows]
+        return [ADVICE_TABLE[code]['category'] for code in codes.tolist()]
+
+# --- KARIR: tabel deklaratif, dikompilasi menjadi matriks insidensi (CareerIndex) ---
+CAREER_MAPPING = {
+    'Informatika': ['Software Engineer', 'Full Stack Developer', 'DevOps Engineer', 'System Analyst', 'IT Consultant'],
+    'Data Science': ['Data Scientist', 'Data Analyst', 'Machine Learning Engineer', 'Business Intelligence Analyst', 'AI Researcher'],
+    'Desain Komunikasi Visual': ['Graphic Designer', 'UI/UX Designer', 'Art Director', 'Brand Designer', 'Creative Director'],
+    'Desain Interaktif': ['UX Designer', 'Game Designer', 'Motion Graphics Designer', 'Interactive Media Designer', 'Web Designer'],
+    'Manajemen': ['Business Manager', 'Project Manager', 'Marketing Manager', 'HR Manager', 'Entrepreneur'],
+    'Akuntansi': ['Accountant', 'Tax Consultant', 'Financial Analyst', 'Auditor', 'Finance Manager'],
+    'Sistem Informasi': ['System Analyst', 'Business Analyst', 'IT Project Manager', 'ERP Consultant', 'Database Administrator'],
+    'Bahasa Inggris': ['Translator', 'Teacher', 'Content Writer', 'Editor', 'International Relations Specialist'],
+    'Bahasa Mandarin': ['Mandarin Translator', 'Language Teacher', 'International Business Specialist', 'Tour Guide'],
+    'Bisnis Digital': ['Digital Marketing Specialist', 'E-commerce Manager', 'Social Media Manager', 'Digital Strategist', 'Growth Hacker'],
+    'Hospitality dan Pariwisata': ['Hotel Manager', 'Event Planner', 'Tour Guide', 'Travel Consultant', 'F&B Manager'],
+    'Ilmu Komunikasi': ['Public Relations Specialist', 'Journalist', 'Content Creator', 'Social Media Manager', 'Communications Manager']
+}
+# Karir per jurusan yang ikut disarankan (sisanya hanya untuk ditampilkan di tempat lain)
+PROGRAM_CAREER_LIMIT = 3
+
+# Trigger dicocokkan sebagai substring nama mata kuliah (lowercase)
+COURSE_CAREER_RULES = [
+    {"triggers": ['programming', 'algoritma', 'web', 'mobile', 'software'], "careers": ['Software Developer', 'Programmer', 'Web Developer']},
+    {"triggers": ['data', 'analytics', 'machine learning', 'ai', 'artificial'], "careers": ['Data Scientist', 'Data Analyst', 'ML Engineer']},
+    {"triggers": ['desain', 'design', 'visual', 'grafis', 'ui', 'ux'], "careers": ['Designer', 'UI/UX Designer', 'Graphic Designer']},
+    {"triggers": ['game', 'gaming', 'interactive'], "careers": ['Game Developer', 'Game Designer']},
+    {"triggers": ['bisnis', 'business', 'manajemen', 'marketing'], "careers": ['Business Analyst', 'Marketing Specialist', 'Manager']},
+    {"triggers": ['akuntansi', 'accounting', 'finance', 'keuangan'], "careers": ['Accountant', 'Financial Analyst']},
+    {"triggers": ['komunikasi', 'media', 'jurnalis', 'public'], "careers": ['Communications Specialist', 'Media Specialist', 'Journalist']},
+    {"triggers": ['hospitality', 'pariwisata', 'tourism', 'hotel'], "careers": ['Tourism Professional', 'Hotel Manager']},
+]
+
+# Urutan tabel = urutan tie-break peringkat karir (jurusan dulu, lalu aturan mata kuliah)
+CAREER_TABLE = list(dict.fromkeys(
+    [career for careers in CAREER_MAPPING.values() for career in careers[:PROGRAM_CAREER_LIMIT]]
+    + [career for rule in COURSE_CAREER_RULES for career in rule['careers']]
+))
+_CAREER_CODES = {career: code for code, career in enumerate(CAREER_TABLE)}
+
+def program_career_codes(program_name):
+    """Kode CAREER_TABLE dari semua jurusan di CAREER_MAPPING yang namanya terkandung di program_name."""
+    return [
+        _CAREER_CODES[career]
+        for key, careers in CAREER_MAPPING.items() if key in program_name
+        for career in careers[:PROGRAM_CAREER_LIMIT]
+    ]
+
+def course_career_codes(course_name):
+    """Kode CAREER_TABLE dari aturan COURSE_CAREER_RULES yang trigger-nya muncul di nama mata kuliah."""
+    name = course_name.lower()
+    return [
+        _CAREER_CODES[career]
+        for rule in COURSE_CAREER_RULES if any(trigger in name for trigger in rule['triggers'])
+        for career in rule['careers']
+    ]
+
+def _rank_careers(counts, top_k):
+    """Nama karir top_k: jumlah mata kuliah terbanyak dulu, seri diurutkan menurut CAREER_TABLE."""
+    codes = np.flatnonzero(counts)
+    order = np.lexsort((codes, -counts[codes]))[:top_k]
+    return [CAREER_TABLE[code] for code in codes[order].tolist()]
+
+def _incidence(code_lists):
+    """Matriks sparse (len(code_lists) x karir) bernilai 1 pada kode karir setiap baris."""
+    from scipy.sparse import csr_matrix
+
+    indptr = np.zeros(len(code_lists) + 1, dtype=np.int64)
+    np.cumsum([len(codes) for codes in code_lists], out=indptr[1:])
+    indices = np.fromiter((code for codes in code_lists for code in codes), dtype=np.int64, count=indptr[-1])
+    return csr_matrix((np.ones(len(indices), dtype=np.int32), indices, indptr), shape=(len(code_lists), len(CAREER_TABLE)))
+
+class CareerIndex:
+    """
+    Matriks insidensi (pasangan jurusan+mata kuliah unik x karir) + kode pasangan per baris katalog,
+    dibangun sekali saat katalog dimuat. Saran karir untuk sekumpulan baris (bookmark atau hasil
+    pencarian) = jumlah baris matriks: bincount kode pasangan lalu satu perkalian sparse.
+    """
+    def __init__(self, df):
+        import pandas as pd
+        from scipy.sparse import csr_matrix
+
+        program_codes, programs = pd.factorize(df['Program'])
+        course_codes, courses = pd.factorize(df['Course'])
+        n_courses = max(len(courses), 1)
+        pairs, self.pair_codes = np.unique(program_codes.astype(np.int64) * n_courses + course_codes, return_inverse=True)
+
+        program_incidence = _incidence([program_career_codes(program) for program in programs])
+        # Aturan mata kuliah dicocokkan per aturan secara vektor atas nama unik, bukan per nama
+        names = pd.Series(np.asarray(courses, dtype=object), dtype='str').str.lower()
+        rule_hits = np.column_stack([
+            names.str.contains('|'.join(re.escape(trigger) for trigger in rule['triggers']), regex=True).to_numpy(dtype=bool)
+            for rule in COURSE_CAREER_RULES
+        ]).reshape(len(courses), len(COURSE_CAREER_RULES))
+        rule_careers = _incidence([[_CAREER_CODES[career] for career in rule['careers']] for rule in COURSE_CAREER_RULES])
+        course_incidence = csr_matrix(rule_hits, dtype=np.int32) @ rule_careers
+
+        matrix = (program_incidence[pairs // n_courses] + course_incidence[pairs % n_courses]).tocsr()
+        # Karir yang muncul dari jurusan dan mata kuliah yang sama tetap dihitung sekali per baris
+        matrix.data[:] = 1
+        self.matrix = matrix
+
+    def updated(self, kept, added_df):
+        """CareerIndex baru: pasangan lama dipakai ulang, hanya added_df yang dicocokkan."""
+        from scipy.sparse import vstack
+
+        added = CareerIndex(added_df)
+        careers = CareerIndex.__new__(CareerIndex)
+        careers.pair_codes = np.concatenate([self.pair_codes[kept], added.pair_codes + self.matrix.shape[0]])
+        careers.matrix = vstack([self.matrix, added.matrix]).tocsr()
+        return careers
+
+    def career_counts(self, rows):
+        """Jumlah baris (mata kuliah) di rows yang mengarah ke setiap karir, urut CAREER_TABLE."""
+        pair_counts = np.bincount(self.pair_codes[rows], minlength=self.matrix.shape[0])
+        return self.matrix.T @ pair_counts
+
+    def top_careers(self, rows, top_k=8):
+        return _rank_careers(self.career_counts(rows), top_k)
@@ -0,0 +1,144 @@
+"""
+Mode retrieval dense (semantik) di samping skor TF-IDF leksikal, sepenuhnya offline di CPU.
+
+Matriks TF-IDF katalog diproyeksikan dengan LSA (TruncatedSVD) ke DENSE_DIM dimensi: term yang sering
+muncul bersama (mis. "menggambar" lewat ekspansi dan "Nirmana" di jurusan DKV) berdekatan walau tidak
+berbagi kata. Vektor baris ter-normalisasi L2 disimpan int8 (64 byte per baris), dikelompokkan ke daftar
+IVF (k-means sferis, ~sqrt(n) centroid) sehingga query hanya membandingkan isi `nprobe` daftar terdekat.
+
+Skor akhir mode hybrid: (1 - w) * cosine TF-IDF + w * cosine dense, w dari env ADVISOR_DENSE_WEIGHT
+(0 = hanya leksikal, default; 1 = hanya dense).
+"""
+import os
+
+import numpy as np
+
+DENSE_WEIGHT_ENV = 'ADVISOR_DENSE_WEIGHT'
+DENSE_WEIGHT = float(os.environ.get(DENSE_WEIGHT_ENV) or 0)
+DENSE_DIM = 64
+# Sampai sebanyak ini baris, skor dense dihitung untuk semua baris (lebih cepat daripada probing IVF)
+EXACT_ROWS = 4096
+NPROBE = 8
+# Vektor ter-normalisasi L2 (komponen di [-1, 1]) disimpan sebagai int8 = round(nilai * VECTOR_SCALE)
+VECTOR_SCALE = 127
+
+def _normalize(vectors):
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+def _quantize(vectors):
+    return np.round(vectors * VECTOR_SCALE).astype(np.int8)
+
+def _assign(vectors, centroids):
+    """Centroid terdekat (cosine) per vektor, diproses per blok agar memori tetap kecil."""
+    if not len(vectors):
+        return np.empty(0, dtype=np.int64)
+    return np.concatenate([
+        np.argmax(vectors[start:start + 65536] @ centroids.T, axis=1)
+        for start in range(0, len(vectors), 65536)
+    ])
+
+def blend_scores(lexical_rows, lexical_scores, dense_rows, dense_scores, weight):
+    """Gabungan (posisi baris, skor hybrid) dari kandidat leksikal dan dense; baris yang hanya ada di satu sisi dapat 0 di sisi lain."""
+    rows = np.concatenate([lexical_rows, dense_rows]).astype(np.int64)
+    scores = np.concatenate([(1 - weight) * lexical_scores, weight * dense_scores])
+    unique, inverse = np.unique(rows, return_inverse=True)
+    return unique, np.bincount(inverse, weights=scores, minlength=len(unique))
+
+class DenseIndex:
+    """
+    components: proyeksi LSA (dim x term, float32). vectors: baris katalog dikuantisasi int8
+    (nilai x VECTOR_SCALE) dan, jika ada IVF, diurutkan per daftar: vectors[list_indptr[c]:list_indptr[c + 1]]
+    adalah isi daftar centroid c dengan posisi baris katalog list_rows[...] yang sama. Satu daftar
+    = satu blok memori bersebelahan, jadi probing hanya membaca slice tanpa gather.
+    """
+    def __init__(self, components, vectors, centroids=None, list_indptr=None, list_rows=None, nprobe=NPROBE):
+        self.components = components
+        self.vectors = vectors
+        self.centroids = centroids
+        self.list_indptr = list_indptr
+        self.list_rows = list_rows
+        self.nprobe = nprobe
+        self.positions = None
+        if list_rows is not None:
+            # Posisi baris katalog -> posisi di vectors (invers list_rows)
+            self.positions = np.empty(len(list_rows), dtype=np.int64)
+            self.positions[list_rows] = np.arange(len(list_rows))
+
+    @classmethod
+    def fit(cls, matrix, dim=DENSE_DIM, seed=0):
+        """DenseIndex dari matriks TF-IDF CourseIndex; None jika katalog terlalu kecil untuk diproyeksikan."""
+        from sklearn.decomposition import TruncatedSVD
+
+        dim = min(dim, matrix.shape[1] - 1, matrix.shape[0] - 1)
+        if dim < 2:
+            return None
+        svd = TruncatedSVD(dim, random_state=seed)
+        vectors = _normalize(svd.fit_transform(matrix)).astype(np.float32)
+        components = svd.components_.astype(np.float32)
+        if len(vectors) <= EXACT_ROWS:
+            return cls(components, _quantize(vectors))
+
+        from sklearn.cluster import MiniBatchKMeans
+
+        kmeans = MiniBatchKMeans(int(np.sqrt(len(vectors))), random_state=seed, n_init=1, batch_size=4096).fit(vectors)
+        centroids = _normalize(kmeans.cluster_centers_).astype(np.float32)
+        return cls._with_lists(components, _quantize(vectors), centroids, _assign(vectors, centroids))
+
+    @classmethod
+    def _with_lists(cls, components, vectors, centroids, assignment):
+        """DenseIndex IVF dari vektor int8 urut baris katalog + nomor centroid tiap baris."""
+        list_rows = np.argsort(assignment, kind='stable')
+        list_indptr = np.zeros(len(centroids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(assignment, minlength=len(centroids)), out=list_indptr[1:])
+        return cls(components, vectors[list_rows], centroids, list_indptr, list_rows)
+
+    def row_vectors(self, rows=None):
+        """Vektor int8 untuk posisi baris katalog rows (semua baris, urut baris, jika None)."""
+        if rows is None:
+            rows = np.arange(len(self.vectors))
+        return self.vectors[rows if self.positions is None else self.positions[rows]]
+
+    def embed(self, query_vectors):
+        """Vektor dense (query x dim, float32) dari vektor TF-IDF query (CourseIndex.query_vectors)."""
+        return _normalize(np.asarray(query_vectors @ self.components.T, dtype=np.float32))
+
+    def search(self, query, rows=None):
+        """
+        (posisi baris, skor cosine > 0) untuk satu query hasil embed. rows (terurut) membatasi kandidat;
+        filter kecil dan katalog kecil diskor penuh, selebihnya hanya baris di nprobe daftar IVF terdekat.
+        """
+        if self.centroids is None or (rows is not None and len(rows) <= EXACT_ROWS):
+            if rows is None and self.positions is None:
+                candidates, vectors = np.arange(len(self.vectors)), self.vectors
+            else:
+                candidates = np.arange(len(self.vectors)) if rows is None else np.asarray(rows)
+                vectors = self.row_vectors(candidates)
+            scores = np.dot(vectors, query)
+        else:
+            nprobe = min(self.nprobe, len(self.centroids))
+            probe = np.sort(np.argpartition(-(self.centroids @ query), nprobe - 1)[:nprobe])
+            bounds = [(self.list_indptr[c], self.list_indptr[c + 1]) for c in probe]
+            candidates = np.concatenate([self.list_rows[start:end] for start, end in bounds])
+            scores = np.concatenate([np.dot(self.vectors[start:end], query) for start, end in bounds])
+            if rows is not None and len(rows) < len(self.vectors):
+                keep = np.isin(candidates, rows, assume_unique=True)
+                candidates, scores = candidates[keep], scores[keep]
+        positive = scores > 0
+        return candidates[positive], scores[positive].astype(np.float64) / VECTOR_SCALE
+
+    def updated(self, kept, added_matrix):
+        """
+        DenseIndex untuk baris lama `kept` + baris TF-IDF tambahan, dengan proyeksi dan centroid yang sama;
+        baris baru masuk ke daftar IVF terdekat. Proyeksi di-fit ulang saat rebuild penuh.
+        """
+        added = self.embed(added_matrix)
+        vectors = np.concatenate([self.row_vectors(kept), _quantize(added)])
+        if self.centroids is None:
+            return DenseIndex(self.components, vectors, nprobe=self.nprobe)
+        assignment = np.empty(len(self.vectors), dtype=np.int64)
+        assignment[self.list_rows] = np.repeat(np.arange(len(self.centroids)), np.diff(self.list_indptr))
+        assignment = np.concatenate([assignment[kept], _assign(added, self.centroids)])
+        index = DenseIndex._with_lists(self.components, vectors, self.centroids, assignment)
+        index.nprobe = self.nprobe
+        return index
@@ -0,0 +1,374 @@
+"""
+Mesin rekomendasi tanpa UI: katalog dan indeks dibangun sekali, lalu setiap pencarian
+mengembalikan hasil terstruktur beserta pesan yang ditampilkan oleh lapisan UI.
+"""
+from collections import namedtuple
+from functools import cached_property
+
+import numpy as np
+
+from .cache import ResultCache
+from .catalog import CATALOG_PATH, FacetIndex, NegationIndex, catalog_features, catalog_version, course_ids, load_catalog
+from .content import CareerIndex, CourseDetails
+from .dense import DENSE_WEIGHT, DenseIndex, blend_scores
+from .fuzzy import FuzzyCorrector, drop_negated_typos
+from .index import DEFAULT_QUERY_WEIGHTS, CourseIndex, QueryEncoder, QueryWeights
+from .metrics import METRICS, stage
+from .sentiment import analyze_sentiment
+from .suggest import SuggestionIndex
+from .text import chatbot_messages, correction_message, negation_message, parse_negation
+
+RESULT_COLUMNS = ['Program', 'Semester', 'Course', 'Similarity Score']
+
+# messages: list Message, results: list Recommendation, words_to_remove: kata yang dinegasikan,
+# total: jumlah seluruh hasil terurut, page: nomor halaman results (results = satu halaman jika page_size diisi)
+SearchResult = namedtuple('SearchResult', ['messages', 'results', 'words_to_remove', 'total', 'page'], defaults=(None, 0))
+
+class Recommendation(namedtuple('Recommendation', ['row', 'program', 'semester', 'course', 'score', 'program_description', 'advice',
+                                                   'course_id'])):
+    """Satu kartu hasil; row = posisi baris katalog (berubah antar versi), course_id = ID stabil, score dalam persen."""
+    __slots__ = ()
+
+    def to_dict(self):
+        """Bentuk kolom RESULT_COLUMNS (dipakai bookmark dan rekomendasi karir)."""
+        return {'Program': self.program, 'Semester': self.semester, 'Course': self.course, 'Similarity Score': self.score}
+
+def _empty_results():
+    import pandas as pd
+
+    return pd.DataFrame()
+
+def top_rows(rows, scores, top_n):
+    """
+    Top-N (posisi baris, skor) dengan skor > 0, terurut skor menurun lalu posisi baris.
+    argpartition O(n) + sort hanya top_n, tanpa menyalin atau mengurutkan seluruh katalog.
+    """
+    positive = scores > 0
+    rows, scores = rows[positive], scores[positive]
+    if len(scores) > top_n:
+        top = np.argpartition(-scores, top_n - 1)[:top_n]
+        rows, scores = rows[top], scores[top]
+    order = np.lexsort((rows, -scores))
+    return rows[order], scores[order]
+
+class RecommendationEngine:
+    """
+    Katalog + FacetIndex + NegationIndex + CourseIndex untuk satu versi katalog. dense_weight > 0
+    (default env ADVISOR_DENSE_WEIGHT) mengaktifkan skor hybrid dengan DenseIndex (advisor.dense);
+    query_weights (QueryWeights) mengatur bobot teks, ekspansi implisit, dan keyword pilihan.
+    sentiment_backend (mis. 'lexicon') opt-in: pesan sentimen ikut di hasil search; default mati.
+    """
+    def __init__(self, df, sentiment_backend=None, result_cache=None, facets=None, negation_index=None, index=None,
+                 details=None, version=None, dense=None, dense_weight=None, query_weights=DEFAULT_QUERY_WEIGHTS,
+                 careers=None):
+        self.df = df
+        self.sentiment_backend = sentiment_backend
+        self.dense_weight = DENSE_WEIGHT if dense_weight is None else dense_weight
+        self.query_weights = QueryWeights(*query_weights)
+        # version dari snapshot dipakai apa adanya, tanpa hash ulang seluruh katalog
+        self.version = version or catalog_version(df)
+        self.result_cache = result_cache if result_cache is not None else ResultCache()
+        # Indeks yang sudah jadi (mis. hasil apply_changes) dipakai apa adanya
+        self.facets = facets if facets is not None else FacetIndex(df)
+        if negation_index is None or (index is None and len(df)):
+            features = catalog_features(df)
+        self.negation_index = negation_index if negation_index is not None else NegationIndex(features)
+        if index is None and len(df):
+            index = CourseIndex(features)
+        self.index = index
+        # Vektor ekspansi KEYWORD_MAPPING dihitung sekali per vocabulary
+        self.query_encoder = QueryEncoder(index, self.query_weights) if index is not None else None
+        if dense is None and self.dense_weight and index is not None:
+            dense = DenseIndex.fit(index.matrix)
+        self.dense = dense
+        # Deskripsi jurusan + tips matkul per baris dikodekan sekali saat katalog dimuat
+        self.details = details if details is not None else CourseDetails(df)
+        # Matriks insidensi mata kuliah x karir untuk saran karir dari bookmark / hasil pencarian
+        self.careers = careers if careers is not None else CareerIndex(df)
+        self._columns = {column: df[column].to_numpy() for column in ('Program', 'Semester', 'Course')}
+        # ID stabil (bookmark) + urutannya untuk mencari baris dari ID dengan searchsorted
+        self.course_ids = course_ids(df)
+        self._id_order = np.argsort(self.course_ids, kind='stable')
+        self._sorted_ids = self.course_ids[self._id_order]
+
+    def __len__(self):
+        return len(self.df)
+
+    @cached_property
+    def corrector(self):
+        """Koreksi typo dari key KEYWORD_MAPPING + vocabulary indeks; dibangun saat query pertama."""
+        vocabulary = self.index.vectorizer.vocabulary_ if self.index is not None else ()
+        return FuzzyCorrector.for_vocabulary(vocabulary)
+
+    @cached_property
+    def suggestions(self):
+        """SuggestionIndex autocomplete dari kolom katalog saja (tanpa indeks skor), sekali per versi katalog."""
+        return SuggestionIndex.from_catalog(self.df)
+
+    @classmethod
+    def from_csv(cls, path=CATALOG_PATH):
+        return cls(load_catalog(path))
+
+    def rebuilt(self, df):
+        """Engine baru untuk katalog df dengan semua indeks dibangun ulang (vocabulary + IDF baru)."""
+        return RecommendationEngine(df, self.sentiment_backend, self.result_cache, dense_weight=self.dense_weight,
+                                    query_weights=self.query_weights)
+
+    def apply_changes(self, kept, added_df):
+        """
+        Engine baru berisi baris lama `kept` (posisi terurut) lalu `added_df`. Indeks diperbarui
+        secara inkremental; engine ini sendiri tidak diubah sehingga sesi yang memakainya tetap jalan.
+        """
+        import pandas as pd
+
+        df = pd.concat([self.df.iloc[kept], added_df], ignore_index=True)
+        if self.index is None:
+            return self.rebuilt(df)
+        added_features = catalog_features(added_df)
+        index = self.index.updated(kept, added_features)
+        return RecommendationEngine(
+            df,
+            self.sentiment_backend,
+            self.result_cache,
+            facets=self.facets.updated(kept, added_df),
+            negation_index=self.negation_index.updated(kept, added_features),
+            index=index,
+            details=self.details.updated(kept, added_df),
+            careers=self.careers.updated(kept, added_df),
+            dense=self.dense.updated(kept, index.matrix[len(kept):]) if self.dense is not None else None,
+            dense_weight=self.dense_weight,
+            query_weights=self.query_weights,
+        )
+
+    def ranked_rows(self, user_query, rows=None, words_to_remove=None, selected_keywords=None, top_n=10):
+        """
+        rows adalah posisi baris hasil filter (FacetIndex.select); None berarti seluruh katalog.
+        Mengembalikan (posisi baris, skor 0-1) top_n terurut; kedua array kosong jika tidak ada yang cocok.
+        """
+        none = np.empty(0, dtype=np.int64), np.empty(0)
+        if not user_query.strip() and not selected_keywords:
+            return none
+
+        if rows is None:
+            rows = self.facets.all_rows
+        if len(rows) == 0 or self.index is None:
+            return none
+
+        if words_to_remove:
+            with stage('recommend.negation_filter'):
+                rows = self.negation_index.exclude(rows, words_to_remove)
+
+        if len(rows) == 0:
+            return none
+
+        # Teks + ekspansi KEYWORD_MAPPING + selected_keywords sebagai satu vektor query
+        with stage('recommend.encode_query'):
+            query_vec = self.query_encoder.encode([(user_query, selected_keywords)])
+
+        # Index di-fit sekali untuk seluruh katalog; filter cukup memilih baris (label = posisi baris)
+        with stage('recommend.score'):
+            cosine_similarities = self.index.score_vector(query_vec, rows)
+        rows = np.asarray(rows)
+
+        if self.dense_weight and self.dense is not None:
+            with stage('recommend.dense'):
+                dense_rows, dense_scores = self.dense.search(self.dense.embed(query_vec)[0], rows)
+                matched = cosine_similarities > 0
+                rows, cosine_similarities = blend_scores(
+                    rows[matched], cosine_similarities[matched], dense_rows, dense_scores, self.dense_weight)
+
+        with stage('recommend.rank'):
+            return top_rows(rows, cosine_similarities, top_n)
+
+    def recommend(self, user_query, rows=None, words_to_remove=None, selected_keywords=None, top_n=10):
+        """Seperti ranked_rows, tetapi sebagai DataFrame RESULT_COLUMNS (kosong jika tidak ada yang cocok)."""
+        top, scores = self.ranked_rows(user_query, rows, words_to_remove, selected_keywords, top_n)
+        if len(top) == 0:
+            return _empty_results()
+        return self.df[['Program', 'Semester', 'Course']].iloc[top].assign(**{'Similarity Score': (scores * 100).round(2)})
+
+    def records(self, top, scores):
+        """Recommendation untuk posisi baris top; hanya top_n baris yang disentuh."""
+        columns = self._columns
+        return [
+            Recommendation(*fields)
+            for fields in zip(
+                top.tolist(),
+                columns['Program'][top].tolist(),
+                columns['Semester'][top].tolist(),
+                columns['Course'][top].tolist(),
+                (scores * 100).round(2).tolist(),
+                self.details.program_descriptions(top),
+                self.details.advice(top),
+                self.course_ids[top].tolist(),
+            )
+        ]
+
+    def page_records(self, ranked, page=0, page_size=None):
+        """Recommendation untuk satu halaman dari (posisi baris, skor) terurut; seluruh daftar jika page_size None."""
+        top, scores = ranked
+        if page_size is not None:
+            start = page * page_size
+            top, scores = top[start:start + page_size], scores[start:start + page_size]
+        return self.records(top, scores)
+
+    def rows_for_ids(self, ids):
+        """Posisi baris untuk setiap course_id (baris pertama jika kembar); -1 jika tidak ada di katalog ini."""
+        ids = np.asarray(ids, dtype=np.int64)
+        if not len(self._sorted_ids):
+            return np.full(len(ids), -1, dtype=np.int64)
+        found = np.minimum(np.searchsorted(self._sorted_ids, ids), len(self._sorted_ids) - 1)
+        return np.where(self._sorted_ids[found] == ids, self._id_order[found], -1)
+
+    def courses(self, ids):
+        """Recommendation (skor 0) untuk course_id yang masih ada di katalog, urutan ids dipertahankan."""
+        rows = self.rows_for_ids(ids)
+        rows = rows[rows >= 0]
+        return self.records(rows, np.zeros(len(rows)))
+
+    def career_paths(self, ids, top_k=8):
+        """Saran karir untuk course_id (mis. bookmark) lewat CareerIndex; id yang sudah tidak ada diabaikan."""
+        rows = self.rows_for_ids(ids)
+        return self.careers.top_careers(rows[rows >= 0], top_k)
+
+    def suggest(self, prefix, top_k=None):
+        """Saran autocomplete (Suggestion) untuk teks yang sedang diketik."""
+        return self.suggestions.suggest(prefix, top_k)
+
+    def prepare(self, user_input, program=None, semester=None, selected_keywords=None, top_n=10):
+        """Tahap ringan sebelum skor: koreksi typo, respons chatbot (+ sentimen jika opt-in) + negasi, dan key cache hasil."""
+        with stage('correct_typos'):
+            user_input, corrections = self.corrector.correct_text(user_input)
+        with stage('detect_chatbot_responses'):
+            messages = chatbot_messages(user_input)
+        if corrections:
+            messages.insert(0, correction_message(corrections))
+        with stage('process_negation'):
+            cleaned_input, words_to_remove = parse_negation(user_input)
+            cleaned_input = drop_negated_typos(cleaned_input, corrections, words_to_remove)
+        if self.sentiment_backend:
+            # Frasa negasi ('benci bisnis') adalah filter topik, bukan suasana hati, jadi tidak ikut diskor
+            with stage('analyze_sentiment'):
+                messages += analyze_sentiment(cleaned_input, self.sentiment_backend)['messages']
+        if words_to_remove:
+            messages.append(negation_message(words_to_remove))
+        key = self.cache_key(cleaned_input, words_to_remove, selected_keywords, program, semester, top_n)
+        return messages, cleaned_input, words_to_remove, key
+
+    def search(self, user_input, program=None, semester=None, selected_keywords=None, top_n=10, page=0, page_size=None):
+        """
+        Alur tombol 'Cari': respons chatbot -> negasi -> rekomendasi dengan filter sidebar.
+        Cache menyimpan daftar terurut (posisi baris, skor) top_n per query; dengan page_size, results
+        hanya halaman ke-page (mulai 0), jadi pindah halaman tidak menskor ulang.
+        """
+        messages, cleaned_input, words_to_remove, key = self.prepare(user_input, program, semester, selected_keywords, top_n)
+        ranked = self.result_cache.get(key)
+        if ranked is None:
+            METRICS.incr('result_cache_miss')
+            with stage('get_recommendations'):
+                rows = self.facets.select(program, semester)
+                ranked = self.ranked_rows(cleaned_input, rows, words_to_remove, selected_keywords, top_n)
+            self.result_cache.put(key, ranked)
+        else:
+            METRICS.incr('result_cache_hit')
+        return SearchResult(messages, self.page_records(ranked, page, page_size), words_to_remove, len(ranked[0]), page)
+
+    def search_batch(self, requests):
+        """
+        search() untuk banyak request sekaligus (list dict argumen search). Semua cache miss diskor
+        dengan satu perkalian matriks sparse lewat rank_batch; hasilnya sama dengan search() satu per satu.
+        """
+        prepared = [
+            self.prepare(request['user_input'], request.get('program'), request.get('semester'),
+                         request.get('selected_keywords'), request.get('top_n', 10))
+            for request in requests
+        ]
+        ranked = [self.result_cache.get(key) for _, _, _, key in prepared]
+        misses = [i for i, cached in enumerate(ranked) if cached is None]
+        METRICS.incr('result_cache_hit', len(requests) - len(misses))
+        if misses:
+            METRICS.incr('result_cache_miss', len(misses))
+            with stage('get_recommendations_batch'):
+                items = []
+                for i in misses:
+                    request = requests[i]
+                    _, cleaned_input, words_to_remove, _ = prepared[i]
+                    rows = self.facets.select(request.get('program'), request.get('semester'))
+                    items.append((cleaned_input, words_to_remove, rows, request.get('selected_keywords'), request.get('top_n', 10)))
+                for i, found in zip(misses, self.rank_batch(items)):
+                    ranked[i] = found
+                    self.result_cache.put(prepared[i][3], found)
+        return [
+            SearchResult(messages, self.page_records(found, request.get('page', 0), request.get('page_size')),
+                         words_to_remove, len(found[0]), request.get('page', 0))
+            for request, (messages, _, words_to_remove, _), found in zip(requests, prepared, ranked)
+        ]
+
+    def cache_key(self, cleaned_input, words_to_remove, selected_keywords, program, semester, top_n):
+        """Key cache hasil: output parse_negation + keyword terurut + filter + versi katalog."""
+        return (
+            self.version,
+            ' '.join(cleaned_input.split()),
+            tuple(sorted(set(words_to_remove))),
+            tuple(sorted(selected_keywords or ())),
+            program,
+            semester,
+            top_n,
+        )
+
+    def rank_batch(self, items):
+        """
+        items: list (cleaned_input, words_to_remove, rows, selected_keywords, top_n) dengan rows seperti
+        ranked_rows. Semua query diskor dengan satu perkalian matriks sparse; per item dikembalikan
+        (posisi baris, skor 0-1) yang sama dengan ranked_rows.
+        """
+        none = np.empty(0, dtype=np.int64), np.empty(0)
+        if self.index is None:
+            return [none for _ in items]
+        query_vecs = self.query_encoder.encode([(cleaned, selected_keywords) for cleaned, _, _, selected_keywords, _ in items])
+        scores = self.index.score_vectors(query_vecs)
+        hybrid = bool(self.dense_weight) and self.dense is not None
+        if hybrid:
+            embedded = self.dense.embed(query_vecs)
+
+        # Mask baris per objek rows (filter yang sama dipakai banyak query dalam satu batch)
+        masks = {}
+        results = []
+        for i, (cleaned, words_to_remove, rows, selected_keywords, top_n) in enumerate(items):
+            if not cleaned.strip() and not selected_keywords:
+                results.append(none)
+                continue
+            start, end = scores.indptr[i], scores.indptr[i + 1]
+            cols, vals = scores.indices[start:end], scores.data[start:end]
+
+            if rows is not None:
+                allowed = masks.get(id(rows))
+                if allowed is None:
+                    allowed = masks[id(rows)] = np.zeros(len(self.df), dtype=bool)
+                    allowed[rows] = True
+                keep = allowed[cols]
+                cols, vals = cols[keep], vals[keep]
+            if hybrid:
+                dense_rows, dense_scores = self.dense.search(embedded[i], rows)
+                cols, vals = blend_scores(cols, vals, dense_rows, dense_scores, self.dense_weight)
+            if words_to_remove:
+                keep = np.isin(cols, self.negation_index.exclude(cols, words_to_remove))
+                cols, vals = cols[keep], vals[keep]
+            results.append(top_rows(cols.astype(np.int64), vals, top_n))
+        return results
+
+    def recommend_batch(self, queries, rows=None, selected_keywords=None, top_n=10):
+        """
+        Skor banyak query sekaligus dengan satu perkalian matriks sparse. Mengembalikan list
+        (per query) berisi (kata negasi, [(posisi baris, skor 0-1), ...]) terurut dari skor tertinggi.
+        """
+        parsed = []
+        for query in queries:
+            corrected, corrections = self.corrector.correct_text(query)
+            cleaned, words_to_remove = parse_negation(corrected)
+            parsed.append((drop_negated_typos(cleaned, corrections, words_to_remove), words_to_remove))
+        ranked = self.rank_batch([(cleaned, words_to_remove, rows, selected_keywords, top_n) for cleaned, words_to_remove in parsed])
+        return [
+            (words_to_remove, list(zip(cols.tolist(), vals.tolist())))
+            for (_, words_to_remove), (cols, vals) in zip(parsed, ranked)
+        ]
@@ -0,0 +1,166 @@
+"""
+Koreksi typo kata query ("ngodingg", "desaint", "akuntasi") dengan indeks penghapusan ala SymSpell.
+
+Indeks dibangun sekali dari key KEYWORD_MAPPING, trigger chatbot, kata sentimen, dan vocabulary katalog:
+setiap term disimpan di bawah semua varian hasil menghapus 1..max_distance huruf (dari prefix
+sepanjang prefix_length). Per kata query cukup membangkitkan varian penghapusannya sendiri dan
+mencari di dict, lalu jarak edit hanya dihitung untuk segelintir kandidat, bukan seluruh vocabulary.
+
+Koreksi sengaja konservatif: hanya kata yang tidak dikenal sama sekali dan cukup panjang untuk jarak
+editnya (DISTANCE_MIN_LENGTH) yang dikoreksi, bentuk berimbuhan dari term (menyanyi/nyanyi,
+youtube/youtuber) tidak dianggap typo, dan kata asli tetap ikut di query di samping koreksinya.
+"""
+import re
+from itertools import combinations
+
+from .sentiment import NEGATORS, POLARITY_LEXICON, PREFIX_INTENSIFIERS, SUFFIX_INTENSIFIERS
+from .text import CHATBOT_INTENTS, KEYWORD_MAPPING
+
+# Kata umum yang bukan target koreksi tapi juga tidak boleh "dibetulkan" (mis. masuk -> masak)
+COMMON_WORDS = {
+    "saya", "aku", "gue", "gw", "kamu", "dia", "kami", "kita", "mereka", "yang", "dan", "atau", "tapi",
+    "tetapi", "dengan", "untuk", "dari", "pada", "dalam", "karena", "sama", "juga", "lagi", "banyak",
+    "ini", "itu", "ada", "mau", "bisa", "akan", "sudah", "udah", "belum", "masih", "jadi", "nanti",
+    "kerja", "bekerja", "kuliah", "jurusan", "kampus", "masuk", "pilih", "milih", "cari", "bidang",
+    "orang", "hal", "kalau", "kalo", "soal", "buat", "bikin", "punya", "pengin", "kayak", "seperti",
+    "lebih", "paling", "cukup", "agak", "dong", "deh", "sih", "nih", "kok", "banget", "hobby",
+    "the", "and", "with", "about", "want", "would", "really",
+}
+
+DERIVATION_SUFFIXES = {"an", "kan", "nya", "i", "er", "s", "wan", "is", "ing"}
+DERIVATION_PREFIXES = {"me", "mem", "men", "meng", "meny", "ber", "ter", "di", "ke", "pe", "pem", "pen", "peng", "per", "se"}
+
+# Panjang kata minimum untuk setiap jarak edit: kata pendek terlalu mudah jatuh ke kata sah lain
+# (bank -> band, mobil -> mobile, renang -> senang)
+DISTANCE_MIN_LENGTH = {1: 7, 2: 10}
+
+_WORD_RE = re.compile(r"[a-z]+(?:-[a-z]+)*")
+
+def _edit_distance(a, b, limit):
+    """Jarak Damerau-Levenshtein (optimal string alignment); berhenti lebih awal jika > limit."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+def drop_negated_typos(cleaned_text, corrections, words_to_remove):
+    """
+    Membuang kata asli (typo) dari teks bersih jika koreksinya dinegasikan: 'benci ngodingg' menjadi
+    'benci ngoding ngodingg', parse_negation hanya membuang 'ngoding', dan sisa 'ngodingg' masih
+    memicu KEYWORD_MAPPING/chatbot lewat substring.
+    """
+    for typo, fixed in corrections:
+        if fixed in words_to_remove:
+            cleaned_text = re.sub(rf"\b{re.escape(typo)}\b", '', cleaned_text)
+    return cleaned_text
+
+def _deletes(word, max_distance):
+    """Semua varian word dengan 0..max_distance huruf dihapus."""
+    variants = {word}
+    for removed in range(1, min(max_distance, len(word) - 1) + 1):
+        for positions in combinations(range(len(word)), removed):
+            variants.add(''.join(ch for i, ch in enumerate(word) if i not in positions))
+    return variants
+
+class FuzzyCorrector:
+    """
+    targets: pasangan (term, prioritas); jika jarak edit sama, prioritas kecil menang lalu urutan alfabet.
+    Kata yang sudah dikenal (target atau known_words) tidak pernah diubah. min_length hanya membatasi
+    term yang diindeks; batas panjang kata yang dikoreksi ada di DISTANCE_MIN_LENGTH.
+    """
+    def __init__(self, targets, known_words=(), max_distance=2, prefix_length=7, min_length=4):
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self.min_length = min_length
+        self.priority = {}
+        for term, priority in targets:
+            if term not in self.priority or priority < self.priority[term]:
+                self.priority[term] = priority
+        self.known = set(self.priority) | set(known_words)
+        self.deletes = {}
+        for term in self.priority:
+            if len(term) < self.min_length:
+                continue
+            for variant in _deletes(term[:prefix_length], max_distance):
+                self.deletes.setdefault(variant, []).append(term)
+
+    @classmethod
+    def for_vocabulary(cls, vocabulary=()):
+        """Corrector standar: key KEYWORD_MAPPING, trigger chatbot + kata sentimen/negasi, vocabulary katalog."""
+        targets = [(key, 0) for key in KEYWORD_MAPPING]
+        targets += [(trigger, 1) for intent in CHATBOT_INTENTS for trigger in intent['triggers'] if ' ' not in trigger]
+        targets += [(word, 1) for word in (*POLARITY_LEXICON, *NEGATORS)]
+        targets += [(term, 2) for term in vocabulary if term.isalpha()]
+        # Kata di teks ekspansi dan trigger multi-kata juga dikenal walau bukan target koreksi
+        known = COMMON_WORDS | set(PREFIX_INTENSIFIERS) | set(SUFFIX_INTENSIFIERS)
+        known |= {word for expansion in KEYWORD_MAPPING.values() for word in _WORD_RE.findall(expansion.lower())}
+        known |= {word for intent in CHATBOT_INTENTS for trigger in intent['triggers'] for word in trigger.split()}
+        return cls(targets, known)
+
+    def allowed_distance(self, word):
+        """Jarak edit terbesar yang boleh untuk kata sepanjang ini (0: tidak dikoreksi)."""
+        return max((distance for distance, length in DISTANCE_MIN_LENGTH.items()
+                    if distance <= self.max_distance and len(word) >= length), default=0)
+
+    @staticmethod
+    def is_derivation(word, term):
+        """True jika word dan term hanya beda imbuhan (desainer/desain, menyanyi/nyanyi, youtube/youtuber)."""
+        for longer, shorter in ((word, term), (term, word)):
+            if longer.startswith(shorter):
+                suffix = longer[len(shorter):]
+                # Huruf akhir yang berulang (bisniss, ngodingg) tetap typo; youtube + er -> youtuber
+                if suffix != shorter[-1] and (suffix in DERIVATION_SUFFIXES or shorter[-1] + suffix in DERIVATION_SUFFIXES):
+                    return True
+            if longer.endswith(shorter) and longer[:-len(shorter)] in DERIVATION_PREFIXES:
+                return True
+        return False
+
+    def correct(self, word):
+        """Term terdekat untuk satu kata, atau word apa adanya jika dikenal / terlalu pendek / tidak ada kandidat."""
+        if word in self.known or not word.replace('-', '').isalpha():
+            return word
+        limit = self.allowed_distance(word)
+        if not limit:
+            return word
+        candidates = set()
+        for variant in _deletes(word[:self.prefix_length], limit):
+            candidates.update(self.deletes.get(variant, ()))
+        best = None
+        for term in candidates:
+            if self.is_derivation(word, term):
+                continue
+            distance = _edit_distance(word, term, limit)
+            if distance <= limit:
+                rank = (distance, self.priority[term], term)
+                if best is None or rank < best:
+                    best = rank
+        return best[2] if best else word
+
+    def correct_text(self, text):
+        """
+        (teks lowercase, list (kata asli, koreksi)). Kata asli tidak diganti: koreksi disisipkan tepat
+        sebelumnya ("bisniss" -> "bisnis bisniss"), jadi 'tidak suka bisniss' tetap menegasikan koreksinya.
+        """
+        corrections = []
+
+        def replace(match):
+            word = match.group(0)
+            fixed = self.correct(word)
+            if fixed == word:
+                return word
+            corrections.append((word, fixed))
+            return f"{fixed} {word}"
+
+        corrected = _WORD_RE.sub(replace, text.lower())
+        return corrected, corrections
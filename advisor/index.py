@@ -0,0 +1,188 @@
+"""Indeks TF-IDF katalog. scikit-learn baru di-import saat indeks pertama kali dibangun."""
+from collections import namedtuple
+
+import numpy as np
+
+from .text import KEYWORD_MAPPING, expansion_keywords
+
+# Bobot komponen vektor query: teks pengguna, ekspansi KEYWORD_MAPPING yang terpicu teks (implisit),
+# dan keyword yang dipilih di multiselect (eksplisit)
+QueryWeights = namedtuple('QueryWeights', ['text', 'implicit', 'explicit'])
+DEFAULT_QUERY_WEIGHTS = QueryWeights(1.0, 1.0, 1.0)
+
+class CourseIndex:
+    """
+    Indeks TF-IDF katalog yang di-fit sekali saat data dimuat.
+    Per query cukup transform query + satu perkalian sparse; filter dilakukan dengan memilih baris.
+    """
+    def __init__(self, combined_features):
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        self.vectorizer = TfidfVectorizer(stop_words='english')
+        self.matrix = self.vectorizer.fit_transform(combined_features).tocsr()
+
+    @classmethod
+    def from_parts(cls, vocabulary, idf, matrix):
+        """CourseIndex dari vocabulary (term -> kolom), bobot IDF, dan matriks baris yang sudah jadi."""
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        index = cls.__new__(cls)
+        index.vectorizer = TfidfVectorizer(stop_words='english')
+        index.vectorizer.vocabulary_ = vocabulary
+        index.vectorizer.idf_ = idf
+        index.matrix = matrix
+        return index
+
+    def query_vectors(self, queries):
+        """Vektor TF-IDF query (sparse, query x term) di ruang kolom matriks indeks."""
+        return self.vectorizer.transform(queries)
+
+    def score(self, query, rows=None):
+        """Cosine similarity query ke setiap baris (baris TF-IDF sudah ter-normalisasi L2)."""
+        return self.score_vector(self.query_vectors([query]), rows)
+
+    def score_vector(self, query_vec, rows=None):
+        """score() untuk vektor query yang sudah jadi (sparse 1 x term)."""
+        scores = (self.matrix @ query_vec.T).toarray().ravel()
+        return scores if rows is None else scores[rows]
+
+    def score_batch(self, queries):
+        """Skor banyak query sekaligus: matriks sparse (query x baris katalog) dari satu perkalian."""
+        return self.score_vectors(self.query_vectors(queries))
+
+    def score_vectors(self, query_vecs):
+        """score_batch() untuk vektor query yang sudah jadi."""
+        return (query_vecs @ self.matrix.T).tocsr()
+
+    def updated(self, kept, added_features):
+        """
+        CourseIndex baru dengan vocabulary dan bobot IDF yang sama: baris lama `kept` dipakai ulang,
+        hanya baris tambahan yang di-transform. Term baru di luar vocabulary diabaikan sampai rebuild.
+        """
+        from scipy.sparse import vstack
+
+        index = CourseIndex.__new__(CourseIndex)
+        index.vectorizer = self.vectorizer
+        index.matrix = vstack([self.matrix[kept], self.vectorizer.transform(added_features)]).tocsr()
+        return index
+
+    def oov_ratio(self, texts):
+        """Porsi token (setelah stop words) dari texts yang tidak ada di vocabulary indeks."""
+        analyze = self.vectorizer.build_analyzer()
+        vocabulary = self.vectorizer.vocabulary_
+        total = unknown = 0
+        for text in texts:
+            for token in analyze(text):
+                total += 1
+                unknown += token not in vocabulary
+        return unknown / total if total else 0.0
+
+class QueryEncoder:
+    """
+    Vektor query di ruang kolom CourseIndex tanpa merangkai string ekspansi. Setiap teks ekspansi
+    KEYWORD_MAPPING diubah sekali menjadi bobot tf x idf per kolom saat encoder dibuat; per query hanya
+    teks pengguna yang di-tokenisasi, lalu
+        q = w.text * teks + w.implicit * ekspansi terpicu + w.explicit * keyword pilihan
+    dinormalisasi L2. Ekspansi yang sama disimpan sekali, tetapi bobotnya dikali jumlah key yang memicunya
+    ("gambar" dan "menggambar" -> 2x), jadi dengan bobot 1 hasilnya sama dengan transform(expand_query(...)).
+    """
+    def __init__(self, index, weights=DEFAULT_QUERY_WEIGHTS):
+        self.weights = QueryWeights(*weights)
+        self.analyze = index.vectorizer.build_analyzer()
+        self.vocabulary = index.vectorizer.vocabulary_
+        self.idf = np.asarray(index.vectorizer.idf_).tolist()
+        expansions = list(dict.fromkeys(KEYWORD_MAPPING.values()))
+        self.slots = {keyword: expansions.index(expansion) for keyword, expansion in KEYWORD_MAPPING.items()}
+        self.expansions = [self.term_weights(expansion) for expansion in expansions]
+
+    def term_weights(self, text):
+        """{kolom: tf x idf} untuk text (tanpa normalisasi); term di luar vocabulary diabaikan."""
+        weights = {}
+        for term in self.analyze(text):
+            column = self.vocabulary.get(term)
+            if column is not None:
+                weights[column] = weights.get(column, 0.0) + self.idf[column]
+        return weights
+
+    def encode(self, items):
+        """items: list (teks query, selected_keywords) -> matriks sparse (query x term) ter-normalisasi L2."""
+        from scipy.sparse import csr_matrix
+
+        weights = self.weights
+        indptr, indices, data = [0], [], []
+        for text, selected_keywords in items:
+            text = text.lower()
+            parts = [(self.term_weights(text), weights.text)]
+            slot_weights = {}
+            for keyword in expansion_keywords(text):
+                slot = self.slots[keyword]
+                slot_weights[slot] = slot_weights.get(slot, 0.0) + weights.implicit
+            for slot in [self.slots[k] for k in selected_keywords or () if k in self.slots]:
+                slot_weights[slot] = slot_weights.get(slot, 0.0) + weights.explicit
+            parts.extend((self.expansions[slot], weight) for slot, weight in slot_weights.items())
+            # Keyword di luar mapping (mis. kata kunci bebas) di-vectorize seperti teks biasa
+            free = [k for k in selected_keywords or () if k not in self.slots]
+            if free:
+                parts.append((self.term_weights(' '.join(free)), weights.explicit))
+
+            vector = {}
+            for part, weight in parts:
+                for column, value in part.items():
+                    vector[column] = vector.get(column, 0.0) + weight * value
+            columns = sorted(column for column, value in vector.items() if value)
+            values = np.array([vector[column] for column in columns])
+            norm = np.sqrt(values @ values)
+            indices.extend(columns)
+            data.extend((values / norm).tolist())
+            indptr.append(len(indices))
+        return csr_matrix((data, indices, indptr), shape=(len(items), len(self.idf)))
+
+class CourseIndexBuilder:
+    """
+    Membangun CourseIndex per chunk tanpa menyimpan teks: setiap chunk langsung dihitung menjadi
+    matriks count sparse dengan vocabulary yang terus bertambah. build() menghitung IDF dari document
+    frequency seluruh chunk, sehingga hasilnya sama dengan CourseIndex(semua teks sekaligus).
+    """
+    def __init__(self):
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        self.analyze = TfidfVectorizer(stop_words='english').build_analyzer()
+        self.vocabulary = {}
+        self.chunks = []
+        self.n_rows = 0
+
+    def add(self, texts):
+        vocabulary = self.vocabulary
+        indptr, indices, counts = [0], [], []
+        for text in texts:
+            row = {}
+            for term in self.analyze(text):
+                column = vocabulary.setdefault(term, len(vocabulary))
+                row[column] = row.get(column, 0) + 1
+            indices.extend(row)
+            counts.extend(row.values())
+            indptr.append(len(indices))
+        # Jumlah kolom belum final; build() menyamakan lebar semua chunk
+        self.chunks.append((np.array(indptr, dtype=np.int64), np.array(indices, dtype=np.int64), np.array(counts, dtype=np.float64)))
+        self.n_rows += len(indptr) - 1
+
+    def build(self):
+        from scipy.sparse import csr_matrix, vstack
+        from sklearn.preprocessing import normalize
+
+        n_terms = len(self.vocabulary)
+        # Kolom diurutkan alfabetis seperti TfidfVectorizer.fit
+        terms = sorted(self.vocabulary)
+        order = np.empty(n_terms, dtype=np.int64)
+        order[[self.vocabulary[term] for term in terms]] = np.arange(n_terms)
+        counts = vstack([
+            csr_matrix((data, order[indices], indptr), shape=(len(indptr) - 1, n_terms))
+            for indptr, indices, data in self.chunks
+        ]).tocsr()
+        counts.sort_indices()
+
+        document_frequency = np.bincount(counts.indices, minlength=n_terms)
+        idf = np.log((1 + self.n_rows) / (1 + document_frequency)) + 1
+        matrix = normalize(counts.multiply(idf).tocsr(), norm='l2', copy=False)
+        vocabulary = {term: column for column, term in enumerate(terms)}
+        return CourseIndex.from_parts(vocabulary, idf, matrix)
@@ -0,0 +1,197 @@
+"""
+Ingesti katalog streaming untuk kurikulum banyak fakultas / kampus mitra (jutaan baris, banyak file).
+
+Setiap sumber CSV/XLSX dibaca per chunk dengan dtype eksplisit (Program kategori, Semester teks lalu
+dikonversi ke int16), baris kosong atau dengan Semester bukan angka dibuang dan duplikat
+(Program, Semester, Course) antar file dilewati. Setiap chunk langsung masuk ke builder indeks TF-IDF
+dan negasi lalu dilepas, sehingga teks kerja dibatasi ukuran chunk; yang tetap tumbuh bersama jumlah
+baris unik hanya kolom katalog ringkas, hash dedupe (8 byte per baris), dan indeks akhir.
+
+Contoh:
+    python -m advisor.ingest fakultas_*.csv mitra.xlsx --chunk-size 50000 -o katalog_gabungan.csv
+    python -m advisor.ingest fakultas_*.csv --snapshot snapshot_kampus/
+"""
+import argparse
+import csv
+import sys
+import time
+
+import numpy as np
+
+from .catalog import FacetIndex, NegationIndexBuilder, course_ids, empty_catalog
+from .engine import RecommendationEngine
+from .index import CourseIndexBuilder
+from .snapshot import source_fingerprint, write_snapshot
+
+SOURCE_COLUMNS = ['Program', 'Semester', 'Course']
+SEMESTER_DTYPE = np.int16
+
+def read_source_chunks(path, chunk_size=50000):
+    """DataFrame per chunk berisi SOURCE_COLUMNS (masih mentah) dari satu file CSV atau XLSX."""
+    import pandas as pd
+
+    if path.endswith(('.xlsx', '.xlsm')):
+        from openpyxl import load_workbook
+
+        # read_only: baris dibaca bertahap dari file, bukan seluruh sheet sekaligus
+        workbook = load_workbook(path, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = [str(name).strip() if name is not None else '' for name in next(rows, ())]
+            positions = [header.index(column) for column in SOURCE_COLUMNS]
+            batch = []
+            for row in rows:
+                batch.append([row[i] if i < len(row) else None for i in positions])
+                if len(batch) >= chunk_size:
+                    yield pd.DataFrame(batch, columns=SOURCE_COLUMNS)
+                    batch = []
+            if batch:
+                yield pd.DataFrame(batch, columns=SOURCE_COLUMNS)
+        finally:
+            workbook.close()
+        return
+
+    yield from pd.read_csv(
+        path,
+        usecols=SOURCE_COLUMNS,
+        # Semester teks: sel bukan angka dibuang di clean_chunk, bukan menggagalkan seluruh file
+        dtype={'Program': 'category', 'Semester': str, 'Course': str},
+        chunksize=chunk_size,
+    )
+
+def clean_chunk(chunk):
+    """dropna + Semester int16 + teks dirapikan; baris dengan Semester bukan angka dibuang."""
+    import pandas as pd
+
+    semester = pd.to_numeric(chunk['Semester'], errors='coerce')
+    program = chunk['Program'].astype(object).where(chunk['Program'].notna())
+    course = chunk['Course'].astype(object).where(chunk['Course'].notna())
+    valid = semester.notna() & program.notna() & course.notna()
+    return (
+        program[valid].astype(str).str.strip().tolist(),
+        semester[valid].astype(SEMESTER_DTYPE).to_numpy(),
+        course[valid].astype(str).str.strip().tolist(),
+    )
+
+class CatalogIngest:
+    """
+    Mengumpulkan chunk menjadi satu katalog + indeks. Program disimpan sebagai kode kategori,
+    Semester sebagai int16; teks combined_features hanya hidup selama chunk diproses. Kolom katalog
+    dan `seen` (hash course_ids terurut, int64) tetap tumbuh sebanding jumlah baris unik: keduanya
+    memang bagian dari katalog akhir / dedupe antar file, jadi memori tidak dibatasi ukuran chunk.
+    """
+    def __init__(self):
+        self.programs = {}
+        self.program_codes = []
+        self.semesters = []
+        self.courses = []
+        self.seen = np.empty(0, dtype=np.int64)
+        self.index_builder = CourseIndexBuilder()
+        self.negation_builder = NegationIndexBuilder()
+        self.rows_read = 0
+        self.duplicates = 0
+
+    @property
+    def rows(self):
+        return self.negation_builder.n_rows
+
+    def add(self, chunk):
+        import pandas as pd
+
+        programs, semesters, courses = clean_chunk(chunk)
+        self.rows_read += len(chunk)
+        ids = course_ids(pd.DataFrame({'Program': programs, 'Semester': semesters, 'Course': courses}))
+        # Baris pertama tiap id di chunk ini, dan hanya jika belum muncul di chunk sebelumnya
+        found = np.minimum(np.searchsorted(self.seen, ids), max(len(self.seen) - 1, 0))
+        new = ~pd.Series(ids).duplicated().to_numpy()
+        if len(self.seen):
+            new &= self.seen[found] != ids
+        keep = np.flatnonzero(new).tolist()
+        self.duplicates += len(ids) - len(keep)
+        if not keep:
+            return
+        self.seen = np.union1d(self.seen, ids[keep])
+        programs = [programs[i] for i in keep]
+        courses = [courses[i] for i in keep]
+        self.program_codes.append(np.array([self.programs.setdefault(p, len(self.programs)) for p in programs], dtype=np.int32))
+        self.semesters.append(semesters[keep])
+        self.courses.extend(courses)
+
+        features = [f"{course} {program}" for course, program in zip(courses, programs)]
+        self.index_builder.add(features)
+        self.negation_builder.add(features)
+
+    def build_catalog(self):
+        import pandas as pd
+
+        if not self.courses:
+            return empty_catalog()
+        categories = list(self.programs)
+        return pd.DataFrame({
+            'Program': pd.Categorical.from_codes(np.concatenate(self.program_codes), categories=categories),
+            'Semester': np.concatenate(self.semesters),
+            'Course': self.courses,
+        })
+
+    def build_engine(self, **engine_kwargs):
+        """RecommendationEngine dari semua chunk; indeks dirakit dari builder, bukan dibangun ulang."""
+        df = self.build_catalog()
+        if df.empty:
+            return RecommendationEngine(df, **engine_kwargs)
+        return RecommendationEngine(
+            df,
+            facets=FacetIndex(df),
+            negation_index=self.negation_builder.build(),
+            index=self.index_builder.build(),
+            **engine_kwargs,
+        )
+
+def ingest_catalog(paths, chunk_size=50000, progress=None, **engine_kwargs):
+    """
+    Membaca semua sumber secara streaming dan mengembalikan (engine, ingest).
+    progress(ingest, elapsed_detik) dipanggil setelah setiap chunk.
+    """
+    ingest = CatalogIngest()
+    started = time.perf_counter()
+    for path in paths:
+        for chunk in read_source_chunks(path, chunk_size):
+            ingest.add(chunk)
+            if progress:
+                progress(ingest, time.perf_counter() - started)
+    return ingest.build_engine(**engine_kwargs), ingest
+
+def print_progress(ingest, elapsed):
+    print(f"{ingest.rows_read} baris dibaca, {ingest.rows} unik ({ingest.rows_read / max(elapsed, 1e-9):.0f} baris/detik)", file=sys.stderr)
+
+def run(args):
+    started = time.perf_counter()
+    fingerprints = [source_fingerprint(path) for path in args.sources] if args.snapshot else None
+    engine, ingest = ingest_catalog(args.sources, args.chunk_size, print_progress)
+    elapsed = time.perf_counter() - started
+    print(
+        f"Selesai: {ingest.rows_read} baris dibaca, {ingest.rows} unik, {ingest.duplicates} duplikat, "
+        f"{len(engine.facets.programs)} program dalam {elapsed:.2f} detik "
+        f"({ingest.rows_read / max(elapsed, 1e-9):.0f} baris/detik)",
+        file=sys.stderr,
+    )
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8', newline='') as out:
+            writer = csv.writer(out)
+            writer.writerow(SOURCE_COLUMNS)
+            writer.writerows(zip(engine.df['Program'], engine.df['Semester'].tolist(), engine.df['Course']))
+        print(f"Katalog gabungan ditulis ke {args.output}", file=sys.stderr)
+    if args.snapshot and engine.index is not None:
+        manifest = write_snapshot(engine, args.snapshot, fingerprints)
+        print(f"Snapshot {manifest['catalog_version']} ditulis ke {args.snapshot}", file=sys.stderr)
+    return engine
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ingesti katalog mata kuliah dari banyak file CSV/XLSX secara streaming.")
+    parser.add_argument('sources', nargs='+', help="File katalog .csv / .xlsx dengan kolom Program, Semester, Course")
+    parser.add_argument('--chunk-size', type=int, default=50000)
+    parser.add_argument('-o', '--output', default=None, help="Tulis katalog gabungan (tanpa duplikat) ke CSV ini")
+    parser.add_argument('--snapshot', default=None, help="Tulis snapshot mmap (advisor.snapshot) ke direktori ini")
+    run(parser.parse_args(argv))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,5 @@
+"""Pesan untuk ditampilkan UI; core tidak memanggil Streamlit secara langsung."""
+from collections import namedtuple
+
+# level: nama fungsi Streamlit yang dipakai untuk menampilkan ('info', 'success', 'warning', 'caption', ...)
+Message = namedtuple('Message', ['level', 'text'])
@@ -0,0 +1,290 @@
+"""
+Instrumentasi ringan untuk hot path: timer per tahap, counter, dan riwayat N request terakhir.
+
+    with request_trace('search'):
+        with stage('score'):
+            ...
+
+Timer tahap selalu aktif (biayanya satu perf_counter di awal dan akhir). Profiling berat
+(cProfile / tracemalloc) hanya dijalankan jika diminta lewat env ADVISOR_PROFILE atau argumen
+`profile` (mis. dari query parameter). Statistik agregat bisa diekspor ke file JSON atau teks
+Prometheus; jika env ADVISOR_METRICS_FILE diisi, thread latar menulis ulang file itu setelah request
+selesai, paling sering sekali per ADVISOR_METRICS_INTERVAL detik (request tidak pernah menunggu disk).
+"""
+import atexit
+import contextvars
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+
+PROFILE_ENV = 'ADVISOR_PROFILE'
+METRICS_FILE_ENV = 'ADVISOR_METRICS_FILE'
+METRICS_INTERVAL_ENV = 'ADVISOR_METRICS_INTERVAL'
+DEFAULT_EXPORT_INTERVAL = 5.0
+PROFILE_MODES = {'cprofile', 'tracemalloc', 'all'}
+
+# Batas atas bucket histogram (detik), mengikuti gaya Prometheus
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+# Batas atas bucket histogram ukuran (jumlah item: ukuran batch, kedalaman antrian)
+SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512)
+
+_current_trace = contextvars.ContextVar('advisor_trace', default=None)
+
+class StageStats:
+    def __init__(self, bounds=BUCKETS):
+        self.bounds = bounds
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(bounds) + 1)
+
+    def observe(self, value):
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+        for i, bound in enumerate(self.bounds):
+            if value <= bound:
+                self.buckets[i] += 1
+                return
+        self.buckets[-1] += 1
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'total_ms': self.total * 1000,
+            'mean_ms': self.total / self.count * 1000 if self.count else 0.0,
+            'max_ms': self.max * 1000,
+        }
+
+    def size_dict(self):
+        """Ringkasan untuk histogram ukuran: rata-rata, maksimum, dan jumlah per bucket."""
+        labels = [f"<={bound}" for bound in self.bounds] + [f">{self.bounds[-1]}"]
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else 0.0,
+            'max': self.max,
+            'buckets': dict(zip(labels, self.buckets)),
+        }
+
+class RequestTrace:
+    """Rincian waktu per tahap untuk satu request (satu klik 'Cari')."""
+    def __init__(self, label):
+        self.label = label
+        self.started_at = time.time()
+        self.stages = {}
+        self.total = 0.0
+        self.profile = None
+        self.peak_memory_kb = None
+
+    def to_dict(self):
+        record = {
+            'label': self.label,
+            'started_at': self.started_at,
+            'total_ms': self.total * 1000,
+            'stages_ms': {name: seconds * 1000 for name, seconds in self.stages.items()},
+        }
+        if self.peak_memory_kb is not None:
+            record['peak_memory_kb'] = self.peak_memory_kb
+        if self.profile is not None:
+            record['profile'] = self.profile
+        return record
+
+class MetricsRegistry:
+    """Agregat per tahap + counter + N request terakhir; aman dipakai banyak thread."""
+    def __init__(self, history=50):
+        self._lock = threading.Lock()
+        self.stages = {}
+        self.sizes = {}
+        self.counters = Counter()
+        self.recent = deque(maxlen=history)
+        self._export_lock = threading.Lock()
+        self._exporters = {}
+
+    def observe(self, name, seconds):
+        with self._lock:
+            stats = self.stages.get(name)
+            if stats is None:
+                stats = self.stages[name] = StageStats()
+            stats.observe(seconds)
+
+    def observe_size(self, name, value):
+        """Histogram ukuran (mis. ukuran batch, kedalaman antrian), terpisah dari timer tahap."""
+        with self._lock:
+            stats = self.sizes.get(name)
+            if stats is None:
+                stats = self.sizes[name] = StageStats(SIZE_BUCKETS)
+            stats.observe(value)
+
+    def size_stats(self, name):
+        with self._lock:
+            stats = self.sizes.get(name)
+            return stats.size_dict() if stats is not None else None
+
+    def incr(self, name, amount=1):
+        with self._lock:
+            self.counters[name] += amount
+
+    def finish(self, trace):
+        self.observe(f"request.{trace.label}", trace.total)
+        with self._lock:
+            self.recent.append(trace.to_dict())
+
+    def recent_requests(self):
+        with self._lock:
+            return list(self.recent)
+
+    def to_json(self, extra=None):
+        with self._lock:
+            data = {
+                'stages': {name: stats.to_dict() for name, stats in sorted(self.stages.items())},
+                'sizes': {name: stats.size_dict() for name, stats in sorted(self.sizes.items())},
+                'counters': dict(self.counters),
+                'recent': list(self.recent),
+            }
+        if extra:
+            data.update(extra)
+        return data
+
+    def to_prometheus(self, gauges=None):
+        """Teks format eksposisi Prometheus. gauges: dict nama -> angka (mis. statistik cache)."""
+        out = io.StringIO()
+        with self._lock:
+            out.write("# HELP advisor_stage_seconds Durasi per tahap pipeline rekomendasi\n")
+            out.write("# TYPE advisor_stage_seconds histogram\n")
+            for name, stats in sorted(self.stages.items()):
+                cumulative = 0
+                for bound, count in zip(BUCKETS, stats.buckets):
+                    cumulative += count
+                    out.write(f'advisor_stage_seconds_bucket{{stage="{name}",le="{bound}"}} {cumulative}\n')
+                out.write(f'advisor_stage_seconds_bucket{{stage="{name}",le="+Inf"}} {stats.count}\n')
+                out.write(f'advisor_stage_seconds_sum{{stage="{name}"}} {stats.total}\n')
+                out.write(f'advisor_stage_seconds_count{{stage="{name}"}} {stats.count}\n')
+            out.write("# HELP advisor_size Histogram ukuran (batch, kedalaman antrian)\n")
+            out.write("# TYPE advisor_size histogram\n")
+            for name, stats in sorted(self.sizes.items()):
+                cumulative = 0
+                for bound, count in zip(SIZE_BUCKETS, stats.buckets):
+                    cumulative += count
+                    out.write(f'advisor_size_bucket{{name="{name}",le="{bound}"}} {cumulative}\n')
+                out.write(f'advisor_size_bucket{{name="{name}",le="+Inf"}} {stats.count}\n')
+                out.write(f'advisor_size_sum{{name="{name}"}} {stats.total}\n')
+                out.write(f'advisor_size_count{{name="{name}"}} {stats.count}\n')
+            out.write("# HELP advisor_events_total Counter kejadian (cache hit/miss, dsb.)\n")
+            out.write("# TYPE advisor_events_total counter\n")
+            for name, value in sorted(self.counters.items()):
+                out.write(f'advisor_events_total{{event="{name}"}} {value}\n')
+        for name, value in sorted((gauges or {}).items()):
+            out.write(f"# TYPE advisor_{name} gauge\nadvisor_{name} {value}\n")
+        return out.getvalue()
+
+    def export(self, path, extra=None):
+        """Menulis statistik ke path: .prom/.txt -> teks Prometheus, selain itu JSON."""
+        if path.endswith(('.prom', '.txt')):
+            numeric = {k: v for k, v in (extra or {}).items() if isinstance(v, (int, float))}
+            content = self.to_prometheus(numeric)
+        else:
+            content = json.dumps(self.to_json(extra), indent=2)
+        # File sementara unik per panggilan + lock: ekspor dari banyak thread tidak saling menimpa
+        with self._export_lock:
+            with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=os.path.dirname(path) or '.',
+                                             prefix=f"{os.path.basename(path)}.", suffix='.tmp', delete=False) as f:
+                f.write(content)
+            try:
+                os.replace(f.name, path)
+            except OSError:
+                os.unlink(f.name)
+                raise
+        return path
+
+    def export_later(self, path, interval=DEFAULT_EXPORT_INTERVAL):
+        """Menandai path perlu ditulis ulang; thread latar per path menulisnya paling sering sekali per interval."""
+        with self._lock:
+            pending = self._exporters.get(path)
+            if pending is None:
+                pending = self._exporters[path] = threading.Event()
+                threading.Thread(target=self._export_loop, args=(path, pending, interval),
+                                 name='metrics-exporter', daemon=True).start()
+                atexit.register(self._export_pending, path, pending)
+        pending.set()
+
+    def _export_pending(self, path, pending):
+        if pending.is_set():
+            pending.clear()
+            try:
+                self.export(path)
+            except OSError as exc:
+                print(f"Gagal mengekspor metrics ke {path}: {exc!r}", file=sys.stderr)
+
+    def _export_loop(self, path, pending, interval):
+        while True:
+            pending.wait()
+            self._export_pending(path, pending)
+            time.sleep(interval)
+
+METRICS = MetricsRegistry()
+
+@contextmanager
+def stage(name):
+    """Mencatat durasi blok ke agregat global dan ke request yang sedang berjalan (jika ada)."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        METRICS.observe(name, elapsed)
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.stages[name] = trace.stages.get(name, 0.0) + elapsed
+
+def profile_mode(requested=None):
+    """Mode profiling aktif: argumen (mis. query parameter) atau env ADVISOR_PROFILE; None jika mati."""
+    mode = (requested or os.environ.get(PROFILE_ENV) or '').lower()
+    return mode if mode in PROFILE_MODES else None
+
+@contextmanager
+def request_trace(label='search', profile=None):
+    """Membuka satu RequestTrace; tahap di dalamnya tercatat ke trace ini."""
+    trace = RequestTrace(label)
+    token = _current_trace.set(trace)
+    mode = profile_mode(profile)
+    profiler = None
+    if mode in ('cprofile', 'all'):
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+    tracing_memory = False
+    if mode in ('tracemalloc', 'all'):
+        import tracemalloc
+
+        tracing_memory = not tracemalloc.is_tracing()
+        if tracing_memory:
+            tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        yield trace
+    finally:
+        trace.total = time.perf_counter() - started
+        if profiler is not None:
+            import pstats
+
+            profiler.disable()
+            buffer = io.StringIO()
+            pstats.Stats(profiler, stream=buffer).sort_stats('cumulative').print_stats(15)
+            trace.profile = buffer.getvalue()
+        if tracing_memory:
+            import tracemalloc
+
+            trace.peak_memory_kb = tracemalloc.get_traced_memory()[1] / 1024
+            tracemalloc.stop()
+        _current_trace.reset(token)
+        METRICS.finish(trace)
+        metrics_file = os.environ.get(METRICS_FILE_ENV)
+        if metrics_file:
+            METRICS.export_later(metrics_file, float(os.environ.get(METRICS_INTERVAL_ENV) or DEFAULT_EXPORT_INTERVAL))
@@ -0,0 +1,241 @@
+"""
+Log query/event append-only untuk tuning relevansi offline (KEYWORD_MAPPING, pemanasan cache).
+
+QueryLog.log() hanya memasukkan event ke antrian terbatas dan langsung kembali: jika antrian penuh,
+event dibuang dan dihitung (dropped, METRICS querylog_dropped), request tidak pernah menunggu disk.
+Satu thread latar menulis event sebagai JSON ringkas per baris ke segmen
+queries-<waktu>-<pid>-<nomor>.jsonl (dirotasi per segment_bytes, satu proses satu segmen aktif) dan
+memanggil fsync paling sering sekali per fsync_interval, bukan per event. Baris terakhir setiap segmen
+(dan saat proses berhenti) adalah event 'querylog' berisi jumlah event tertulis dan terbuang.
+
+    ADVISOR_QUERY_LOG=logs/ streamlit run main_app.py
+    python -m advisor.querylog logs/ --top 20 -o laporan.json   # top query, query tanpa hasil, latensi per tahap
+"""
+import argparse
+import atexit
+import glob
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+
+import numpy as np
+
+from .metrics import METRICS
+
+QUERY_LOG_ENV = 'ADVISOR_QUERY_LOG'
+SEGMENT_PATTERN = 'queries-*.jsonl'
+
+# Penanda di antrian: tulis semua yang sebelumnya lalu fsync sekarang
+_SYNC = object()
+
+def _encode(event):
+    return json.dumps(event, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n'
+
+class QueryLog:
+    """Penulis log event di satu direktori; aman dipanggil dari banyak thread (sesi Streamlit)."""
+    def __init__(self, directory, max_queue=10000, max_batch=1000, segment_bytes=64 * 1024 * 1024, fsync_interval=1.0):
+        self.directory = directory
+        self.max_batch = max_batch
+        self.segment_bytes = segment_bytes
+        self.fsync_interval = fsync_interval
+        self.started = round(time.time(), 3)
+        self.written = 0
+        self.dropped = 0
+        self.segments = 0
+        self._queue = queue.Queue(max_queue)
+        self._drop_lock = threading.Lock()
+        self._file = None
+        self._unsynced = False
+        self._synced_at = time.monotonic()
+        os.makedirs(directory, exist_ok=True)
+        self._writer = threading.Thread(target=self._write_loop, name='query-log-writer', daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def log(self, event, **fields):
+        """Mencatat satu event (nama + field JSON); tidak pernah memblokir."""
+        try:
+            self._queue.put_nowait({'ts': round(time.time(), 3), 'event': event, **fields})
+        except queue.Full:
+            with self._drop_lock:
+                self.dropped += 1
+            METRICS.incr('querylog_dropped')
+
+    def flush(self):
+        """Menunggu semua event yang sudah masuk antrian tertulis dan di-fsync."""
+        self._queue.put(_SYNC)
+        self._queue.join()
+
+    def close(self):
+        """Menulis event ringkasan 'querylog' lalu flush; dipanggil otomatis saat proses berhenti."""
+        self._queue.put(self._summary())
+        self.flush()
+
+    def stats(self):
+        return {
+            'written': self.written,
+            'dropped': self.dropped,
+            'queued': self._queue.qsize(),
+            'segments': self.segments,
+        }
+
+    def _summary(self):
+        return {'ts': round(time.time(), 3), 'event': 'querylog', 'pid': os.getpid(), 'started': self.started,
+                'written': self.written, 'dropped': self.dropped}
+
+    def _next_batch(self):
+        # Menunggu paling lama fsync_interval agar data yang belum di-fsync tetap tersinkron saat sepi
+        batch = [self._queue.get(timeout=self.fsync_interval)]
+        while len(batch) < self.max_batch:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _open_segment(self):
+        self.segments += 1
+        name = f"queries-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{self.segments:04d}.jsonl"
+        self._file = open(os.path.join(self.directory, name), 'ab')
+
+    def _sync(self):
+        if self._file is not None and self._unsynced:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        self._unsynced = False
+        self._synced_at = time.monotonic()
+
+    def _write(self, data):
+        if self._file is not None and self._file.tell() and self._file.tell() + len(data) > self.segment_bytes:
+            self._file.write(_encode(self._summary()))
+            self._unsynced = True
+            self._sync()
+            self._file.close()
+            self._file = None
+        if self._file is None:
+            self._open_segment()
+        self._file.write(data)
+        self._unsynced = True
+
+    def _write_loop(self):
+        while True:
+            try:
+                batch = self._next_batch()
+            except queue.Empty:
+                if self._unsynced:
+                    self._sync()
+                continue
+            events = [item for item in batch if item is not _SYNC]
+            try:
+                if events:
+                    self._write(b''.join(_encode(event) for event in events))
+                    self.written += len(events)
+                if len(events) < len(batch) or time.monotonic() - self._synced_at >= self.fsync_interval:
+                    self._sync()
+            except (OSError, TypeError, ValueError) as exc:
+                with self._drop_lock:
+                    self.dropped += len(events)
+                METRICS.incr('querylog_dropped', len(events))
+                print(f"Gagal menulis {len(events)} event query log: {exc!r}", file=sys.stderr)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+def read_events(paths):
+    """Event dari file/direktori log (segmen diurutkan nama); baris rusak (mis. terpotong saat crash) dilewati."""
+    files = []
+    for path in paths:
+        files.extend(sorted(glob.glob(os.path.join(path, SEGMENT_PATTERN))) if os.path.isdir(path) else [path])
+    for file in files:
+        with open(file, 'rb') as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+def _distribution(values):
+    values = np.asarray(values, dtype=np.float64)
+    p50, p90, p95, p99 = np.percentile(values, [50, 90, 95, 99]).tolist()
+    return {'count': len(values), 'mean_ms': float(values.mean()), 'p50_ms': p50, 'p90_ms': p90, 'p95_ms': p95,
+            'p99_ms': p99, 'max_ms': float(values.max())}
+
+def aggregate(events, top=20):
+    """
+    Ringkasan log: top query, query tanpa hasil, negasi/keyword/bookmark terbanyak, dan distribusi
+    latensi per tahap. Pindah halaman (page > 0) ikut dihitung latensinya tetapi bukan query baru.
+    """
+    queries = Counter()
+    zero_results = Counter()
+    negations = Counter()
+    keywords = Counter()
+    bookmarked = Counter()
+    latencies = defaultdict(list)
+    dropped = {}
+    for event in events:
+        kind = event.get('event')
+        if kind == 'search':
+            for name, ms in (event.get('stages_ms') or {}).items():
+                latencies[name].append(ms)
+            if event.get('total_ms') is not None:
+                latencies['request.search'].append(event['total_ms'])
+            if event.get('page'):
+                continue
+            query = ' '.join(str(event.get('query') or '').lower().split())
+            if not query and event.get('keywords'):
+                query = f"[{', '.join(sorted(event['keywords']))}]"
+            queries[query] += 1
+            if not event.get('total'):
+                zero_results[query] += 1
+            negations.update(event.get('negations') or ())
+            keywords.update(event.get('keywords') or ())
+        elif kind == 'bookmark':
+            bookmarked[event.get('course') or event.get('course_id')] += 1
+        elif kind == 'querylog':
+            # Angka di event ringkasan kumulatif per proses log
+            process = (event.get('pid'), event.get('started'))
+            dropped[process] = max(dropped.get(process, 0), event.get('dropped', 0))
+    return {
+        'searches': sum(queries.values()),
+        'unique_queries': len(queries),
+        'dropped_events': sum(dropped.values()),
+        'top_queries': queries.most_common(top),
+        'zero_result_queries': zero_results.most_common(top),
+        'top_negations': negations.most_common(top),
+        'top_keywords': keywords.most_common(top),
+        'top_bookmarked': bookmarked.most_common(top),
+        'stage_latency_ms': {name: _distribution(values) for name, values in sorted(latencies.items())},
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Agregasi query log: top query, query tanpa hasil, latensi per tahap.")
+    parser.add_argument('paths', nargs='+', help="Direktori log (ADVISOR_QUERY_LOG) atau file segmen .jsonl")
+    parser.add_argument('--top', type=int, default=20, help="Jumlah entri per daftar teratas")
+    parser.add_argument('-o', '--output', help="Tulis laporan lengkap sebagai JSON")
+    args = parser.parse_args(argv)
+
+    report = aggregate(read_events(args.paths), args.top)
+    print(f"{report['searches']} pencarian, {report['unique_queries']} query unik, "
+          f"{report['dropped_events']} event terbuang")
+    for title, key in (("Top query", 'top_queries'), ("Query tanpa hasil", 'zero_result_queries'),
+                       ("Negasi", 'top_negations'), ("Keyword pembantu", 'top_keywords'), ("Bookmark", 'top_bookmarked')):
+        if report[key]:
+            print(f"\n{title}:")
+            for value, count in report[key]:
+                print(f"  {count:6d}  {value}")
+    if report['stage_latency_ms']:
+        print("\nLatensi per tahap (ms):")
+        for name, stats in report['stage_latency_ms'].items():
+            print(f"  {name:32s} n={stats['count']:<6d} p50={stats['p50_ms']:.2f} p95={stats['p95_ms']:.2f} "
+                  f"p99={stats['p99_ms']:.2f} max={stats['max_ms']:.2f}")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\nLaporan ditulis ke {args.output}", file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+"""
+Reload katalog inkremental: memantau file CSV katalog dan memperbarui engine tanpa
+menghentikan sesi yang sedang berjalan.
+
+Perubahan dideteksi dari mtime/ukuran file lalu dipastikan dengan hash isi. Baris lama dan baru
+dibandingkan berdasarkan (Program, Semester, Course); hanya baris yang ditambah/dihapus yang
+diterapkan ke indeks. Engine lama tidak diubah: engine baru dibangun di samping lalu referensinya
+ditukar, jadi sesi yang sedang memakai engine lama tetap dilayani sampai selesai.
+"""
+import os
+import threading
+import time
+
+import numpy as np
+
+from .catalog import CATALOG_PATH, catalog_features, empty_catalog, file_digest, load_catalog
+from .engine import RecommendationEngine
+from .snapshot import load_engine, save_snapshot
+
+CATALOG_KEY = ['Program', 'Semester', 'Course']
+
+def diff_catalog(old_df, new_df):
+    """(posisi baris lama yang tetap ada, posisi baris baru yang belum ada) berdasarkan CATALOG_KEY."""
+    old_keys = list(zip(*(old_df[column] for column in CATALOG_KEY)))
+    new_keys = list(zip(*(new_df[column] for column in CATALOG_KEY)))
+    new_set, old_set = set(new_keys), set(old_keys)
+    kept = np.array([i for i, key in enumerate(old_keys) if key in new_set], dtype=np.int64)
+    added = np.array([i for i, key in enumerate(new_keys) if key not in old_set], dtype=np.int64)
+    return kept, added
+
+class CatalogWatcher:
+    """
+    Memegang engine aktif untuk satu file katalog. current() mengecek file paling sering setiap
+    `check_interval` detik. Rebuild penuh hanya jika perubahan cukup besar sehingga bobot IDF basi:
+    porsi baris yang berubah > rebuild_fraction, atau porsi token baris baru yang di luar
+    vocabulary > oov_threshold.
+
+    snapshot=True: cold start dari snapshot mmap (advisor.snapshot) jika masih cocok dengan file,
+    dan snapshot ditulis ulang setiap kali engine diganti.
+    """
+    def __init__(self, path=CATALOG_PATH, engine=None, check_interval=5.0, rebuild_fraction=0.2, oov_threshold=0.2,
+                 snapshot=False):
+        self.path = path
+        self.snapshot = snapshot
+        self.check_interval = check_interval
+        self.rebuild_fraction = rebuild_fraction
+        self.oov_threshold = oov_threshold
+        self.last_reload = None
+        self.last_error = None
+        self._lock = threading.Lock()
+        self._last_check = time.monotonic()
+        self._signature = self._stat()
+        self._digest = file_digest(path) if self._signature else None
+        if engine is None and self._signature and snapshot:
+            engine = load_engine(path)
+        elif engine is None:
+            engine = RecommendationEngine(load_catalog(path) if self._signature else empty_catalog())
+        self.engine = engine
+
+    def _stat(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def current(self):
+        """Engine aktif; sesekali mengecek file katalog terlebih dahulu."""
+        if time.monotonic() - self._last_check >= self.check_interval:
+            self.check()
+        return self.engine
+
+    def check(self):
+        """Mengecek file sekarang. True jika engine diganti."""
+        # Jika thread lain sedang reload, langsung kembali: engine lama tetap melayani
+        if not self._lock.acquire(blocking=False):
+            return False
+        try:
+            self._last_check = time.monotonic()
+            signature = self._stat()
+            if signature is None or signature == self._signature:
+                return False
+            self._signature = signature
+            digest = file_digest(self.path)
+            if digest == self._digest:
+                return False
+            try:
+                new_df = load_catalog(self.path)
+            except Exception as exc:
+                # Misalnya file sedang ditulis; coba lagi di pengecekan berikutnya
+                self.last_error = repr(exc)
+                self._signature = None
+                return False
+            self._digest = digest
+            self.engine = self._updated_engine(new_df)
+            self.last_error = None
+            if self.snapshot:
+                mtime_ns, size = signature
+                fingerprint = {'path': os.path.abspath(self.path), 'size': size, 'mtime_ns': mtime_ns, 'sha1': digest}
+                save_snapshot(self.engine, self.path, fingerprint)
+            return True
+        finally:
+            self._lock.release()
+
+    def _updated_engine(self, new_df):
+        engine = self.engine
+        started = time.perf_counter()
+        kept, added = diff_catalog(engine.df, new_df)
+        removed = len(engine.df) - len(kept)
+        added_df = new_df.iloc[added]
+
+        changed = removed + len(added)
+        mode = 'incremental'
+        if engine.index is None or changed > self.rebuild_fraction * max(len(new_df), 1):
+            mode = 'full'
+        elif len(added) and engine.index.oov_ratio(catalog_features(added_df)) > self.oov_threshold:
+            mode = 'full'
+
+        if mode == 'full':
+            new_engine = engine.rebuilt(new_df)
+        elif changed:
+            new_engine = engine.apply_changes(kept, added_df)
+        else:
+            # Isi sama (mis. hanya urutan baris berubah)
+            new_engine = engine
+        self.last_reload = {
+            'mode': mode,
+            'added': len(added),
+            'removed': removed,
+            'rows': len(new_engine.df),
+            'version': new_engine.version,
+            'seconds': time.perf_counter() - started,
+        }
+        return new_engine
@@ -0,0 +1,117 @@
+"""
+Analisis sentimen input pengguna.
+
+Backend default adalah leksikon polaritas Indonesia/Inggris bawaan (termasuk bahasa gaul seperti
+"gak suka", "mantap", "cuan") yang diskor dalam satu lintasan token. TextBlob tetap tersedia
+sebagai backend opsional dan baru di-import saat backend itu dipakai. Skor di-cache (LRU)
+berdasarkan input yang sudah dinormalisasi.
+"""
+import re
+from functools import lru_cache
+
+from .messages import Message
+
+POLARITY_LEXICON = {
+    # Indonesia
+    "suka": 0.5, "senang": 0.6, "seneng": 0.6, "gemar": 0.5, "hobi": 0.3, "tertarik": 0.5,
+    "minat": 0.3, "cinta": 0.7, "mantap": 0.8, "mantul": 0.8, "keren": 0.7, "seru": 0.6,
+    "asik": 0.6, "asyik": 0.6, "bagus": 0.6, "hebat": 0.7, "semangat": 0.7, "antusias": 0.7,
+    "cuan": 0.5, "passion": 0.6, "pengen": 0.3, "ingin": 0.3, "yakin": 0.4,
+    "benci": -0.8, "malas": -0.5, "males": -0.5, "bosan": -0.5, "bosen": -0.5, "bingung": -0.4,
+    "takut": -0.5, "susah": -0.4, "sulit": -0.4, "capek": -0.4, "cape": -0.4, "jelek": -0.6,
+    "buruk": -0.6, "ribet": -0.4, "pusing": -0.5, "anti": -0.5, "sedih": -0.5, "galau": -0.4,
+    "stres": -0.5, "stress": -0.5, "ragu": -0.3, "gagal": -0.5,
+    # Inggris
+    "like": 0.4, "love": 0.6, "enjoy": 0.5, "interested": 0.5, "excited": 0.7, "happy": 0.7,
+    "fun": 0.5, "good": 0.6, "great": 0.8, "awesome": 0.9, "amazing": 0.8, "best": 0.8, "cool": 0.5,
+    "hate": -0.8, "bad": -0.6, "boring": -0.6, "bored": -0.5, "confused": -0.4, "hard": -0.3,
+    "difficult": -0.4, "tired": -0.4, "worst": -0.9, "sad": -0.5, "lazy": -0.5,
+}
+
+NEGATORS = {"tidak", "gak", "ga", "nggak", "enggak", "ngga", "gk", "tak", "bukan", "kurang",
+            "not", "dont", "don't", "no", "never"}
+
+# Penguat di depan kata ("sangat suka") atau di belakang kata ("suka banget")
+PREFIX_INTENSIFIERS = {"sangat": 1.5, "super": 1.5, "paling": 1.4, "very": 1.5, "really": 1.3, "so": 1.3}
+SUFFIX_INTENSIFIERS = {"banget": 1.5, "bgt": 1.5, "sekali": 1.3, "amat": 1.3}
+
+_TOKEN_RE = re.compile(r"[a-z']+")
+
+def normalize_input(text):
+    """Lowercase + spasi dirapikan; dipakai sebagai key cache."""
+    return ' '.join(text.lower().split())
+
+def lexicon_scores(text):
+    """(polarity, subjectivity) dari leksikon bawaan dalam satu lintasan token."""
+    tokens = _TOKEN_RE.findall(text)
+    scores = []
+    negate = False
+    boost = 1.0
+    last_scored = -1
+    for i, token in enumerate(tokens):
+        if token in NEGATORS:
+            negate = True
+        elif token in PREFIX_INTENSIFIERS:
+            boost = PREFIX_INTENSIFIERS[token]
+        elif token in SUFFIX_INTENSIFIERS:
+            if last_scored == i - 1 and scores:
+                scores[-1] *= SUFFIX_INTENSIFIERS[token]
+        elif token in POLARITY_LEXICON:
+            score = POLARITY_LEXICON[token] * boost
+            # "gak suka" membalik arah, tapi lebih lemah dari lawan katanya
+            scores.append(-0.5 * score if negate else score)
+            negate = False
+            boost = 1.0
+            last_scored = i
+
+    if not scores:
+        return 0.0, 0.0
+    polarity = max(-1.0, min(1.0, sum(scores) / len(scores)))
+    subjectivity = min(1.0, 1.5 * len(scores) / len(tokens))
+    return polarity, subjectivity
+
+def textblob_scores(text):
+    """Backend opsional; TextBlob (dan leksikon pattern-nya) baru dimuat di panggilan pertama."""
+    from textblob import TextBlob
+
+    sentiment = TextBlob(text).sentiment
+    return sentiment.polarity, sentiment.subjectivity
+
+SENTIMENT_BACKENDS = {
+    'lexicon': lexicon_scores,
+    'textblob': textblob_scores,
+}
+
+def register_sentiment_backend(name, scorer):
+    """scorer(teks ternormalisasi) -> (polarity, subjectivity)."""
+    SENTIMENT_BACKENDS[name] = scorer
+    _cached_scores.cache_clear()
+
+@lru_cache(maxsize=4096)
+def _cached_scores(backend, normalized):
+    return SENTIMENT_BACKENDS[backend](normalized)
+
+def analyze_sentiment(user_input, backend='lexicon'):
+    """Mengembalikan dict polarity/subjectivity/sentiment plus 'messages' untuk UI."""
+    try:
+        polarity, subjectivity = _cached_scores(backend, normalize_input(user_input))
+    except Exception:
+        return {'polarity': 0, 'subjectivity': 0, 'sentiment': 'neutral', 'messages': []}
+
+    messages = []
+    if polarity > 0.5:
+        messages.append(Message('success', "😊 Wow, semangat banget! Energi positif kamu keren! Mari kita cari mata kuliah yang pas."))
+    elif polarity > 0.1:
+        messages.append(Message('info', "🙂 Terlihat antusias! Yuk kita cari rekomendasi terbaik untuk kamu."))
+    elif polarity < -0.1:
+        messages.append(Message('info', "🤔 Kayaknya masih bingung ya? Tenang, sistem ini akan bantu kamu menemukan arah yang tepat!"))
+
+    if subjectivity > 0.7:
+        messages.append(Message('caption', "💭 Tips: Semakin spesifik minat kamu, semakin akurat rekomendasinya!"))
+
+    return {
+        'polarity': polarity,
+        'subjectivity': subjectivity,
+        'sentiment': 'positive' if polarity > 0.1 else ('negative' if polarity < -0.1 else 'neutral'),
+        'messages': messages,
+    }
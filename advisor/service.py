@@ -0,0 +1,261 @@
+"""
+Layanan rekomendasi lokal multi-proses: beberapa worker HTTP di satu port (SO_REUSEPORT) yang
+semuanya memuat snapshot katalog yang sama lewat mmap (advisor.snapshot), jadi indeks TF-IDF
+hanya ada satu kali di page cache berapa pun jumlah worker. Di dalam setiap worker, request yang
+datang bersamaan digabung oleh SearchCoalescer (advisor.coalesce) menjadi satu search_batch.
+
+Proses induk memegang CatalogWatcher: jika CSV katalog berubah, snapshot baru ditulis dan setiap
+worker berpindah ke snapshot itu pada pengecekan berikutnya. Semuanya berjalan di satu mesin Linux.
+
+    python -m advisor.service --workers 4 --port 8765
+    ADVISOR_SERVICE_URL=http://127.0.0.1:8765 streamlit run main_app.py
+
+Endpoint: POST /search (JSON argumen engine.search), POST /courses dan /careers ({"ids": [...]}), GET /suggest?q=...&k=8,
+/info, /health, /stats, /metrics.
+"""
+import argparse
+import json
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from .catalog import CATALOG_PATH
+from .coalesce import SearchCoalescer
+from .metrics import METRICS
+from .snapshot import CURRENT_FILE, StaleSnapshotError, load_snapshot, snapshot_dir_for
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+SEARCH_FIELDS = {'user_input', 'program', 'semester', 'selected_keywords', 'top_n', 'page', 'page_size'}
+MAX_TOP_N = 100
+
+class SnapshotFollower:
+    """Engine dari snapshot aktif; pindah ke snapshot baru saat current.json diganti proses induk."""
+    def __init__(self, directory, check_interval=5.0):
+        self.directory = directory
+        self.check_interval = check_interval
+        self._current_file = os.path.join(directory, CURRENT_FILE)
+        self._stamp = os.stat(self._current_file).st_mtime_ns
+        self.engine = load_snapshot(directory)
+        self._last_check = time.monotonic()
+        self._lock = threading.Lock()
+
+    def current(self):
+        if time.monotonic() - self._last_check >= self.check_interval and self._lock.acquire(blocking=False):
+            try:
+                self._last_check = time.monotonic()
+                stamp = os.stat(self._current_file).st_mtime_ns
+                if stamp != self._stamp:
+                    self.engine = load_snapshot(self.directory)
+                    self._stamp = stamp
+            except (OSError, StaleSnapshotError):
+                # Snapshot sedang ditulis ulang; engine lama tetap melayani
+                pass
+            finally:
+                self._lock.release()
+        return self.engine
+
+def parse_search_request(body):
+    """dict argumen search() dari body JSON; ValueError untuk input yang tidak valid."""
+    request = json.loads(body or b'{}')
+    if not isinstance(request, dict) or not isinstance(request.get('user_input', ''), str):
+        raise ValueError("body harus objek JSON dengan user_input berupa string")
+    unknown = set(request) - SEARCH_FIELDS
+    if unknown:
+        raise ValueError(f"field tidak dikenal: {sorted(unknown)}")
+    request.setdefault('user_input', '')
+    if not isinstance(request.get('program'), (str, type(None))):
+        raise ValueError("program harus string atau null")
+    if request.get('semester') is not None:
+        request['semester'] = int(request['semester'])
+    if not isinstance(request.get('selected_keywords'), (list, type(None))):
+        raise ValueError("selected_keywords harus list atau null")
+    if request.get('selected_keywords') is not None:
+        request['selected_keywords'] = [str(k) for k in request['selected_keywords']]
+    request['top_n'] = max(1, min(int(request.get('top_n', 10)), MAX_TOP_N))
+    request['page'] = max(0, int(request.get('page', 0)))
+    if request.get('page_size') is not None:
+        request['page_size'] = max(1, min(int(request['page_size']), MAX_TOP_N))
+    return request
+
+def search_response(result, version):
+    return {
+        'version': version,
+        'messages': [list(message) for message in result.messages],
+        'results': [list(rec) for rec in result.results],
+        'words_to_remove': result.words_to_remove,
+        'total': result.total,
+        'page': result.page,
+    }
+
+class ReusePortHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def server_bind(self):
+        # Semua worker bind ke port yang sama; kernel membagi koneksi antar proses
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        super().server_bind()
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    follower = None
+    coalescer = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, payload, content_type='application/json'):
+        body = payload if isinstance(payload, bytes) else json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        engine = self.follower.current()
+        url = urlsplit(self.path)
+        if url.path == '/suggest':
+            self._suggest(engine, parse_qs(url.query))
+        elif self.path == '/health':
+            self._send(200, {'status': 'ok', 'pid': os.getpid(), 'version': engine.version})
+        elif self.path == '/info':
+            self._send(200, {
+                'version': engine.version,
+                'rows': len(engine),
+                'programs': engine.facets.programs,
+                'semesters': engine.facets.semesters,
+                'pid': os.getpid(),
+            })
+        elif self.path == '/stats':
+            self._send(200, {
+                'pid': os.getpid(),
+                'result_cache': engine.result_cache.stats(),
+                'coalescer': self.coalescer.stats(),
+                **METRICS.to_json(),
+            })
+        elif self.path == '/metrics':
+            gauges = {f"result_cache_{k}": v for k, v in engine.result_cache.stats().items()}
+            self._send(200, METRICS.to_prometheus(gauges).encode('utf-8'), 'text/plain; version=0.0.4')
+        else:
+            self._send(404, {'error': 'not found'})
+
+    def _suggest(self, engine, query):
+        """Saran autocomplete untuk ?q=<teks yang sedang diketik>&k=<jumlah>."""
+        try:
+            top_k = max(0, min(int(query.get('k', ['8'])[0]), MAX_TOP_N))
+        except ValueError as exc:
+            self._send(400, {'error': str(exc)})
+            return
+        suggestions = engine.suggest(query.get('q', [''])[0], top_k)
+        self._send(200, {'version': engine.version, 'suggestions': [list(suggestion) for suggestion in suggestions]})
+
+    def do_POST(self):
+        try:
+            self._post()
+        except Exception as exc:
+            # Galat tak terduga tetap dibalas JSON 500, bukan koneksi yang diputus tanpa respons
+            print(f"POST {self.path} gagal: {exc!r}", file=sys.stderr)
+            self._send(500, {'error': f"galat internal: {type(exc).__name__}"})
+
+    def _post(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        if self.path in ('/courses', '/careers'):
+            self._by_ids(self.path, body)
+            return
+        if self.path != '/search':
+            self._send(404, {'error': 'not found'})
+            return
+        try:
+            request = parse_search_request(body)
+        except (ValueError, TypeError) as exc:
+            self._send(400, {'error': str(exc)})
+            return
+        result = self.coalescer.search_sync(**request)
+        self._send(200, search_response(result, self.follower.current().version))
+
+    def _by_ids(self, path, body):
+        """Mata kuliah (tanpa skor) atau saran karir untuk daftar course_id, mis. bookmark."""
+        try:
+            payload = json.loads(body or b'{}')
+            ids = [int(course_id) for course_id in payload['ids']]
+            top_k = max(0, min(int(payload.get('top_k', 8)), MAX_TOP_N))
+        except (ValueError, TypeError, KeyError, AttributeError) as exc:
+            self._send(400, {'error': f"body harus objek JSON {{'ids': [...]}}: {exc}"})
+            return
+        engine = self.follower.current()
+        if path == '/careers':
+            self._send(200, {'version': engine.version, 'careers': engine.career_paths(ids, top_k)})
+        else:
+            self._send(200, {'version': engine.version, 'courses': [list(rec) for rec in engine.courses(ids)]})
+
+def run_worker(host, port, snapshot_dir, max_batch=64, max_wait=0.005, check_interval=5.0):
+    """Satu proses worker: memuat snapshot via mmap dan melayani HTTP sampai dihentikan."""
+    follower = SnapshotFollower(snapshot_dir, check_interval)
+    handler = type('BoundServiceHandler', (ServiceHandler,), {
+        'follower': follower,
+        'coalescer': SearchCoalescer(follower.current, max_batch, max_wait),
+    })
+    with ReusePortHTTPServer((host, port), handler) as server:
+        server.serve_forever()
+
+def serve(catalog=CATALOG_PATH, host=DEFAULT_HOST, port=DEFAULT_PORT, workers=None, max_batch=64, max_wait=0.005,
+          check_interval=5.0):
+    """Proses induk: menyiapkan snapshot, menjalankan worker, dan menulis snapshot baru saat CSV berubah."""
+    import multiprocessing
+
+    from .reload import CatalogWatcher
+
+    watcher = CatalogWatcher(catalog, snapshot=True, check_interval=check_interval)
+    if watcher.engine.index is None:
+        sys.exit(f"Katalog {catalog} kosong atau tidak ditemukan.")
+    snapshot_dir = snapshot_dir_for(catalog)
+    workers = workers or os.cpu_count() or 1
+
+    context = multiprocessing.get_context('spawn')
+    args = (host, port, snapshot_dir, max_batch, max_wait, check_interval)
+    processes = []
+
+    def spawn():
+        process = context.Process(target=run_worker, args=args, daemon=True)
+        process.start()
+        return process
+
+    def stop(*_):
+        for process in processes:
+            process.terminate()
+        sys.exit(0)
+
+    signal.signal(signal.SIGTERM, stop)
+    processes.extend(spawn() for _ in range(workers))
+    print(f"Layanan rekomendasi: http://{host}:{port} ({workers} worker, katalog {watcher.engine.version})", file=sys.stderr)
+    try:
+        while True:
+            time.sleep(check_interval)
+            if watcher.check():
+                print(f"Katalog berubah: {watcher.last_reload}", file=sys.stderr)
+            for i, process in enumerate(processes):
+                if not process.is_alive():
+                    processes[i] = spawn()
+    except KeyboardInterrupt:
+        stop()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Layanan rekomendasi lokal multi-proses dengan indeks mmap bersama.")
+    parser.add_argument('--catalog', default=CATALOG_PATH, help="File CSV katalog mata kuliah")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--workers', type=int, default=None, help="Jumlah proses worker (default: jumlah core)")
+    parser.add_argument('--max-batch', type=int, default=64, help="Maksimum query per perkalian matriks")
+    parser.add_argument('--max-wait-ms', type=float, default=5.0, help="Waktu tunggu maksimum untuk mengisi batch")
+    parser.add_argument('--check-interval', type=float, default=5.0, help="Interval cek perubahan katalog (detik)")
+    args = parser.parse_args(argv)
+    serve(args.catalog, args.host, args.port, args.workers, args.max_batch, args.max_wait_ms / 1000, args.check_interval)
+
+if __name__ == '__main__':
+    main()
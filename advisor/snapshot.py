@@ -0,0 +1,242 @@
+"""
+Snapshot katalog kolumnar di disk: kumpulan file .npy + manifest JSON yang bisa di-memory-map.
+
+Isi snapshot: kolom katalog (kode kategori Program/Course + Semester int16), vocabulary dan bobot
+IDF TF-IDF, array CSR matriks indeks, posting indeks negasi, dan (jika ada) indeks dense LSA + IVF. Array numerik dibuka dengan
+np.load(mmap_mode='r') tanpa disalin, sehingga beberapa proses Streamlit / worker batch di satu host
+berbagi page cache yang sama. Hanya teks (kategori, vocabulary, token) yang di-decode saat dimuat.
+
+Setiap snapshot ditulis ke subdirektori baru lalu `current.json` ditukar secara atomik; proses yang
+masih memakai snapshot lama tidak terganggu. Manifest mencatat format, versi katalog, dan sidik
+(ukuran, mtime, sha1) setiap file sumber: snapshot yang tidak cocok lagi dengan sumbernya ditolak
+(StaleSnapshotError) dan tidak pernah dilayani.
+"""
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+
+import numpy as np
+
+from .catalog import CATALOG_PATH, FacetIndex, NegationIndex, file_digest, load_catalog
+from .dense import DENSE_WEIGHT, DenseIndex
+from .engine import RecommendationEngine
+from .index import CourseIndex
+
+SNAPSHOT_FORMAT = 1
+SNAPSHOT_ROOT = os.environ.get('ADVISOR_SNAPSHOT_DIR', os.path.join(os.path.dirname(CATALOG_PATH), '.snapshots'))
+CURRENT_FILE = 'current.json'
+KEEP_SNAPSHOTS = 2
+
+class StaleSnapshotError(Exception):
+    """Snapshot tidak cocok dengan format kode ini atau dengan file sumber katalognya."""
+
+def snapshot_dir_for(path):
+    """Direktori snapshot default untuk satu file katalog (nama file + hash path, agar tidak bertabrakan)."""
+    path = os.path.abspath(path)
+    return os.path.join(SNAPSHOT_ROOT, f"{os.path.basename(path)}-{hashlib.sha1(path.encode('utf-8')).hexdigest()[:8]}")
+
+def source_fingerprint(path):
+    stat = os.stat(path)
+    return {'path': os.path.abspath(path), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha1': file_digest(path)}
+
+def _source_matches(recorded):
+    try:
+        stat = os.stat(recorded['path'])
+    except FileNotFoundError:
+        return False
+    if (stat.st_size, stat.st_mtime_ns) == (recorded['size'], recorded['mtime_ns']):
+        return True
+    # mtime berubah (mis. file disalin ulang) tapi isinya bisa saja sama
+    return stat.st_size == recorded['size'] and file_digest(recorded['path']) == recorded['sha1']
+
+# --- TEKS: satu buffer UTF-8 + offset karakter, supaya tidak butuh pickle ---
+
+def _save_strings(directory, name, strings):
+    text = ''.join(strings)
+    offsets = np.zeros(len(strings) + 1, dtype=np.int64)
+    np.cumsum([len(s) for s in strings], out=offsets[1:])
+    np.save(os.path.join(directory, f"{name}_text.npy"), np.frombuffer(text.encode('utf-8'), dtype=np.uint8))
+    np.save(os.path.join(directory, f"{name}_offsets.npy"), offsets)
+
+def _load_strings(directory, name):
+    text = np.load(os.path.join(directory, f"{name}_text.npy"), mmap_mode='r').tobytes().decode('utf-8')
+    offsets = np.load(os.path.join(directory, f"{name}_offsets.npy")).tolist()
+    return [text[start:end] for start, end in zip(offsets, offsets[1:])]
+
+def _load(directory, name):
+    return np.load(os.path.join(directory, f"{name}.npy"), mmap_mode='r')
+
+def _categorical_parts(column):
+    import pandas as pd
+
+    categorical = column.array if isinstance(column.dtype, pd.CategoricalDtype) else pd.Categorical(column)
+    return np.asarray(categorical.codes), [str(c) for c in categorical.categories]
+
+# --- TULIS ---
+
+def write_snapshot(engine, directory, sources):
+    """
+    Menulis snapshot engine ke directory; mengembalikan manifest yang baru aktif. sources berisi path
+    atau hasil source_fingerprint yang diambil *sebelum* katalog dibaca, agar perubahan file di
+    tengah jalan membuat snapshot langsung basi, bukan tercatat sebagai versi baru.
+    """
+    if engine.index is None:
+        raise ValueError("Katalog kosong tidak di-snapshot.")
+    os.makedirs(directory, exist_ok=True)
+    name = f"{engine.version}-{uuid.uuid4().hex[:8]}"
+    target = os.path.join(directory, name)
+    os.makedirs(target)
+
+    df = engine.df
+    program_codes, programs = _categorical_parts(df['Program'])
+    course_codes, courses = _categorical_parts(df['Course'])
+    np.save(os.path.join(target, 'program_codes.npy'), program_codes)
+    np.save(os.path.join(target, 'course_codes.npy'), course_codes)
+    np.save(os.path.join(target, 'semester.npy'), df['Semester'].to_numpy(dtype=np.int16))
+    _save_strings(target, 'programs', programs)
+    _save_strings(target, 'courses', courses)
+
+    # Vocabulary disimpan urut kolom matriks, jadi posisi term = nomor kolom
+    vectorizer = engine.index.vectorizer
+    terms = [None] * len(vectorizer.vocabulary_)
+    for term, column in vectorizer.vocabulary_.items():
+        terms[column] = term
+    _save_strings(target, 'terms', terms)
+    np.save(os.path.join(target, 'idf.npy'), vectorizer.idf_)
+    matrix = engine.index.matrix
+    for part in ('data', 'indices', 'indptr'):
+        np.save(os.path.join(target, f"matrix_{part}.npy"), getattr(matrix, part))
+
+    negation = engine.negation_index
+    _save_strings(target, 'negation_tokens', negation.tokens)
+    lengths = [len(rows) for rows in negation.postings]
+    indptr = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=indptr[1:])
+    np.save(os.path.join(target, 'negation_indptr.npy'), indptr)
+    np.save(os.path.join(target, 'negation_rows.npy'), np.concatenate(negation.postings) if lengths else np.empty(0, dtype=np.int64))
+
+    dense = engine.dense
+    if dense is not None:
+        for part in ('components', 'vectors', 'centroids', 'list_indptr', 'list_rows'):
+            if getattr(dense, part) is not None:
+                np.save(os.path.join(target, f"dense_{part}.npy"), getattr(dense, part))
+
+    manifest = {
+        'format': SNAPSHOT_FORMAT,
+        'catalog_version': engine.version,
+        'rows': len(df),
+        'matrix_shape': list(matrix.shape),
+        'dense': dense is not None,
+        'created_at': time.time(),
+        'data_dir': name,
+        'sources': [s if isinstance(s, dict) else source_fingerprint(s) for s in sources],
+    }
+    with open(os.path.join(target, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    current = os.path.join(directory, CURRENT_FILE)
+    with open(f"{current}.tmp", 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(f"{current}.tmp", current)
+    _prune(directory, keep=name)
+    return manifest
+
+def _prune(directory, keep):
+    """Menghapus snapshot lama; file yang masih di-mmap proses lain tetap terbaca sampai ditutup."""
+    entries = sorted(
+        (entry for entry in os.scandir(directory) if entry.is_dir() and entry.name != keep),
+        key=lambda entry: entry.stat().st_mtime,
+        reverse=True,
+    )
+    for entry in entries[KEEP_SNAPSHOTS - 1:]:
+        shutil.rmtree(entry.path, ignore_errors=True)
+
+# --- BACA ---
+
+def read_manifest(directory, sources=None):
+    """Manifest snapshot aktif; StaleSnapshotError jika format atau salah satu sumbernya tidak cocok."""
+    with open(os.path.join(directory, CURRENT_FILE), encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get('format') != SNAPSHOT_FORMAT:
+        raise StaleSnapshotError(f"format snapshot {manifest.get('format')} != {SNAPSHOT_FORMAT}")
+    recorded = manifest['sources']
+    if sources is not None and sorted(os.path.abspath(p) for p in sources) != sorted(s['path'] for s in recorded):
+        raise StaleSnapshotError("snapshot dibuat dari file sumber yang berbeda")
+    for source in recorded:
+        if not _source_matches(source):
+            raise StaleSnapshotError(f"sumber berubah sejak snapshot dibuat: {source['path']}")
+    return manifest
+
+def load_snapshot(directory, sources=None, **engine_kwargs):
+    """RecommendationEngine dari snapshot (array numerik di-memory-map, tanpa parsing CSV atau fit ulang)."""
+    import pandas as pd
+    from scipy.sparse import csr_matrix
+
+    manifest = read_manifest(directory, sources)
+    dense_weight = engine_kwargs.get('dense_weight')
+    if (DENSE_WEIGHT if dense_weight is None else dense_weight) and not manifest.get('dense'):
+        raise StaleSnapshotError("mode hybrid butuh indeks dense, snapshot ini tidak memilikinya")
+    target = os.path.join(directory, manifest['data_dir'])
+
+    df = pd.DataFrame({
+        'Program': pd.Series(pd.Categorical.from_codes(_load(target, 'program_codes'), _load_strings(target, 'programs')), copy=False),
+        'Semester': pd.Series(_load(target, 'semester'), copy=False),
+        'Course': pd.Series(pd.Categorical.from_codes(_load(target, 'course_codes'), _load_strings(target, 'courses')), copy=False),
+    }, copy=False)
+
+    terms = _load_strings(target, 'terms')
+    matrix = csr_matrix(
+        (_load(target, 'matrix_data'), _load(target, 'matrix_indices'), _load(target, 'matrix_indptr')),
+        shape=tuple(manifest['matrix_shape']),
+    )
+    index = CourseIndex.from_parts({term: column for column, term in enumerate(terms)}, np.asarray(_load(target, 'idf')), matrix)
+
+    indptr = np.load(os.path.join(target, 'negation_indptr.npy'))
+    rows = _load(target, 'negation_rows')
+    tokens = _load_strings(target, 'negation_tokens')
+    postings = {token: rows[indptr[i]:indptr[i + 1]] for i, token in enumerate(tokens)}
+    negation_index = NegationIndex.from_postings(postings, manifest['rows'])
+
+    dense = None
+    if manifest.get('dense'):
+        parts = {
+            part: _load(target, f"dense_{part}") if os.path.exists(os.path.join(target, f"dense_{part}.npy")) else None
+            for part in ('components', 'vectors', 'centroids', 'list_indptr', 'list_rows')
+        }
+        dense = DenseIndex(**parts)
+
+    return RecommendationEngine(
+        df,
+        facets=FacetIndex(df),
+        negation_index=negation_index,
+        index=index,
+        version=manifest['catalog_version'],
+        dense=dense,
+        **engine_kwargs,
+    )
+
+def load_engine(path=CATALOG_PATH, **engine_kwargs):
+    """
+    Engine untuk file katalog `path`: dari snapshot jika masih cocok dengan file itu, jika tidak
+    dibangun dari CSV lalu snapshot ditulis ulang untuk cold start berikutnya.
+    """
+    directory = snapshot_dir_for(path)
+    try:
+        return load_snapshot(directory, [path], **engine_kwargs)
+    except (FileNotFoundError, StaleSnapshotError):
+        pass
+    fingerprint = source_fingerprint(path)
+    engine = RecommendationEngine(load_catalog(path), **engine_kwargs)
+    save_snapshot(engine, path, fingerprint)
+    return engine
+
+def save_snapshot(engine, path, fingerprint=None):
+    """write_snapshot ke direktori default file katalog; gagal tulis (mis. read-only) tidak fatal."""
+    if engine.index is None:
+        return None
+    try:
+        return write_snapshot(engine, snapshot_dir_for(path), [fingerprint or path])
+    except OSError:
+        return None
@@ -0,0 +1,144 @@
+"""
+Saran autocomplete saat mengetik: key KEYWORD_MAPPING, nama mata kuliah, dan nama jurusan.
+
+SuggestionIndex dibangun sekali dari katalog (DataFrame saja, tanpa TF-IDF/engine). Setiap teks
+diindeks dari awal teks dan dari awal setiap katanya ("Prinsip Akuntansi" muncul untuk "prin" dan
+"akun"). Untuk setiap prefix sampai PREFIX_DEPTH karakter, top-k entri dengan bobot popularitas
+tertinggi sudah disiapkan, jadi satu lookup = satu akses dict, O(panjang prefix). Prefix yang lebih
+panjang dicari lewat array kunci terurut (bisect) lalu diambil top-k dari rentang yang cocok.
+
+Bobot popularitas = jumlah baris katalog: baris dengan nama mata kuliah itu, baris jurusan itu, atau
+untuk keyword, kemunculan kata-kata ekspansinya di nama mata kuliah.
+
+    python -m advisor.suggest akun "desain gr"
+"""
+import argparse
+import bisect
+import re
+import sys
+from collections import namedtuple
+
+import numpy as np
+
+from .text import KEYWORD_MAPPING
+
+PREFIX_DEPTH = 10
+TOP_K = 8
+# Urutan jenis saat bobot sama: keyword dulu (langsung memperluas query), lalu jurusan, lalu mata kuliah
+SUGGESTION_KINDS = ('keyword', 'program', 'course')
+
+Suggestion = namedtuple('Suggestion', ['text', 'kind', 'weight'])
+
+_WORD_START = re.compile(r'\b\w')
+
+def normalize(text):
+    """Huruf kecil + spasi dirapikan; dipakai untuk kunci indeks dan prefix yang diketik."""
+    return ' '.join(text.lower().split())
+
+class SuggestionIndex:
+    """
+    texts/kinds/weights: satu entri per teks unik. Entri diurutkan sekali menurut (bobot turun, jenis,
+    teks); `_nodes` memetakan prefix (<= depth karakter) ke nomor entri top-k dalam urutan itu,
+    `_keys`/`_key_ranks` adalah semua kunci terurut beserta peringkat entrinya untuk prefix panjang.
+    """
+    def __init__(self, texts, kinds, weights, top_k=TOP_K, depth=PREFIX_DEPTH):
+        import pandas as pd
+
+        self.top_k = top_k
+        self.depth = depth
+        entries = pd.DataFrame({
+            'text': pd.Series(texts, dtype='str'),
+            'kind': pd.Categorical(kinds, categories=SUGGESTION_KINDS),
+            'weight': np.asarray(weights, dtype=np.int64),
+        })
+        # Sama dengan normalize(), tapi tervektorisasi
+        entries['key'] = entries['text'].str.lower().str.replace(r'\s+', ' ', regex=True).str.strip()
+        entries = entries.sort_values(['weight', 'kind', 'key'], ascending=[False, True, True], kind='stable')
+        self.entries = [Suggestion(*fields) for fields in zip(entries['text'].tolist(), entries['kind'].tolist(),
+                                                               entries['weight'].tolist())]
+        # Satu baris per kunci (teks mulai dari awal teks dan dari awal tiap kata), urut peringkat entri
+        key_texts, key_ranks = [], []
+        for rank, text in enumerate(entries['key'].tolist()):
+            for match in _WORD_START.finditer(text):
+                key_texts.append(text[match.start():])
+                key_ranks.append(rank)
+        key_ranks = np.array(key_ranks, dtype=np.int64)
+        keys = pd.DataFrame({'key': pd.Series(key_texts, dtype='str'), 'rank': key_ranks})
+        lengths = keys['key'].str.len().to_numpy()
+        # Per kedalaman prefix: pasangan (prefix, entri) unik terurut per prefix lalu peringkat,
+        # diambil top_k pertama per prefix
+        self._nodes = {}
+        for end in range(1, depth + 1):
+            deep = lengths >= end
+            codes, prefixes = pd.factorize(keys['key'][deep].str.slice(0, end))
+            pairs = np.sort(codes * len(entries) + key_ranks[deep])
+            pairs = pairs[np.concatenate([[True], pairs[1:] != pairs[:-1]])]
+            pair_codes = pairs // len(entries)
+            group_starts = np.searchsorted(pair_codes, np.arange(len(prefixes)))
+            top = pairs[np.arange(len(pairs)) - group_starts[pair_codes] < top_k]
+            bounds = np.flatnonzero(np.diff(top // len(entries))) + 1
+            groups = np.split(top % len(entries), bounds) if len(top) else []
+            self._nodes.update(zip(prefixes.tolist(), (tuple(group.tolist()) for group in groups)))
+        keys = keys.sort_values('key', kind='stable')
+        self._keys = keys['key'].tolist()
+        self._key_ranks = keys['rank'].to_numpy()
+
+    def __len__(self):
+        return len(self.entries)
+
+    @classmethod
+    def from_catalog(cls, df, top_k=TOP_K, depth=PREFIX_DEPTH):
+        import pandas as pd
+
+        courses = df['Course'].astype('str').value_counts(sort=False)
+        programs = df['Program'].astype('str').value_counts(sort=False)
+        # Jumlah baris per kata nama mata kuliah, untuk bobot keyword
+        words = pd.DataFrame({'word': pd.Series(courses.index, dtype='str').str.lower().str.replace(r'\W+', ' ', regex=True).str.split(),
+                              'rows': courses.to_numpy()}).explode('word')
+        word_rows = words.groupby('word')['rows'].sum().to_dict()
+        texts, kinds, weights = [], [], []
+        for keyword, expansion in KEYWORD_MAPPING.items():
+            texts.append(keyword)
+            kinds.append('keyword')
+            weights.append(sum(word_rows.get(word, 0) for word in set(keyword.split()) | set(expansion.lower().split())))
+        for kind, counts in (('program', programs), ('course', courses)):
+            texts.extend(counts.index.tolist())
+            kinds.extend([kind] * len(counts))
+            weights.extend(counts.tolist())
+        return cls(texts, kinds, weights, top_k, depth)
+
+    def suggest(self, prefix, top_k=None):
+        """Suggestion (text, kind, weight) terpopuler yang diawali prefix, di awal teks atau awal kata."""
+        key = normalize(prefix)
+        if not key:
+            return []
+        top_k = self.top_k if top_k is None else top_k
+        if len(key) <= self.depth and top_k <= self.top_k:
+            ranks = self._nodes.get(key, ())[:top_k]
+        else:
+            lo = bisect.bisect_left(self._keys, key)
+            hi = bisect.bisect_left(self._keys, key + '\uffff', lo)
+            ranks = np.unique(self._key_ranks[lo:hi])[:top_k].tolist()
+        return [self.entries[rank] for rank in ranks]
+
+def main(argv=None):
+    import time
+
+    from .catalog import CATALOG_PATH, load_catalog
+
+    parser = argparse.ArgumentParser(description="Saran autocomplete dari katalog (tanpa memuat engine).")
+    parser.add_argument('prefixes', nargs='+', help="Teks yang sedang diketik")
+    parser.add_argument('--catalog', default=CATALOG_PATH, help="Path katalog CSV")
+    parser.add_argument('-k', '--top-k', type=int, default=TOP_K, help="Jumlah saran per prefix")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    index = SuggestionIndex.from_catalog(load_catalog(args.catalog))
+    print(f"Indeks saran: {len(index)} entri ({time.perf_counter() - start:.2f} detik)", file=sys.stderr)
+    for prefix in args.prefixes:
+        print(f"{prefix}:")
+        for suggestion in index.suggest(prefix, args.top_k):
+            print(f"  {suggestion.text}  [{suggestion.kind}, {suggestion.weight}]")
+
+if __name__ == '__main__':
+    main()
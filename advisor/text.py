@@ -0,0 +1,249 @@
+"""
+Pemrosesan teks query: tabel intent/keyword, automaton pencocokan, negasi, dan ekspansi query.
+Hanya memakai library standar sehingga bisa di-import tanpa Streamlit/scikit-learn.
+"""
+import re
+from collections import deque
+
+from .messages import Message
+
+KEYWORD_MAPPING = {
+    "menggambar": "desain visual art seni fotografi kreatif sketsa ilustrasi grafis",
+    "gambar": "desain visual art seni fotografi kreatif sketsa ilustrasi grafis",
+    "seni": "desain visual art seni fotografi kreatif sketsa ilustrasi grafis",
+    "jualan": "marketing bisnis manajemen pemasaran retail sales perdagangan kewirausahaan entrepreneur",
+    "dagang": "marketing bisnis manajemen pemasaran retail sales perdagangan kewirausahaan entrepreneur",
+    "bisnis": "marketing bisnis manajemen pemasaran retail sales perdagangan kewirausahaan entrepreneur",
+    "ngoding": "teknologi informasi sistem komputer data algoritma programming python web software aplikasi digital",
+    "coding": "teknologi informasi sistem komputer data algoritma programming python web software aplikasi digital",
+    "komputer": "teknologi informasi sistem komputer data algoritma programming python web software aplikasi digital",
+    "hitung": "akuntansi statistika matematika ekonomi keuangan pajak finance analisis",
+    "angka": "akuntansi statistika matematika ekonomi keuangan pajak finance analisis",
+    "jalan-jalan": "pariwisata hospitality hotel tour travel guide tourism wisata perhotelan",
+    "traveling": "pariwisata hospitality hotel tour travel guide tourism wisata perhotelan",
+    "pariwisata": "pariwisata hospitality hotel tour travel guide tourism wisata perhotelan",
+    "masak": "food beverage tata boga kitchen pastry kuliner makanan minuman chef",
+    "memasak": "food beverage tata boga kitchen pastry kuliner makanan minuman chef",
+    "kuliner": "food beverage tata boga kitchen pastry kuliner makanan minuman chef",
+    "desain": "desain visual kreatif grafis komunikasi media digital",
+    "komunikasi": "komunikasi media jurnalistik broadcast public relations PR",
+    "film": "film broadcasting multimedia produksi sinema animasi video",
+    "musik": "musik audio sound production recording entertainment",
+    "olahraga": "sport fitness kesehatan health wellness management",
+    "data": "data science analytics statistika machine learning artificial intelligence AI",
+    "game": "game development interactive design programming unity multimedia",
+}
+
+# --- TABEL INTENT & KEYWORD (DEKLARATIF) ---
+# Semua trigger di bawah (chatbot, KEYWORD_MAPPING, tips matkul) dikompilasi sekali menjadi
+# satu automaton Aho-Corasick, jadi satu lintasan teks menemukan semua trigger sekaligus.
+# Tabel berupa data biasa (list/dict) sehingga bisa juga dimuat dari file JSON.
+CHATBOT_INTENTS = [
+    {"intent": "relax", "triggers": ["tidur", "rebahan", "malas"], "level": "info",
+     "message": "😴 Wah, butuh istirahat ya? Sayangnya belum ada jurusan 'Tidur', tapi coba cek matkul santai ini..."},
+    {"intent": "money", "triggers": ["duit", "uang", "kaya", "cuan"], "level": "success",
+     "message": "💰 Orientasi masa depan mantap! Cek mata kuliah bisnis ini biar makin cuan."},
+    {"intent": "game", "triggers": ["game", "gaming"], "level": "success",
+     "message": "🎮 Daripada cuma main, mending bikin gamenya di jurusan ini!"},
+    {"intent": "art", "triggers": ["menggambar", "gambar", "seni", "melukis", "desain"], "level": "success", "unless": ["game"],
+     "message": "🎨 Kreativitas tanpa batas! Jurusan desain ini cocok buat kamu yang suka berkarya."},
+    {"intent": "music", "triggers": ["musik", "nyanyi", "band"], "level": "info",
+     "message": "🎵 Passion di musik? Cek mata kuliah ini untuk mengasah skill kamu!"},
+    {"intent": "sports", "triggers": ["olahraga", "sport", "fitness", "atlet"], "level": "success",
+     "message": "⚽ Sehat itu penting! Lihat mata kuliah yang cocok untuk kamu yang aktif."},
+    {"intent": "communication", "triggers": ["komunikasi", "presenter", "mc", "public speaking"], "level": "success", "unless": ["game"],
+     "message": "🎤 Jago ngomong? Perfect! Ini mata kuliah untuk kamu yang suka berkomunikasi."},
+    {"intent": "culinary", "triggers": ["masak", "memasak", "kuliner", "chef"], "level": "success",
+     "message": "👨‍🍳 MasterChef vibes! Cek mata kuliah kuliner dan hospitality ini."},
+    {"intent": "travel", "triggers": ["jalan", "traveling", "wisata", "tour"], "level": "success",
+     "message": "✈️ Hobi jalan-jalan? Ini mata kuliah pariwisata yang cocok buat kamu!"},
+    {"intent": "accounting", "triggers": ["akuntansi", "akuntan"], "level": "info", "unless": ["money"],
+     "message": "📊 Teliti sama angka? Akuntansi bisa jadi pilihan karir cemerlang!"},
+    {"intent": "language", "triggers": ["bahasa", "english", "mandarin", "translator"], "level": "success",
+     "message": "🗣️ Multilingual skill itu valuable! Lihat program bahasa yang tersedia."},
+    {"intent": "data", "triggers": ["data", "analytics", "ai", "machine learning"], "level": "success",
+     "message": "📈 Data is the new oil! Cek jurusan Data Science dan AI ini."},
+    {"intent": "film", "triggers": ["film", "video", "sinematografi", "youtuber"], "level": "success",
+     "message": "🎬 Content creator masa depan! Ini mata kuliah media dan film untuk kamu."},
+]
+
+# Urutan = prioritas: kategori pertama yang cocok dengan nama matkul yang dipakai
+COURSE_ADVICE_RULES = [
+    {"category": "numerik", "triggers": ['matematika', 'kalkulus', 'statistika', 'akuntansi', 'keuangan', 'fisika'],
+     "desc": "Mata kuliah ini banyak melibatkan logika, rumus, perhitungan, dan ketelitian angka.",
+     "tip": "💡 **Tips Sukses:** Jangan hanya menghapal rumus, tapi pahami konsep dasarnya. Perbanyak latihan soal mandiri agar terbiasa dengan berbagai variasi kasus perhitungan."},
+    {"category": "teknis", "triggers": ['program', 'coding', 'algoritma', 'data', 'sistem', 'web', 'mobile', 'software'],
+     "desc": "Fokus pada pengembangan logika teknis, struktur data, dan penulisan kode (coding) untuk membangun aplikasi.",
+     "tip": "💻 **Tips Sukses:** Praktek langsung (ngoding) jauh lebih efektif daripada cuma baca teori. Jangan takut error, itu bagian dari proses belajar! Manfaatkan sumber belajar online seperti StackOverflow."},
+    {"category": "kreatif", "triggers": ['desain', 'gambar', 'visual', 'art', 'sketsa', 'nirmana', 'tipografi'],
+     "desc": "Mengasah kreativitas, estetika, rasa seni, dan kemampuan visualisasi ide ke dalam bentuk karya.",
+     "tip": "🎨 **Tips Sukses:** Sering-sering cari referensi (Pinterest/Behance) untuk memperkaya wawasan visual. Mulai bangun portofolio dari tugas-tugas kuliah ini. Jangan ragu eksperimen gaya baru!"},
+    {"category": "bisnis", "triggers": ['bisnis', 'manajemen', 'marketing', 'pemasaran', 'ekonomi', 'entrepreneur'],
+     "desc": "Mempelajari strategi bisnis, pengelolaan organisasi, dinamika pasar, dan perilaku konsumen.",
+     "tip": "📊 **Tips Sukses:** Perbanyak baca studi kasus nyata (case study) perusahaan. Latih kemampuan presentasi dan networking karena soft skill ini sangat krusial di dunia bisnis."},
+    {"category": "bahasa", "triggers": ['bahasa', 'english', 'mandarin', 'komunikasi', 'writing', 'speaking'],
+     "desc": "Meningkatkan kemampuan verbal dan non-verbal untuk komunikasi efektif dalam konteks profesional.",
+     "tip": "🗣️ **Tips Sukses:** Kuncinya adalah 'Active Speaking'. Jangan malu salah grammar saat bicara, yang penting berani ngomong dulu! Praktikkan dengan teman atau native speaker jika ada kesempatan."},
+    {"category": "hospitality", "triggers": ['hotel', 'wisata', 'tour', 'kitchen', 'pastry', 'food'],
+     "desc": "Mata kuliah praktikal yang berhubungan langsung dengan industri pelayanan, kuliner, dan pariwisata.",
+     "tip": "👨‍🍳 **Tips Sukses:** Perhatikan detail kebersihan (hygiene) dan standar pelayanan (service excellence). Disiplin dan attitude adalah nilai jual utama di industri hospitality."},
+]
+
+# Default tips jika tidak ada kata kunci yang cocok
+DEFAULT_COURSE_ADVICE = {
+    "desc": "Mata kuliah ini dirancang untuk memperkuat kompetensi dasar atau keahlian spesifik di jurusan kamu.",
+    "tip": "📝 **Tips Sukses:** Catat poin-poin penting dosen yang tidak ada di slide. Aktif bertanya dan berdiskusi di kelas bisa jadi nilai tambah untuk pemahamanmu."
+}
+
+class KeywordAutomaton:
+    """
+    Automaton Aho-Corasick sederhana: menemukan semua trigger (termasuk yang tumpang tindih,
+    misal 'gambar' di dalam 'menggambar') dalam satu lintasan teks.
+    """
+    def __init__(self, entries):
+        # entries: iterable (trigger, payload)
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+        for trigger, payload in entries:
+            node = 0
+            for ch in trigger:
+                child = self.goto[node].get(ch)
+                if child is None:
+                    child = len(self.goto)
+                    self.goto[node][ch] = child
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                node = child
+            self.output[node].append(payload)
+        
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self.goto[node].items():
+                queue.append(child)
+                state = self.fail[node]
+                while state and ch not in self.goto[state]:
+                    state = self.fail[state]
+                self.fail[child] = self.goto[state].get(ch, 0)
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+
+    def find(self, text):
+        """Semua payload yang trigger-nya muncul di text (bisa berulang)."""
+        node = 0
+        found = []
+        for ch in text:
+            while node and ch not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(ch, 0)
+            if self.output[node]:
+                found.extend(self.output[node])
+        return found
+
+def _intent_entries():
+    for intent in CHATBOT_INTENTS:
+        for trigger in intent['triggers']:
+            yield trigger, ('chat', intent['intent'])
+    for keyword in KEYWORD_MAPPING:
+        yield keyword, ('expansion', keyword)
+    for rule in COURSE_ADVICE_RULES:
+        for trigger in rule['triggers']:
+            yield trigger, ('advice', rule['category'])
+
+INTENT_MATCHER = KeywordAutomaton(_intent_entries())
+
+def match_intents(text):
+    """Satu lintasan atas teks (lowercase) -> {'chat': set, 'expansion': set, 'advice': set}."""
+    hits = {'chat': set(), 'expansion': set(), 'advice': set()}
+    for group, name in INTENT_MATCHER.find(text.lower()):
+        hits[group].add(name)
+    return hits
+
+# Kata kunci mapping yang ikut terpicu oleh teks ekspansi keyword sebelumnya
+# (expand_query mencocokkan keyword berikutnya terhadap query yang sudah diperpanjang).
+_KEYWORD_ORDER = {keyword: i for i, keyword in enumerate(KEYWORD_MAPPING)}
+EXPANSION_FOLLOWS = {
+    keyword: {name for group, name in INTENT_MATCHER.find(expansion)
+              if group == 'expansion' and _KEYWORD_ORDER[name] > _KEYWORD_ORDER[keyword]}
+    for keyword, expansion in KEYWORD_MAPPING.items()
+}
+
+def chatbot_messages(user_input, hits=None):
+    """Respons chatbot (list Message) untuk intent yang terdeteksi pada input."""
+    if hits is None:
+        hits = match_intents(user_input)
+    messages = []
+    responses_shown = []
+    
+    for intent in CHATBOT_INTENTS:
+        if intent['intent'] not in hits['chat']:
+            continue
+        if any(blocker in responses_shown for blocker in intent.get('unless', [])):
+            continue
+        messages.append(Message(intent['level'], intent['message']))
+        responses_shown.append(intent['intent'])
+    
+    return messages
+
+def parse_negation(user_input):
+    """Memisahkan kata yang dinegasikan ('tidak suka X', 'benci X', 'anti X'): (teks bersih, kata negasi)."""
+    negation_patterns = [
+        r'\b(tidak\s+suka|gak\s+suka|ga\s+suka)\s+(\w+)',
+        r'\b(benci)\s+(\w+)',
+        r'\b(anti)\s+(\w+)',
+    ]
+    
+    words_to_remove = []
+    cleaned_text = user_input.lower()
+    
+    for pattern in negation_patterns:
+        matches = re.finditer(pattern, cleaned_text)
+        for match in matches:
+            if len(match.groups()) >= 2:
+                negated_word = match.group(len(match.groups()))
+                words_to_remove.append(negated_word)
+                cleaned_text = cleaned_text.replace(match.group(0), '')
+    
+    return cleaned_text, words_to_remove
+
+def negation_message(words_to_remove):
+    return Message('warning', f"⚠️ Sistem mendeteksi kata yang tidak disukai: {', '.join(words_to_remove)}. Mata kuliah terkait akan dihindari.")
+
+def correction_message(corrections):
+    return Message('info', f"🔎 Maksud kamu: {', '.join(f'{typo} → {fixed}' for typo, fixed in corrections)}")
+
+def expansion_keywords(user_query, hits=None):
+    """Key KEYWORD_MAPPING yang terpicu query (urutan mapping), termasuk yang terpicu teks ekspansi sebelumnya."""
+    if hits is None:
+        hits = match_intents(user_query.lower())
+    matched = set(hits['expansion'])
+    keywords = []
+    for keyword in KEYWORD_MAPPING:
+        if keyword in matched:
+            keywords.append(keyword)
+            matched |= EXPANSION_FOLLOWS[keyword]
+    return keywords
+
+def expand_query(user_query, selected_keywords=None, hits=None):
+    """Query sebagai teks yang diperpanjang; engine memakai QueryEncoder (advisor.index) yang setara tanpa merangkai string."""
+    expanded_query = user_query.lower()
+    
+    # 1. Expand dari KEYWORD_MAPPING (termasuk keyword yang muncul di ekspansi sebelumnya)
+    for keyword in expansion_keywords(expanded_query, hits):
+        expanded_query += ' ' + KEYWORD_MAPPING[keyword]
+    
+    # 2. Tambahkan keyword yang dipilih pengguna
+    if selected_keywords:
+        for keyword in selected_keywords:
+            if keyword in KEYWORD_MAPPING:
+                expanded_query += ' ' + KEYWORD_MAPPING[keyword]
+            else:
+                # Untuk keyword yang tidak ada di mapping (mungkin hanya kata kunci utama)
+                expanded_query += ' ' + keyword
+    
+    return expanded_query
+
+def get_main_keywords():
+    return sorted(list(KEYWORD_MAPPING.keys()))
+
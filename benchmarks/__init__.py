@@ -0,0 +1,5 @@
+"""
+Benchmark pipeline rekomendasi dengan katalog sintetis berukuran besar.
+
+    python -m benchmarks.run --sizes 10000,100000 --queries 500 --output bench_results.json
+"""
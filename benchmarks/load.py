@@ -0,0 +1,146 @@
+"""
+Load test advisor.service: menjalankan layanan dengan beberapa jumlah worker lalu menembakkan
+request /search dari banyak klien paralel (proses x thread, koneksi keep-alive). Throughput dan
+latensi p50/p95/p99 per jumlah worker ditulis ke JSON, sehingga skala terhadap jumlah core terlihat.
+
+    python -m benchmarks.load --workers 1,2,4 --clients 4 --threads 16 --duration 10 --output load_results.json
+
+Katalog default adalah katalog sintetis (--rows) agar skor cukup berat; --catalog memakai file CSV lain.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from advisor.client import ServiceConnection
+from advisor.service import DEFAULT_HOST
+
+from .run import git_revision, latency_stats
+from .synthetic import synthetic_catalog, synthetic_queries
+
+def wait_ready(url, timeout=120.0):
+    connection = ServiceConnection(url, timeout=2.0)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            return connection.request('GET', '/info')
+        except OSError:
+            time.sleep(0.2)
+    raise TimeoutError(f"layanan di {url} tidak siap dalam {timeout} detik")
+
+def client_process(url, queries, threads, duration, seed, out_queue):
+    """Satu proses klien: `threads` thread, masing-masing mengirim request berurutan sampai waktu habis."""
+    samples, errors = [], [0]
+    lock = threading.Lock()
+    stop_at = time.monotonic() + duration
+
+    def loop(thread_seed):
+        rng = random.Random(thread_seed)
+        connection = ServiceConnection(url)
+        local = []
+        while time.monotonic() < stop_at:
+            text, keywords = rng.choice(queries)
+            t0 = time.perf_counter()
+            try:
+                connection.request('POST', '/search', {'user_input': text, 'selected_keywords': keywords or None})
+            except Exception:
+                with lock:
+                    errors[0] += 1
+                continue
+            local.append(time.perf_counter() - t0)
+        with lock:
+            samples.extend(local)
+
+    workers = [threading.Thread(target=loop, args=(seed * 1000 + i,)) for i in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    out_queue.put((samples, errors[0]))
+
+def run_load(url, queries, clients, threads, duration, seed):
+    context = multiprocessing.get_context('spawn')
+    out_queue = context.Queue()
+    processes = [
+        context.Process(target=client_process, args=(url, queries, threads, duration, seed + i, out_queue))
+        for i in range(clients)
+    ]
+    started = time.perf_counter()
+    for process in processes:
+        process.start()
+    results = [out_queue.get() for _ in processes]
+    wall = time.perf_counter() - started
+    for process in processes:
+        process.join()
+    samples = [s for part, _ in results for s in part]
+    stats = latency_stats(samples, wall) if samples else {'count': 0, 'throughput_per_s': 0.0}
+    stats['errors'] = sum(errors for _, errors in results)
+    return stats
+
+def bench_workers(catalog, workers, port, args, queries, snapshot_root):
+    url = f"http://{DEFAULT_HOST}:{port}"
+    command = [
+        sys.executable, '-m', 'advisor.service', '--catalog', catalog, '--port', str(port),
+        '--workers', str(workers), '--max-batch', str(args.max_batch), '--max-wait-ms', str(args.max_wait_ms),
+    ]
+    # Snapshot katalog uji ditulis ke direktori sementara, bukan ke .snapshots/ milik aplikasi
+    env = dict(os.environ, ADVISOR_SNAPSHOT_DIR=snapshot_root)
+    service = subprocess.Popen(command, stderr=subprocess.DEVNULL, env=env)
+    try:
+        info = wait_ready(url)
+        # Pemanasan: setiap worker memuat snapshot dan import lazy sebelum diukur
+        run_load(url, queries, args.clients, args.threads, 1.0, args.seed)
+        stats = run_load(url, queries, args.clients, args.threads, args.duration, args.seed)
+        # Histogram batch/antrian dari salah satu worker, untuk menyetel --max-batch / --max-wait-ms
+        stats['coalescer'] = ServiceConnection(url).request('GET', '/stats')['coalescer']
+    finally:
+        service.terminate()
+        service.wait()
+    stats.update({'workers': workers, 'rows': info['rows']})
+    return stats
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test layanan rekomendasi dengan beberapa jumlah worker.")
+    parser.add_argument('--workers', default='1,2,4', help="Jumlah worker dipisah koma")
+    parser.add_argument('--catalog', default=None, help="CSV katalog (default: katalog sintetis --rows baris)")
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--clients', type=int, default=4, help="Jumlah proses klien")
+    parser.add_argument('--threads', type=int, default=16, help="Thread per proses klien")
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--max-batch', type=int, default=64)
+    parser.add_argument('--max-wait-ms', type=float, default=5.0)
+    parser.add_argument('--port', type=int, default=8799)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='load_results.json')
+    args = parser.parse_args(argv)
+
+    queries = synthetic_queries(500, args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        catalog = args.catalog
+        if catalog is None:
+            catalog = os.path.join(tmp, 'katalog_sintetis.csv')
+            synthetic_catalog(args.rows, args.seed)[['Program', 'Semester', 'Course']].to_csv(catalog, index=False)
+        results = {
+            'revision': git_revision(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'cpu_count': os.cpu_count(),
+            'runs': [],
+        }
+        for workers in (int(w) for w in args.workers.split(',')):
+            stats = bench_workers(catalog, workers, args.port, args, queries, os.path.join(tmp, 'snapshots'))
+            results['runs'].append(stats)
+            print(f"  {workers} worker: {stats['throughput_per_s']:.1f} req/detik "
+                  f"p50={stats.get('p50_ms', 0):.1f}ms p99={stats.get('p99_ms', 0):.1f}ms error={stats['errors']}", file=sys.stderr)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"Hasil ditulis ke {args.output}", file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
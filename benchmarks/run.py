@@ -0,0 +1,152 @@
+"""
+Benchmark per tahap pipeline rekomendasi untuk beberapa ukuran katalog sintetis.
+
+Untuk setiap ukuran katalog diukur: build engine, parse_negation, encode_query (vektor query),
+recommend (setara get_recommendations), recommend_batch, top_careers, career_paths (course_id bookmark),
+build + lookup SuggestionIndex (autocomplete).
+Latensi p50/p95/p99 dan throughput diukur tanpa tracemalloc; puncak memori diukur
+pada lintasan terpisah dengan tracemalloc. Hasil ditulis ke file JSON agar regresi antar
+versi terlihat.
+
+    python -m benchmarks.run --sizes 10000,100000,1000000 --queries 300 --output bench_results.json
+"""
+import argparse
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from advisor.engine import RecommendationEngine
+from advisor.suggest import SuggestionIndex
+from advisor.text import parse_negation
+
+from .synthetic import synthetic_catalog, synthetic_queries
+
+def latency_stats(samples, wall_seconds):
+    samples = np.asarray(samples) * 1000
+    return {
+        'count': int(len(samples)),
+        'p50_ms': float(np.percentile(samples, 50)),
+        'p95_ms': float(np.percentile(samples, 95)),
+        'p99_ms': float(np.percentile(samples, 99)),
+        'mean_ms': float(samples.mean()),
+        'throughput_per_s': len(samples) / wall_seconds if wall_seconds else 0.0,
+    }
+
+def peak_memory_kb(fn, calls):
+    """Puncak alokasi (KB) selama memanggil fn untuk setiap argumen di calls."""
+    tracemalloc.start()
+    try:
+        for args in calls:
+            fn(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024
+
+def time_stage(fn, calls, memory_calls=20):
+    samples = []
+    started = time.perf_counter()
+    for args in calls:
+        t0 = time.perf_counter()
+        fn(*args)
+        samples.append(time.perf_counter() - t0)
+    stats = latency_stats(samples, time.perf_counter() - started)
+    stats['peak_memory_kb'] = peak_memory_kb(fn, calls[:memory_calls])
+    return stats
+
+def bench_size(n_rows, n_queries, batch_size, seed):
+    rng = random.Random(seed)
+    df = synthetic_catalog(n_rows, seed)
+    queries = synthetic_queries(n_queries, seed)
+    report = {'rows': n_rows, 'queries': n_queries, 'stages': {}}
+
+    # Pemanasan: import lazy (scikit-learn, scipy) tidak ikut terhitung sebagai biaya build
+    RecommendationEngine(df.head(10))
+    t0 = time.perf_counter()
+    engine = RecommendationEngine(df)
+    build_seconds = time.perf_counter() - t0
+    build_peak = peak_memory_kb(RecommendationEngine, [(df,)])
+    report['stages']['build_engine'] = {'seconds': build_seconds, 'peak_memory_kb': build_peak}
+
+    stages = report['stages']
+    stages['parse_negation'] = time_stage(parse_negation, [(text,) for text, _ in queries])
+    parsed = [parse_negation(text) for text, _ in queries]
+    stages['encode_query'] = time_stage(
+        engine.query_encoder.encode, [([(cleaned, selected)],) for (cleaned, _), (_, selected) in zip(parsed, queries)]
+    )
+
+    programs, semesters = engine.facets.programs, engine.facets.semesters
+    recommend_calls = []
+    for (cleaned, words), (_, selected) in zip(parsed, queries):
+        program = rng.choice(programs) if rng.random() < 0.3 else None
+        semester = rng.choice(semesters) if rng.random() < 0.3 else None
+        recommend_calls.append((cleaned, engine.facets.select(program, semester), words, selected))
+    stages['recommend'] = time_stage(engine.recommend, recommend_calls)
+
+    texts = [text for text, _ in queries]
+    chunks = [(texts[i:i + batch_size],) for i in range(0, len(texts), batch_size)]
+    batch = time_stage(engine.recommend_batch, chunks, memory_calls=1)
+    batch['queries_per_s'] = batch['throughput_per_s'] * len(texts) / len(chunks)
+    stages['recommend_batch'] = batch
+
+    row_calls = [(np.array(rng.sample(range(n_rows), rng.randint(1, 20))),) for _ in range(n_queries)]
+    stages['top_careers'] = time_stage(engine.careers.top_careers, row_calls)
+    id_calls = [(engine.course_ids[rows].tolist(),) for (rows,) in row_calls]
+    stages['career_paths'] = time_stage(engine.career_paths, id_calls)
+
+    t0 = time.perf_counter()
+    engine.suggestions
+    stages['build_suggestions'] = {
+        'seconds': time.perf_counter() - t0,
+        'peak_memory_kb': peak_memory_kb(SuggestionIndex.from_catalog, [(df,)]),
+    }
+    # Prefix seperti saat mengetik: 1..n huruf pertama tiap kata query
+    prefixes = [(word[:rng.randint(1, len(word))],) for text in texts for word in text.split()][:n_queries]
+    stages['suggest'] = time_stage(engine.suggest, prefixes)
+    return report
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark pipeline rekomendasi dengan katalog sintetis.")
+    parser.add_argument('--sizes', default='10000,100000', help="Ukuran katalog dipisah koma, mis. 10000,100000,1000000")
+    parser.add_argument('--queries', type=int, default=300)
+    parser.add_argument('--batch-size', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='bench_results.json')
+    args = parser.parse_args(argv)
+
+    results = {
+        'revision': git_revision(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'runs': [],
+    }
+    for size in (int(s) for s in args.sizes.split(',')):
+        print(f"Benchmark katalog {size} baris...", file=sys.stderr)
+        run = bench_size(size, args.queries, args.batch_size, args.seed)
+        results['runs'].append(run)
+        for stage, stats in run['stages'].items():
+            if 'p50_ms' in stats:
+                print(f"  {stage:24s} p50={stats['p50_ms']:.3f}ms p95={stats['p95_ms']:.3f}ms "
+                      f"p99={stats['p99_ms']:.3f}ms peak={stats['peak_memory_kb']:.0f}KB", file=sys.stderr)
+            else:
+                print(f"  {stage:24s} {stats['seconds']:.2f}s peak={stats['peak_memory_kb']:.0f}KB", file=sys.stderr)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"Hasil ditulis ke {args.output}", file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
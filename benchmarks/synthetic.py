@@ -0,0 +1,75 @@
+"""
+Generator katalog dan query sintetis yang bentuknya mengikuti CSV asli
+(kolom Program, Semester, Course; nama mata kuliah campuran Indonesia/Inggris).
+"""
+import random
+
+from advisor.catalog import CATALOG_PATH, load_catalog
+from advisor.text import get_main_keywords
+
+FACULTY_SUFFIXES = ["", "Kampus Sunter", "Kampus Ancol", "Kelas Internasional", "Kelas Karyawan"]
+EXTRA_PROGRAMS = [
+    "Teknik Sipil (S1)", "Teknik Industri (S1)", "Arsitektur (S1)", "Hukum (S1)", "Psikologi (S1)",
+    "Ilmu Gizi (S1)", "Farmasi (S1)", "Teknik Elektro (S1)", "Desain Produk (S1)", "Film dan Televisi (S1)",
+]
+COURSE_PREFIXES = [
+    "Pengantar", "Dasar-Dasar", "Manajemen", "Analisis", "Sistem", "Teknik", "Praktikum", "Seminar",
+    "Metodologi", "Studio", "Introduction to", "Advanced", "Applied", "Strategi", "Perancangan",
+]
+COURSE_SUFFIXES = ["", "", "", "1", "2", "Lanjut", "Terapan", "for Business", "Digital", "Internasional"]
+
+QUERY_TEMPLATES = [
+    "saya suka {kw}",
+    "aku hobi {kw} dan {kw2}",
+    "suka {kw} tapi tidak suka {neg}",
+    "pengen kerja di bidang {kw}, benci {neg}",
+    "gak suka {neg} sih, lebih senang {kw}",
+    "I really like {kw} and {kw2}",
+    "minat {kw} {kw2} tapi anti {neg}",
+    "{kw}",
+]
+NEGATED_WORDS = ["hitungan", "akuntansi", "desain", "coding", "bahasa", "statistika", "bisnis", "gambar"]
+
+def _course_words(df):
+    words = set()
+    for course in df['Course']:
+        for word in str(course).split():
+            if word.isalpha() and len(word) > 3:
+                words.add(word)
+    return sorted(words)
+
+def synthetic_catalog(n_rows, seed=0, source=CATALOG_PATH):
+    """DataFrame katalog (siap untuk RecommendationEngine) dengan n_rows baris."""
+    import pandas as pd
+
+    rng = random.Random(seed)
+    base = load_catalog(source)
+    words = _course_words(base)
+    programs = sorted(set(base['Program'])) + EXTRA_PROGRAMS
+    programs = [f"{p} {s}".strip() for s in FACULTY_SUFFIXES for p in programs]
+    real_courses = list(base['Course'])
+
+    rows = []
+    for _ in range(n_rows):
+        if rng.random() < 0.3:
+            course = rng.choice(real_courses)
+        else:
+            course = ' '.join([rng.choice(COURSE_PREFIXES)] + rng.sample(words, rng.randint(1, 3)) + [rng.choice(COURSE_SUFFIXES)]).strip()
+        rows.append((rng.choice(programs), rng.randint(1, 8), course))
+    df = pd.DataFrame(rows, columns=['Program', 'Semester', 'Course'])
+    df['combined_features'] = df['Course'].astype(str) + ' ' + df['Program'].astype(str)
+    return df
+
+def synthetic_queries(n_queries, seed=0):
+    """List (teks query, selected_keywords) dengan negasi dan keyword pembantu."""
+    rng = random.Random(seed)
+    keywords = get_main_keywords()
+    interests = keywords + ["desain grafis", "programming", "manajemen hotel", "fotografi", "statistika", "public speaking"]
+    queries = []
+    for _ in range(n_queries):
+        text = rng.choice(QUERY_TEMPLATES).format(
+            kw=rng.choice(interests), kw2=rng.choice(interests), neg=rng.choice(NEGATED_WORDS)
+        )
+        selected = rng.sample(keywords, rng.choice([0, 0, 1, 2]))
+        queries.append((text, selected))
+    return queries
@@ -1,324 +1,133 @@
-import streamlit as st
-import pandas as pd
-import re
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-from textblob import TextBlob
-from itertools import chain # Tambahan untuk menggabungkan list
+import os
+import uuid
 
-# ==========================================
-# BAGIAN 1: LOGIKA & DATA (BACKEND)
-# ==========================================
+import streamlit as st
 
-KEYWORD_MAPPING = {
-    "menggambar": "desain visual art seni fotografi kreatif sketsa ilustrasi grafis",
-    "gambar": "desain visual art seni fotografi kreatif sketsa ilustrasi grafis",
-    "seni": "desain visual art seni fotografi kreatif sketsa ilustrasi grafis",
-    "jualan": "marketing bisnis manajemen pemasaran retail sales perdagangan kewirausahaan entrepreneur",
-    "dagang": "marketing bisnis manajemen pemasaran retail sales perdagangan kewirausahaan entrepreneur",
-    "bisnis": "marketing bisnis manajemen pemasaran retail sales perdagangan kewirausahaan entrepreneur",
-    "ngoding": "teknologi informasi sistem komputer data algoritma programming python web software aplikasi digital",
-    "coding": "teknologi informasi sistem komputer data algoritma programming python web software aplikasi digital",
-    "komputer": "teknologi informasi sistem komputer data algoritma programming python web software aplikasi digital",
-    "hitung": "akuntansi statistika matematika ekonomi keuangan pajak finance analisis",
-    "angka": "akuntansi statistika matematika ekonomi keuangan pajak finance analisis",
-    "jalan-jalan": "pariwisata hospitality hotel tour travel guide tourism wisata perhotelan",
-    "traveling": "pariwisata hospitality hotel tour travel guide tourism wisata perhotelan",
-    "pariwisata": "pariwisata hospitality hotel tour travel guide tourism wisata perhotelan",
-    "masak": "food beverage tata boga kitchen pastry kuliner makanan minuman chef",
-    "memasak": "food beverage tata boga kitchen pastry kuliner makanan minuman chef",
-    "kuliner": "food beverage tata boga kitchen pastry kuliner makanan minuman chef",
-    "desain": "desain visual kreatif grafis komunikasi media digital",
-    "komunikasi": "komunikasi media jurnalistik broadcast public relations PR",
-    "film": "film broadcasting multimedia produksi sinema animasi video",
-    "musik": "musik audio sound production recording entertainment",
-    "olahraga": "sport fitness kesehatan health wellness management",
-    "data": "data science analytics statistika machine learning artificial intelligence AI",
-    "game": "game development interactive design programming unity multimedia",
-}
-
-# --- DATA DESKRIPSI JURUSAN (BARU) ---
-PROGRAM_DESCRIPTIONS = {
-    "Informatika": "Mempelajari pengembangan software, teknologi jaringan, dan komputasi cerdas untuk solusi masa depan.",
-    "Sistem Informasi": "Menggabungkan ilmu komputer dengan manajemen bisnis untuk mengelola sistem perusahaan.",
-    "Manajemen": "Fokus pada pengelolaan bisnis, strategi pemasaran, keuangan, dan kepemimpinan organisasi.",
-    "Akuntansi": "Ahli dalam pencatatan, analisis, dan pelaporan keuangan untuk keputusan bisnis yang akurat.",
-    "Ilmu Komunikasi": "Mempelajari strategi penyampaian pesan efektif melalui media digital, humas, dan jurnalistik.",
-    "Hospitality dan Pariwisata": "Menyiapkan profesional di bidang perhotelan, kuliner, dan manajemen destinasi wisata.",
-    "Desain Komunikasi Visual": "Mengembangkan solusi komunikasi visual yang kreatif, artistik, dan inovatif.",
-    "Bahasa Inggris": "Mendalami bahasa, sastra, dan budaya Inggris untuk komunikasi profesional global.",
-    "Bahasa Mandarin": "Mempelajari bahasa dan budaya Tiongkok untuk keunggulan bisnis internasional.",
-    "Bisnis Digital": "Mengintegrasikan teknologi digital canggih dalam strategi dan operasional bisnis modern.",
-    "Data Science": "Mengolah data besar (Big Data) menjadi wawasan berharga untuk prediksi dan keputusan.",
-    "Desain Interaktif": "Fokus pada perancangan pengalaman pengguna (UX) dan antarmuka (UI) game serta media interaktif.",
-    "Psikologi": "Mempelajari perilaku manusia dan proses mental untuk kesejahteraan individu dan organisasi."
-}
-
-@st.cache_data
-def load_data():
-    try:
-        df = pd.read_csv('List Mata Kuliah UBM.xlsx - Sheet1.csv')
-        df = df.dropna()
-        df['combined_features'] = df['Course'].astype(str) + ' ' + df['Program'].astype(str)
-        return df
-    except FileNotFoundError:
-        st.error("File CSV tidak ditemukan. Pastikan file 'List Mata Kuliah UBM.xlsx - Sheet1.csv' ada di folder yang sama.")
-        return pd.DataFrame()
-
-def get_program_description(program_name):
-    """Mencari deskripsi yang cocok berdasarkan nama jurusan."""
-    for key, desc in PROGRAM_DESCRIPTIONS.items():
-        if key in program_name:
-            return desc
-    return "Jurusan unggulan yang siap mencetak profesional handal di bidangnya."
-
-def get_course_advice(course_name):
-    """
-    Memberikan tips dan deskripsi umum berdasarkan kata kunci pada nama mata kuliah.
-    Ini adalah 'Smart Logic' karena kita tidak punya data tips spesifik per matkul.
-    """
-    course_lower = course_name.lower()
-    
-    if any(x in course_lower for x in ['matematika', 'kalkulus', 'statistika', 'akuntansi', 'keuangan', 'fisika']):
-        return {
-            "desc": "Mata kuliah ini banyak melibatkan logika, rumus, perhitungan, dan ketelitian angka.",
-            "tip": "💡 **Tips Sukses:** Jangan hanya menghapal rumus, tapi pahami konsep dasarnya. Perbanyak latihan soal mandiri agar terbiasa dengan berbagai variasi kasus perhitungan."
-        }
-    elif any(x in course_lower for x in ['program', 'coding', 'algoritma', 'data', 'sistem', 'web', 'mobile', 'software']):
-        return {
-            "desc": "Fokus pada pengembangan logika teknis, struktur data, dan penulisan kode (coding) untuk membangun aplikasi.",
-            "tip": "💻 **Tips Sukses:** Praktek langsung (ngoding) jauh lebih efektif daripada cuma baca teori. Jangan takut error, itu bagian dari proses belajar! Manfaatkan sumber belajar online seperti StackOverflow."
-        }
-    elif any(x in course_lower for x in ['desain', 'gambar', 'visual', 'art', 'sketsa', 'nirmana', 'tipografi']):
-        return {
-            "desc": "Mengasah kreativitas, estetika, rasa seni, dan kemampuan visualisasi ide ke dalam bentuk karya.",
-            "tip": "🎨 **Tips Sukses:** Sering-sering cari referensi (Pinterest/Behance) untuk memperkaya wawasan visual. Mulai bangun portofolio dari tugas-tugas kuliah ini. Jangan ragu eksperimen gaya baru!"
-        }
-    elif any(x in course_lower for x in ['bisnis', 'manajemen', 'marketing', 'pemasaran', 'ekonomi', 'entrepreneur']):
-        return {
-            "desc": "Mempelajari strategi bisnis, pengelolaan organisasi, dinamika pasar, dan perilaku konsumen.",
-            "tip": "📊 **Tips Sukses:** Perbanyak baca studi kasus nyata (case study) perusahaan. Latih kemampuan presentasi dan networking karena soft skill ini sangat krusial di dunia bisnis."
-        }
-    elif any(x in course_lower for x in ['bahasa', 'english', 'mandarin', 'komunikasi', 'writing', 'speaking']):
-        return {
-            "desc": "Meningkatkan kemampuan verbal dan non-verbal untuk komunikasi efektif dalam konteks profesional.",
-            "tip": "🗣️ **Tips Sukses:** Kuncinya adalah 'Active Speaking'. Jangan malu salah grammar saat bicara, yang penting berani ngomong dulu! Praktikkan dengan teman atau native speaker jika ada kesempatan."
-        }
-    elif any(x in course_lower for x in ['hotel', 'wisata', 'tour', 'kitchen', 'pastry', 'food']):
-        return {
-            "desc": "Mata kuliah praktikal yang berhubungan langsung dengan industri pelayanan, kuliner, dan pariwisata.",
-            "tip": "👨‍🍳 **Tips Sukses:** Perhatikan detail kebersihan (hygiene) dan standar pelayanan (service excellence). Disiplin dan attitude adalah nilai jual utama di industri hospitality."
-        }
-    else:
-        # Default tips jika tidak ada kata kunci yang cocok
-        return {
-            "desc": "Mata kuliah ini dirancang untuk memperkuat kompetensi dasar atau keahlian spesifik di jurusan kamu.",
-            "tip": "📝 **Tips Sukses:** Catat poin-poin penting dosen yang tidak ada di slide. Aktif bertanya dan berdiskusi di kelas bisa jadi nilai tambah untuk pemahamanmu."
-        }
-
-def detect_chatbot_responses(user_input):
-    user_input_lower = user_input.lower()
-    responses_shown = []
-    
-    if "tidur" in user_input_lower or "rebahan" in user_input_lower or "malas" in user_input_lower:
-        st.info("😴 Wah, butuh istirahat ya? Sayangnya belum ada jurusan 'Tidur', tapi coba cek matkul santai ini...")
-        responses_shown.append("relax")
-    
-    if "duit" in user_input_lower or "uang" in user_input_lower or "kaya" in user_input_lower or "cuan" in user_input_lower:
-        st.success("💰 Orientasi masa depan mantap! Cek mata kuliah bisnis ini biar makin cuan.")
-        responses_shown.append("money")
-    
-    if "game" in user_input_lower or "gaming" in user_input_lower:
-        st.success("🎮 Daripada cuma main, mending bikin gamenya di jurusan ini!")
-        responses_shown.append("game")
-    
-    if ("menggambar" in user_input_lower or "gambar" in user_input_lower or "seni" in user_input_lower or 
-        "melukis" in user_input_lower or "desain" in user_input_lower) and "game" not in responses_shown:
-        st.success("🎨 Kreativitas tanpa batas! Jurusan desain ini cocok buat kamu yang suka berkarya.")
-        responses_shown.append("art")
-    
-    if "musik" in user_input_lower or "nyanyi" in user_input_lower or "band" in user_input_lower:
-        st.info("🎵 Passion di musik? Cek mata kuliah ini untuk mengasah skill kamu!")
-        responses_shown.append("music")
-    
-    if "olahraga" in user_input_lower or "sport" in user_input_lower or "fitness" in user_input_lower or "atlet" in user_input_lower:
-        st.success("⚽ Sehat itu penting! Lihat mata kuliah yang cocok untuk kamu yang aktif.")
-        responses_shown.append("sports")
-    
-    if ("komunikasi" in user_input_lower or "presenter" in user_input_lower or "mc" in user_input_lower or 
-        "public speaking" in user_input_lower) and "game" not in responses_shown:
-        st.success("🎤 Jago ngomong? Perfect! Ini mata kuliah untuk kamu yang suka berkomunikasi.")
-        responses_shown.append("communication")
-    
-    if "masak" in user_input_lower or "memasak" in user_input_lower or "kuliner" in user_input_lower or "chef" in user_input_lower:
-        st.success("👨‍🍳 MasterChef vibes! Cek mata kuliah kuliner dan hospitality ini.")
-        responses_shown.append("culinary")
-    
-    if ("jalan" in user_input_lower and "jalan" in user_input_lower) or "traveling" in user_input_lower or "wisata" in user_input_lower or "tour" in user_input_lower:
-        st.success("✈️ Hobi jalan-jalan? Ini mata kuliah pariwisata yang cocok buat kamu!")
-        responses_shown.append("travel")
-    
-    if ("akuntansi" in user_input_lower or "akuntan" in user_input_lower) and "money" not in responses_shown:
-        st.info("📊 Teliti sama angka? Akuntansi bisa jadi pilihan karir cemerlang!")
-        responses_shown.append("accounting")
-    
-    if "bahasa" in user_input_lower or "english" in user_input_lower or "mandarin" in user_input_lower or "translator" in user_input_lower:
-        st.success("🗣️ Multilingual skill itu valuable! Lihat program bahasa yang tersedia.")
-        responses_shown.append("language")
-    
-    if "data" in user_input_lower or "analytics" in user_input_lower or "ai" in user_input_lower or "machine learning" in user_input_lower:
-        st.success("📈 Data is the new oil! Cek jurusan Data Science dan AI ini.")
-        responses_shown.append("data")
-    
-    if "film" in user_input_lower or "video" in user_input_lower or "sinematografi" in user_input_lower or "youtuber" in user_input_lower:
-        st.success("🎬 Content creator masa depan! Ini mata kuliah media dan film untuk kamu.")
-        responses_shown.append("film")
-    
-    return len(responses_shown) > 0
-
-def process_negation(user_input):
-    negation_patterns = [
-        r'\b(tidak\s+suka|gak\s+suka|ga\s+suka)\s+(\w+)',
-        r'\b(benci)\s+(\w+)',
-        r'\b(anti)\s+(\w+)',
-    ]
-    
-    words_to_remove = []
-    cleaned_text = user_input.lower()
-    
-    for pattern in negation_patterns:
-        matches = re.finditer(pattern, cleaned_text)
-        for match in matches:
-            if len(match.groups()) >= 2:
-                negated_word = match.group(len(match.groups()))
-                words_to_remove.append(negated_word)
-                cleaned_text = cleaned_text.replace(match.group(0), '')
-    
-    if words_to_remove:
-        st.warning(f"⚠️ Sistem mendeteksi kata yang tidak disukai: {', '.join(words_to_remove)}. Mata kuliah terkait akan dihindari.")
-    
-    return cleaned_text, words_to_remove
+from advisor.bookmarks import BOOKMARK_DB_ENV, Bookmarks, SqliteBookmarkBackend
+from advisor.catalog import CATALOG_FILENAME, CATALOG_PATH
+from advisor.client import SERVICE_URL_ENV, ServiceClient
+from advisor.coalesce import COALESCE_ENV, SearchCoalescer
+from advisor.metrics import METRICS, request_trace, stage
+from advisor.querylog import QUERY_LOG_ENV, QueryLog
+from advisor.reload import CatalogWatcher
+from advisor.text import get_main_keywords
 
-def analyze_sentiment(user_input):
-    try:
-        blob = TextBlob(user_input)
-        polarity = blob.sentiment.polarity
-        subjectivity = blob.sentiment.subjectivity
-        
-        if polarity > 0.5:
-            st.success("😊 Wow, semangat banget! Energi positif kamu keren! Mari kita cari mata kuliah yang pas.")
-        elif polarity > 0.1:
-            st.info("🙂 Terlihat antusias! Yuk kita cari rekomendasi terbaik untuk kamu.")
-        elif polarity < -0.1:
-            st.info("🤔 Kayaknya masih bingung ya? Tenang, sistem ini akan bantu kamu menemukan arah yang tepat!")
-        
-        if subjectivity > 0.7:
-            st.caption("💭 Tips: Semakin spesifik minat kamu, semakin akurat rekomendasinya!")
-        
-        return {
-            'polarity': polarity,
-            'subjectivity': subjectivity,
-            'sentiment': 'positive' if polarity > 0.1 else ('negative' if polarity < -0.1 else 'neutral')
-        }
-    except:
-        return {'polarity': 0, 'subjectivity': 0, 'sentiment': 'neutral'}
-
-def expand_query(user_query, selected_keywords=None):
-    expanded_query = user_query.lower()
-    
-    # 1. Expand dari KEYWORD_MAPPING
-    for keyword, expansion in KEYWORD_MAPPING.items():
-        if keyword in expanded_query:
-            expanded_query += ' ' + expansion
-    
-    # 2. Tambahkan keyword yang dipilih pengguna
-    if selected_keywords:
-        for keyword in selected_keywords:
-            if keyword in KEYWORD_MAPPING:
-                expanded_query += ' ' + KEYWORD_MAPPING[keyword]
-            else:
-                # Untuk keyword yang tidak ada di mapping (mungkin hanya kata kunci utama)
-                expanded_query += ' ' + keyword
-    
-    return expanded_query
+# Engine meng-cache RESULT_LIMIT hasil terurut per query; UI hanya merender PAGE_SIZE kartu per halaman
+RESULT_LIMIT = 50
+PAGE_SIZE = 10
 
-def get_recommendations(user_query, df_filtered, words_to_remove=None, selected_keywords=None, top_n=10):
-    if not user_query.strip() and not selected_keywords:
-        return pd.DataFrame()
-    
-    if df_filtered.empty:
-        return pd.DataFrame()
-    
-    if words_to_remove:
-        for word in words_to_remove:
-            df_filtered = df_filtered[~df_filtered['combined_features'].str.lower().str.contains(word, na=False)]
-    
-    if df_filtered.empty:
-        return pd.DataFrame()
-    
-    # Gunakan selected_keywords dalam proses expansion
-    expanded_query = expand_query(user_query, selected_keywords)
-    
-    tfidf_vectorizer = TfidfVectorizer(stop_words='english')
-    tfidf_matrix = tfidf_vectorizer.fit_transform(df_filtered['combined_features'])
-    query_vec = tfidf_vectorizer.transform([expanded_query])
-    
-    cosine_similarities = cosine_similarity(query_vec, tfidf_matrix).flatten()
-    
-    df_results = df_filtered.copy()
-    df_results['Similarity Score'] = cosine_similarities
-    
-    df_results = df_results[df_results['Similarity Score'] > 0]
-    df_results = df_results.sort_values('Similarity Score', ascending=False).head(top_n)
-    df_results['Similarity Score'] = (df_results['Similarity Score'] * 100).round(2)
-    
-    return df_results[['Program', 'Semester', 'Course', 'Similarity Score']]
+# ==========================================
+# BAGIAN 1: MESIN REKOMENDASI (paket advisor/)
+# ==========================================
 
-def recommend_career_paths(courses_list):
-    if not courses_list:
-        return []
-    
-    career_mapping = {
-        'Informatika': ['Software Engineer', 'Full Stack Developer', 'DevOps Engineer', 'System Analyst', 'IT Consultant'],
-        'Data Science': ['Data Scientist', 'Data Analyst', 'Machine Learning Engineer', 'Business Intelligence Analyst', 'AI Researcher'],
-        'Desain Komunikasi Visual': ['Graphic Designer', 'UI/UX Designer', 'Art Director', 'Brand Designer', 'Creative Director'],
-        'Desain Interaktif': ['UX Designer', 'Game Designer', 'Motion Graphics Designer', 'Interactive Media Designer', 'Web Designer'],
-        'Manajemen': ['Business Manager', 'Project Manager', 'Marketing Manager', 'HR Manager', 'Entrepreneur'],
-        'Akuntansi': ['Accountant', 'Tax Consultant', 'Financial Analyst', 'Auditor', 'Finance Manager'],
-        'Sistem Informasi': ['System Analyst', 'Business Analyst', 'IT Project Manager', 'ERP Consultant', 'Database Administrator'],
-        'Bahasa Inggris': ['Translator', 'Teacher', 'Content Writer', 'Editor', 'International Relations Specialist'],
-        'Bahasa Mandarin': ['Mandarin Translator', 'Language Teacher', 'International Business Specialist', 'Tour Guide'],
-        'Bisnis Digital': ['Digital Marketing Specialist', 'E-commerce Manager', 'Social Media Manager', 'Digital Strategist', 'Growth Hacker'],
-        'Hospitality dan Pariwisata': ['Hotel Manager', 'Event Planner', 'Tour Guide', 'Travel Consultant', 'F&B Manager'],
-        'Ilmu Komunikasi': ['Public Relations Specialist', 'Journalist', 'Content Creator', 'Social Media Manager', 'Communications Manager']
-    }
-    
-    course_keywords_mapping = {
-        'programming|algoritma|web|mobile|software': ['Software Developer', 'Programmer', 'Web Developer'],
-        'data|analytics|machine learning|ai|artificial': ['Data Scientist', 'Data Analyst', 'ML Engineer'],
-        'desain|design|visual|grafis|ui|ux': ['Designer', 'UI/UX Designer', 'Graphic Designer'],
-        'game|gaming|interactive': ['Game Developer', 'Game Designer'],
-        'bisnis|business|manajemen|marketing': ['Business Analyst', 'Marketing Specialist', 'Manager'],
-        'akuntansi|accounting|finance|keuangan': ['Accountant', 'Financial Analyst'],
-        'komunikasi|media|jurnalis|public': ['Communications Specialist', 'Media Specialist', 'Journalist'],
-        'hospitality|pariwisata|tourism|hotel': ['Tourism Professional', 'Hotel Manager']
-    }
-    
-    programs = [course['Program'] for course in courses_list]
-    course_names = ' '.join([course['Course'].lower() for course in courses_list])
-    
-    recommended_careers = set()
-    
-    for program in programs:
-        for key, value in career_mapping.items():
-            if key in program:
-                recommended_careers.update(value[:3])
-    
-    for pattern, careers in course_keywords_mapping.items():
-        if re.search(pattern, course_names):
-            recommended_careers.update(careers)
-    
-    return list(recommended_careers)[:8]
+@st.cache_resource
+def load_catalog_watcher():
+    """Katalog dan semua indeksnya dibangun sekali per proses server, lalu diperbarui saat CSV berubah."""
+    # Mode klien tipis: katalog & indeks dipegang advisor.service, UI hanya mengirim request
+    service_url = os.environ.get(SERVICE_URL_ENV)
+    if service_url:
+        return ServiceClient(service_url)
+    return CatalogWatcher(CATALOG_PATH, snapshot=True)
+
+@st.cache_resource
+def load_search_coalescer():
+    """Pencarian dari banyak sesi digabung per beberapa milidetik (opsional, env ADVISOR_COALESCE_MS)."""
+    max_wait_ms = os.environ.get(COALESCE_ENV)
+    if not max_wait_ms or os.environ.get(SERVICE_URL_ENV):
+        return None
+    return SearchCoalescer(load_catalog_watcher().current, max_wait=float(max_wait_ms) / 1000)
+
+@st.cache_resource
+def load_bookmark_backend():
+    """Database bookmark bersama semua sesi (opsional, env ADVISOR_BOOKMARK_DB)."""
+    path = os.environ.get(BOOKMARK_DB_ENV)
+    return SqliteBookmarkBackend(path) if path else None
+
+@st.cache_resource
+def load_query_log():
+    """Log query/event untuk tuning offline (opsional, env ADVISOR_QUERY_LOG=direktori)."""
+    directory = os.environ.get(QUERY_LOG_ENV)
+    return QueryLog(directory) if directory else None
+
+def log_event(event, **fields):
+    """Mencatat event sesi ini ke query log (jika aktif); tidak pernah menunggu disk."""
+    query_log = load_query_log()
+    if query_log is not None:
+        query_log.log(event, session=st.session_state.session_id, **fields)
+
+def save_bookmark(rec, rank):
+    """Callback tombol Simpan: bookmark + event untuk melihat hasil mana yang dipilih dari query apa."""
+    st.session_state.bookmarks.add(rec.course_id)
+    last_search = st.session_state.get('last_search') or {}
+    log_event('bookmark', course_id=rec.course_id, course=rec.course, program=rec.program, rank=rank,
+              score=rec.score, query=last_search.get('user_input'))
+
+def open_bookmarks():
+    """Bookmark sesi ini; dengan database, pengguna dikenali dari ?uid= di URL agar bertahan setelah restart."""
+    backend = load_bookmark_backend()
+    user = st.query_params.get('uid')
+    if backend is not None and not user:
+        user = st.query_params['uid'] = uuid.uuid4().hex[:16]
+    return Bookmarks(user, backend)
+
+def last_fragment(text):
+    """Kata terakhir yang sedang diketik; kosong jika teks diakhiri spasi."""
+    return text.split()[-1] if text and not text[-1].isspace() else ''
+
+def apply_suggestion():
+    """Callback saran: kata terakhir di input diganti teks saran yang dipilih."""
+    choice = st.session_state.input_suggestion
+    if choice:
+        text = st.session_state.get('user_input_area', '')
+        st.session_state.user_input_area = text[:len(text) - len(last_fragment(text))] + choice + ' '
+        st.session_state.input_suggestion = None
+
+def set_result_page(page):
+    """Callback tombol halaman hasil."""
+    st.session_state.result_page = page
+
+def show_messages(messages):
+    """Menampilkan Message dari core dengan fungsi Streamlit sesuai level-nya."""
+    for message in messages:
+        getattr(st, message.level)(message.text)
+
+def diagnostics_enabled():
+    """Panel diagnostik tersembunyi: aktif lewat ?diag=1 atau env ADVISOR_DIAGNOSTICS=1."""
+    return st.query_params.get('diag') == '1' or os.environ.get('ADVISOR_DIAGNOSTICS') == '1'
+
+def render_diagnostics_panel(engine, watcher):
+    """Rincian waktu per tahap untuk N request terakhir + ekspor metrics ke file lokal."""
+    with st.expander("🩺 Diagnostics"):
+        recent = METRICS.recent_requests()[-10:]
+        if recent:
+            st.dataframe([
+                {'total_ms': round(r['total_ms'], 2), **{name: round(ms, 2) for name, ms in r['stages_ms'].items()}}
+                for r in reversed(recent)
+            ])
+            profiled = next((r for r in reversed(recent) if 'profile' in r), None)
+            if profiled:
+                st.code(profiled['profile'], language=None)
+        else:
+            st.caption("Belum ada request tercatat.")
+        cache_stats = {f"result_cache_{k}": v for k, v in engine.result_cache.stats().items()}
+        st.caption(f"Cache: {cache_stats['result_cache_hits']} hit / {cache_stats['result_cache_misses']} miss · katalog {engine.version}")
+        if watcher.last_reload:
+            st.caption(f"Reload terakhir: {watcher.last_reload}")
+        coalescer = load_search_coalescer()
+        if coalescer:
+            stats = coalescer.stats()
+            batch_size = stats['batch_size'] or {'mean': 0.0, 'max': 0}
+            queue_depth = stats['queue_depth'] or {'mean': 0.0, 'max': 0}
+            st.caption(f"Coalescer: batch rata-rata {batch_size['mean']:.1f} (maks {batch_size['max']:.0f}) · "
+                       f"antrian rata-rata {queue_depth['mean']:.1f} (maks {queue_depth['max']:.0f})")
+        query_log = load_query_log()
+        if query_log is not None:
+            stats = query_log.stats()
+            st.caption(f"Query log: {stats['written']} event tertulis · {stats['dropped']} terbuang · antrian {stats['queued']}")
+        if st.button("Ekspor metrics"):
+            METRICS.export('advisor_metrics.json', cache_stats)
+            METRICS.export('advisor_metrics.prom', cache_stats)
+            st.success("Tersimpan: advisor_metrics.json, advisor_metrics.prom")
 
 # ==========================================
 # BAGIAN 2: UI/UX & LANDING PAGE
@@ -478,12 +287,12 @@ def render_landing_page():
     with col3:
         st.markdown('<div class="feature-card"><div class="feature-icon">✨</div><div class="feature-title">Mudah Digunakan</div><div class="feature-desc">Tinggal ketik & tanya</div></div>', unsafe_allow_html=True)
 
-# Tambahan: Ambil Keyword Utama dari Mapping
-def get_main_keywords():
-    return sorted(list(KEYWORD_MAPPING.keys()))
-
 def main_app():
-    df = load_data()
+    watcher = load_catalog_watcher()
+    engine = watcher.current()
+    facets = engine.facets
+    if not len(engine):
+        st.error(f"File CSV tidak ditemukan. Pastikan file '{CATALOG_FILENAME}' ada di folder yang sama.")
     
     # Inisialisasi session state untuk keyword yang dipilih
     if 'selected_keywords' not in st.session_state:
@@ -495,39 +304,50 @@ def main_app():
         if st.button("🏠 Home"):
             st.session_state['app_started'] = False
             st.session_state.selected_keywords = [] # Reset keyword
+            st.session_state.last_search = None
             st.rerun()
         
         st.markdown("---")
         st.subheader("Filter Data")
-        program_list = ["Semua Jurusan"] + sorted(df['Program'].unique().tolist())
+        program_list = ["Semua Jurusan"] + facets.programs
         selected_program = st.selectbox("Program Studi", options=program_list)
-        semester_list = ["Semua Semester"] + sorted(df['Semester'].unique().tolist())
+        semester_list = ["Semua Semester"] + facets.semesters
         selected_semester = st.selectbox("Semester", options=semester_list)
         
         st.markdown("---")
         st.subheader("Bookmark")
-        if st.session_state.bookmarks:
-            st.info(f"{len(st.session_state.bookmarks)} tersimpan")
+        bookmarks = st.session_state.bookmarks
+        if len(bookmarks):
+            st.info(f"{len(bookmarks)} tersimpan")
+            # Sesi hanya menyimpan course_id; nama diambil dari katalog versi yang sedang aktif
+            saved = engine.courses(list(bookmarks))
             with st.expander("Lihat Daftar"):
-                for idx, bm in enumerate(st.session_state.bookmarks):
-                    st.markdown(f"**{bm['Course']}**")
-                    # Menggunakan st.form dan st.form_submit_button untuk tombol di dalam expander
-                    with st.form(key=f"del_form_{idx}"):
-                        if st.form_submit_button("Hapus", type="secondary"):
-                            st.session_state.bookmarks.pop(idx)
-                            st.rerun()
-                    st.divider()
+                st.markdown('\n'.join(f"- **{rec.course}**" for rec in saved))
+                # Satu form untuk semua bookmark, bukan satu form per bookmark
+                with st.form(key="del_form", clear_on_submit=True):
+                    names = {rec.course_id: rec.course for rec in saved}
+                    to_remove = st.multiselect("Pilih yang dihapus", options=list(names), format_func=names.get)
+                    if st.form_submit_button("Hapus", type="secondary") and to_remove:
+                        for course_id in to_remove:
+                            bookmarks.remove(course_id)
+                            log_event('unbookmark', course_id=course_id)
+                        st.rerun()
             if st.button("Clear All"):
-                st.session_state.bookmarks = []
+                log_event('bookmark_clear', count=len(bookmarks))
+                bookmarks.clear()
                 st.rerun()
             st.markdown("---")
             st.subheader("Karir")
-            careers = recommend_career_paths(st.session_state.bookmarks)
+            careers = engine.career_paths(list(bookmarks))
             if careers:
                 for c in careers:
                     st.markdown(f"- {c}")
         else:
             st.caption("Belum ada bookmark.")
+        
+        if diagnostics_enabled():
+            st.markdown("---")
+            render_diagnostics_panel(engine, watcher)
 
     # --- MAIN CONTENT ---
     st.markdown('<h1 style="text-align: center;">🎓 AI Course Advisor</h1>', unsafe_allow_html=True)
@@ -544,17 +364,20 @@ def main_app():
     """)
     st.markdown("<br>", unsafe_allow_html=True)
 
-    # Filter logic
-    df_filtered = df.copy()
-    if selected_program != "Semua Jurusan":
-        df_filtered = df_filtered[df_filtered['Program'] == selected_program]
-    if selected_semester != "Semua Semester":
-        df_filtered = df_filtered[df_filtered['Semester'] == selected_semester]
+    # Filter logic (posisi baris dari FacetIndex, tanpa copy DataFrame)
+    program_filter = None if selected_program == "Semua Jurusan" else selected_program
+    semester_filter = None if selected_semester == "Semua Semester" else selected_semester
 
     # 2. INPUT SECTION
     c_in, c_btn = st.columns([4, 1])
     with c_in:
         user_input = st.text_area("Minat", placeholder="Contoh: Saya suka desain tapi tidak suka hitungan...", height=80, key="user_input_area", label_visibility="collapsed")
+        # Saran autocomplete (keyword, mata kuliah, jurusan) untuk kata terakhir; lookup prefix, tanpa skor
+        fragment = last_fragment(user_input)
+        suggestions = engine.suggest(fragment, 6) if len(fragment) >= 2 else []
+        if suggestions:
+            st.pills("Saran", [suggestion.text for suggestion in suggestions], key="input_suggestion",
+                     on_change=apply_suggestion, label_visibility="collapsed")
     with c_btn:
         st.markdown("<br>", unsafe_allow_html=True) 
         btn_cari = st.button("Cari 🚀")
@@ -582,58 +405,109 @@ def main_app():
     if btn_cari:
         if not user_input and not st.session_state.selected_keywords:
             st.warning("Mohon masukkan minat kamu atau pilih minimal satu Keyword Pembantu!")
+            st.session_state.last_search = None
         else:
-            st.markdown("---")
-            with st.spinner("Sedang berpikir..."):
-                detect_chatbot_responses(user_input)
-                cleaned_input, words_to_remove = process_negation(user_input)
-                
-                # Panggil get_recommendations dengan selected_keywords
-                recs = get_recommendations(cleaned_input, df_filtered, words_to_remove, st.session_state.selected_keywords)
-                
-                if not recs.empty:
-                    st.subheader(f"Hasil: {len(recs)} Mata Kuliah")
-                    for idx, row in recs.iterrows():
-                        prog_desc = get_program_description(row['Program'])
-                        advice = get_course_advice(row['Course']) # Ambil Tips Cerdas
+            # Disimpan agar rerun berikutnya (mis. setelah "Simpan") menampilkan hasil yang sama dari cache
+            st.session_state.last_search = {
+                'user_input': user_input,
+                'program': program_filter,
+                'semester': semester_filter,
+                'selected_keywords': list(st.session_state.selected_keywords),
+            }
+            st.session_state.result_page = 0
+            st.session_state.search_count = st.session_state.get('search_count', 0) + 1
+
+    last_search = st.session_state.get('last_search')
+    if last_search:
+        st.markdown("---")
+        with st.spinner("Sedang berpikir..."), request_trace('search', st.query_params.get('profile')) as trace:
+            coalescer = load_search_coalescer()
+            # Hanya satu halaman yang dibuat Recommendation-nya; halaman lain diambil dari daftar ter-cache
+            page = st.session_state.get('result_page', 0)
+            paging = {'top_n': RESULT_LIMIT, 'page': page, 'page_size': PAGE_SIZE}
+            with stage('engine.search'):
+                search = coalescer.search_sync(**last_search, **paging) if coalescer else engine.search(**last_search, **paging)
+            show_messages(search.messages)
+            recs = search.results
+            pages = -(-search.total // PAGE_SIZE)
+            if page and page >= pages:
+                # Katalog berubah dan hasilnya kini lebih sedikit: kembali ke halaman pertama
+                set_result_page(0)
+                st.rerun()
+            
+            if recs:
+                st.subheader(f"Hasil: {search.total} Mata Kuliah")
+                for position, rec in enumerate(recs):
+                    # Deskripsi jurusan & Tips Cerdas sudah dihitung per baris saat katalog dimuat
+                    prog_desc, advice = rec.program_description, rec.advice
 
+                    with stage('render.card'):
                         # Kartu Hasil (Warna Abu muda #f0f2f6 & Teks Hitam)
                         st.markdown(f"""
                         <div class="result-card" style="background: #f0f2f6; padding: 20px; border-radius: 15px; margin-bottom: 15px; border-left: 5px solid #667eea;">
-                            <h3 style="margin:0; font-weight: 700;">{row['Course']}</h3>
+                            <h3 style="margin:0; font-weight: 700;">{rec.course}</h3>
                             <p style="margin:5px 0 0 0; font-size: 0.9rem;">
-                                🎓 {row['Program']} | 📅 Semester {row['Semester']} | ⭐ {row['Similarity Score']}%
+                                🎓 {rec.program} | 📅 Semester {rec.semester} | ⭐ {rec.score}%
                             </p>
                         </div>
                         """, unsafe_allow_html=True)
-                        
+                    
                         # --- BAGIAN EXPANDER (TIPS & DESKRIPSI) ---
-                        with st.expander(f"💡 Lihat Tips & Deskripsi Matkul: {row['Course']}"):
-                            st.markdown(f"""
-                            **ℹ️ Deskripsi Jurusan:** {prog_desc}
-                            
-                            ---
-                            
-                            **📝 Info Mata Kuliah:** {advice['desc']}
-                            
-                            ---
-                            {advice['tip']}
-                            """)
+                        # on_change="rerun": isi expander hanya dibangun & dikirim saat dibuka
+                        with st.expander(f"💡 Lihat Tips & Deskripsi Matkul: {rec.course}", key=f"tips_{rec.row}",
+                                         on_change="rerun") as tips:
+                            if tips.open:
+                                st.markdown(f"""
+                                **ℹ️ Deskripsi Jurusan:** {prog_desc}
+                        
+                                ---
+                        
+                                **📝 Info Mata Kuliah:** {advice['desc']}
+                        
+                                ---
+                                {advice['tip']}
+                                """)
 
                         # Tombol Simpan Bookmark
-                        is_saved = any(b['Course'] == row['Course'] for b in st.session_state.bookmarks)
+                        is_saved = rec.course_id in st.session_state.bookmarks
                         if not is_saved:
-                            # Gunakan st.form untuk menghindari masalah tombol di Streamlit
-                            with st.form(key=f"save_form_{idx}"):
-                                if st.form_submit_button(f"🔖 Simpan", type="primary"):
-                                    st.session_state.bookmarks.append(row.to_dict())
-                                    st.rerun()
+                            # Callback berjalan sebelum rerun, jadi kartu langsung tampil "Tersimpan" tanpa st.form per kartu
+                            st.button(f"🔖 Simpan", key=f"save_{rec.row}", type="primary",
+                                      on_click=save_bookmark, args=(rec, page * PAGE_SIZE + position + 1))
                         else:
-                            st.button(f"✅ Tersimpan", key=f"saved_{idx}", disabled=True)
-                        
+                            st.button(f"✅ Tersimpan", key=f"saved_{rec.row}", disabled=True)
+                    
                         st.markdown("<br>", unsafe_allow_html=True) # Spacer antar kartu
-                else:
-                    st.warning("Tidak ditemukan yang cocok. Coba ganti kata kunci atau hapus filter.")
+
+                if pages > 1:
+                    c_prev, c_page, c_next = st.columns([1, 2, 1])
+                    with c_prev:
+                        st.button("⬅️ Sebelumnya", disabled=page == 0, on_click=set_result_page, args=(page - 1,))
+                    with c_page:
+                        st.markdown(f'<p style="text-align: center;">Halaman {page + 1} dari {pages}</p>', unsafe_allow_html=True)
+                    with c_next:
+                        st.button("Berikutnya ➡️", disabled=page >= pages - 1, on_click=set_result_page, args=(page + 1,))
+            else:
+                st.warning("Tidak ditemukan yang cocok. Coba ganti kata kunci atau hapus filter.")
+
+        # Dicatat sekali per pencarian / halaman baru, bukan di setiap rerun (mis. setelah "Simpan")
+        logged = (st.session_state.get('search_count'), page)
+        if st.session_state.get('logged_search') != logged:
+            st.session_state.logged_search = logged
+            log_event(
+                'search',
+                query=last_search['user_input'],
+                program=last_search['program'],
+                semester=last_search['semester'],
+                keywords=last_search['selected_keywords'],
+                negations=search.words_to_remove,
+                page=page,
+                total=search.total,
+                results=[rec.course_id for rec in recs],
+                catalog=engine.version,
+                total_ms=round(trace.total * 1000, 3),
+                stages_ms={name: round(seconds * 1000, 3) for name, seconds in trace.stages.items()},
+            )
 
     # 5. INFO TAMBAHAN
     st.markdown("---")
@@ -656,28 +530,33 @@ def main_app():
     
     with col_exp2:
         with st.expander("ℹ️ Tentang Sistem"):
-            st.markdown("""
+            st.markdown(f"""
             **Sistem Rekomendasi Mata Kuliah UBM** menggunakan algoritma *TF-IDF & Cosine Similarity* untuk mencocokkan minat kamu dengan kurikulum yang tersedia.
             
-            📊 Total Database: 356 mata kuliah
+            📊 Total Database: {len(engine)} mata kuliah
             
             🎯 Algoritma: TF-IDF + Cosine Similarity
             
             🧠 Smart Search: Keyword Expansion
             
-            🎓 Program Studi: 12 jurusan
+            🎓 Program Studi: {len(engine.facets.programs)} jurusan
             
             📅 Semester: 1 - 8
             
             Sistem ini menggunakan AI untuk menemukan mata kuliah yang paling sesuai dengan minat dan hobi Anda!
             """)
+            cache_stats = engine.result_cache.stats()
+            st.caption(f"⚡ Cache hasil: {cache_stats['hits']} hit / {cache_stats['misses']} miss ({cache_stats['size']} tersimpan)")
 
 def main():
     st.set_page_config(page_title="AI Course Advisor", page_icon="🎓", layout="wide")
     local_css()
     
     if 'bookmarks' not in st.session_state:
-        st.session_state.bookmarks = []
+        st.session_state.bookmarks = open_bookmarks()
+    if 'session_id' not in st.session_state:
+        # Hanya untuk mengelompokkan event satu sesi di query log, bukan identitas pengguna
+        st.session_state.session_id = uuid.uuid4().hex[:16]
     if 'app_started' not in st.session_state:
         st.session_state['app_started'] = False
         
@@ -688,3 +567,4 @@ def main():
 
 if __name__ == "__main__":
     main()
+
@@ -0,0 +1,51 @@
+import time
+
+from advisor.bookmarks import Bookmarks, SqliteBookmarkBackend
+
+def test_changes_are_applied_in_order(tmp_path):
+    backend = SqliteBookmarkBackend(str(tmp_path / 'bookmarks.sqlite'))
+    bookmarks = Bookmarks('ani', backend)
+    for course_id in (3, 1, 2):
+        bookmarks.add(course_id)
+    bookmarks.remove(1)
+    bookmarks.add(1)
+    bookmarks.remove(2)
+    assert list(bookmarks) == [3, 1]
+    assert backend.load('ani') == [3, 1]
+    backend.close()
+
+def test_bookmarks_persist_across_backends(tmp_path):
+    path = str(tmp_path / 'bookmarks.sqlite')
+    backend = SqliteBookmarkBackend(path)
+    Bookmarks('ani', backend).add(10)
+    budi = Bookmarks('budi', backend)
+    budi.add(20)
+    budi.add(21)
+    budi.clear()
+    budi.add(22)
+    backend.close()
+
+    reopened = SqliteBookmarkBackend(path)
+    assert list(Bookmarks('ani', reopened)) == [10]
+    assert list(Bookmarks('budi', reopened)) == [22]
+    assert sorted(user for user, _, _ in reopened.export_rows()) == ['ani', 'budi']
+    reopened.close()
+
+def test_close_writes_queued_changes_and_stops_writer(tmp_path):
+    backend = SqliteBookmarkBackend(str(tmp_path / 'bookmarks.sqlite'), max_wait=5.0)
+    for course_id in range(100):
+        backend.add('ani', course_id)
+    backend.close()
+    assert not backend._writer.is_alive()
+    assert backend.load('ani') == list(range(100))
+
+def test_load_waits_only_for_own_pending_changes(tmp_path):
+    # max_wait panjang: perubahan menunggu di antrian sampai batch ditutup
+    backend = SqliteBookmarkBackend(str(tmp_path / 'bookmarks.sqlite'), max_wait=1.0)
+    backend.add('budi', 1)
+    started = time.monotonic()
+    assert backend.load('ani') == []
+    assert time.monotonic() - started < 0.5
+    backend.add('ani', 2)
+    assert backend.load('ani') == [2]
+    backend.close()
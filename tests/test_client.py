@@ -0,0 +1,92 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from advisor.client import ServiceClient, ServiceConnection, ServiceError
+
+class FakeService(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), FakeHandler)
+        self.version = 'v1'
+        self.fail_info = False
+        # Menutup koneksi keep-alive tanpa memberi tahu klien, seperti worker yang di-restart
+        self.drop_after_response = False
+        self.connections = 0
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+class FakeHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        if self.server.drop_after_response:
+            self.close_connection = True
+
+    def do_GET(self):
+        if self.path == '/info' and not self.server.fail_info:
+            self._send(200, {'version': self.server.version, 'rows': 3, 'programs': ['Informatika'], 'semesters': [1]})
+        else:
+            self._send(500, {'error': 'boom'})
+
+@pytest.fixture
+def service():
+    service = FakeService()
+    yield service
+    service.stop()
+
+def test_keep_alive_connection_is_reused(service):
+    connection = ServiceConnection(service.url)
+    for _ in range(3):
+        assert connection.request('GET', '/info')['version'] == 'v1'
+    assert service.connections == 1
+
+def test_reconnects_once_when_server_drops_connection(service):
+    service.drop_after_response = True
+    connection = ServiceConnection(service.url)
+    for _ in range(3):
+        assert connection.request('GET', '/info')['version'] == 'v1'
+    assert service.connections == 3
+
+def test_error_status_raises_service_error(service):
+    with pytest.raises(ServiceError):
+        ServiceConnection(service.url).request('GET', '/missing')
+
+def test_client_follows_version_and_survives_outage(service):
+    client = ServiceClient(service.url, check_interval=0)
+    first = client.current()
+    assert (first.version, len(first), first.facets.programs) == ('v1', 3, ['Informatika'])
+
+    service.fail_info = True
+    assert client.current() is first
+    assert client.last_error is not None
+
+    service.fail_info = False
+    service.version = 'v2'
+    assert client.current().version == 'v2'
+    assert client.last_error is None
+    assert client.last_reload == {'version': 'v2', 'rows': 3}
@@ -0,0 +1,120 @@
+import asyncio
+import threading
+
+import pytest
+
+from advisor.coalesce import SearchCoalescer
+
+class FakeEngine:
+    """search_batch mengembalikan user_input per request dan mencatat ukuran setiap batch."""
+    def __init__(self, fail_on=None):
+        self.batches = []
+        self.fail_on = fail_on
+
+    def search_batch(self, requests):
+        self.batches.append(len(requests))
+        if any(request['user_input'] == self.fail_on for request in requests):
+            raise ValueError('skor gagal')
+        return [self.search(**request) for request in requests]
+
+    def search(self, user_input, program=None, semester=None, selected_keywords=None, top_n=10, page=0, page_size=None):
+        if user_input == self.fail_on:
+            raise ValueError('skor gagal')
+        return f"hasil {user_input} p{page}"
+
+def test_concurrent_searches_share_one_batch():
+    engine = FakeEngine()
+
+    async def run():
+        coalescer = SearchCoalescer(lambda: engine, max_wait=0.05)
+        results = await asyncio.gather(*(coalescer.search(f"q{i}", page=i % 2) for i in range(5)))
+        await coalescer.aclose()
+        return results
+
+    assert asyncio.run(run()) == [f"hasil q{i} p{i % 2}" for i in range(5)]
+    assert engine.batches == [5]
+
+def test_max_batch_splits_requests():
+    engine = FakeEngine()
+
+    async def run():
+        coalescer = SearchCoalescer(lambda: engine, max_batch=2, max_wait=0.05)
+        results = await asyncio.gather(*(coalescer.search(f"q{i}") for i in range(5)))
+        await coalescer.aclose()
+        return results
+
+    assert asyncio.run(run()) == [f"hasil q{i} p0" for i in range(5)]
+    assert engine.batches == [2, 2, 1]
+
+def test_bad_request_fails_only_its_own_caller():
+    engine = FakeEngine(fail_on='rusak')
+
+    async def run():
+        coalescer = SearchCoalescer(lambda: engine, max_wait=0.05)
+        mixed = await asyncio.gather(coalescer.search('ok'), coalescer.search('rusak'), coalescer.search('juga', page=2),
+                                     return_exceptions=True)
+        alone = await asyncio.gather(coalescer.search('rusak'), return_exceptions=True)
+        after = await coalescer.search('lagi')
+        await coalescer.aclose()
+        return mixed, alone, after
+
+    mixed, alone, after = asyncio.run(run())
+    assert mixed[0] == 'hasil ok p0' and mixed[2] == 'hasil juga p2'
+    assert isinstance(mixed[1], ValueError) and isinstance(alone[0], ValueError)
+    assert engine.batches == [3, 1, 1]
+    assert after == 'hasil lagi p0'
+
+def test_engine_lookup_error_reaches_every_caller():
+    def broken_engine():
+        raise RuntimeError('snapshot hilang')
+
+    async def run():
+        coalescer = SearchCoalescer(broken_engine, max_wait=0.05)
+        results = await asyncio.gather(coalescer.search('a'), coalescer.search('b'), return_exceptions=True)
+        await coalescer.aclose()
+        return results
+
+    assert all(isinstance(error, RuntimeError) for error in asyncio.run(run()))
+
+def test_cancelled_caller_does_not_block_the_batch():
+    engine = FakeEngine()
+
+    async def run():
+        coalescer = SearchCoalescer(lambda: engine, max_wait=0.05)
+        cancelled = asyncio.ensure_future(coalescer.search('batal'))
+        kept = asyncio.ensure_future(coalescer.search('tetap'))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        result = await kept
+        await coalescer.aclose()
+        return result
+
+    assert asyncio.run(run()) == 'hasil tetap p0'
+
+def test_search_sync_from_threads():
+    engine = FakeEngine()
+    coalescer = SearchCoalescer(lambda: engine, max_wait=0.05)
+    results = {}
+
+    def worker(i):
+        results[i] = coalescer.search_sync(f"q{i}")
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    coalescer.close()
+    assert results == {i: f"hasil q{i} p0" for i in range(8)}
+    assert sum(engine.batches) == 8
+
+def test_coalescer_is_bound_to_one_loop():
+    engine = FakeEngine()
+    coalescer = SearchCoalescer(lambda: engine, max_wait=0.01)
+
+    async def run():
+        return await coalescer.search('q')
+
+    assert asyncio.run(run()) == 'hasil q p0'
+    with pytest.raises(RuntimeError):
+        asyncio.run(run())
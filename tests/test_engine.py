@@ -0,0 +1,30 @@
+import pytest
+
+from advisor.engine import RecommendationEngine
+from advisor.fuzzy import drop_negated_typos
+
+@pytest.fixture(scope='module')
+def engine():
+    return RecommendationEngine.from_csv()
+
+def test_drop_negated_typos_keeps_other_typos():
+    cleaned = drop_negated_typos(' ngodingg, suka desain desaint', [('ngodingg', 'ngoding'), ('desaint', 'desain')], ['ngoding'])
+    assert cleaned.split() == [',', 'suka', 'desain', 'desaint']
+
+@pytest.mark.parametrize('query, negated, excluded', [
+    ('benci ngodingg', 'ngoding', 'pemrograman'),
+    ('tidak suka bisniss', 'bisnis', 'pemasaran'),
+])
+def test_negated_typo_is_not_searched(engine, query, negated, excluded):
+    _, cleaned, words_to_remove, _ = engine.prepare(query)
+    assert words_to_remove == [negated]
+    assert not cleaned.strip()
+    result = engine.search(query)
+    assert not any(excluded in rec.course.lower() for rec in result.results)
+    (batch_words, batch_rows), = engine.recommend_batch([query])
+    assert batch_words == [negated] and not batch_rows
+
+def test_typo_outside_negation_is_still_corrected(engine):
+    result = engine.search('saya suka ngodingg')
+    assert result.messages[0].text.endswith('ngodingg → ngoding')
+    assert any('pemrograman' in rec.course.lower() for rec in result.results)
@@ -0,0 +1,69 @@
+import glob
+import os
+import threading
+
+from advisor.metrics import METRICS
+from advisor.querylog import SEGMENT_PATTERN, QueryLog, aggregate, read_events
+
+def test_events_are_written_in_order(tmp_path):
+    log = QueryLog(str(tmp_path))
+    for i in range(50):
+        log.log('search', query=f"q{i}", total=i)
+    log.flush()
+    events = list(read_events([str(tmp_path)]))
+    assert [event['query'] for event in events] == [f"q{i}" for i in range(50)]
+    assert log.stats()['written'] == 50
+    log.close()
+
+def test_segments_rotate_with_summary_line(tmp_path):
+    log = QueryLog(str(tmp_path), max_batch=1, segment_bytes=300)
+    for i in range(20):
+        log.log('search', query=f"query nomor {i}")
+        log.flush()
+    log.close()
+    segments = sorted(glob.glob(os.path.join(str(tmp_path), SEGMENT_PATTERN)))
+    assert len(segments) > 1 and log.stats()['segments'] == len(segments)
+    for segment in segments:
+        events = list(read_events([segment]))
+        assert events[-1]['event'] == 'querylog'
+    searches = [event for event in read_events([str(tmp_path)]) if event['event'] == 'search']
+    assert [event['query'] for event in searches] == [f"query nomor {i}" for i in range(20)]
+
+def test_full_queue_drops_and_counts(tmp_path):
+    log = QueryLog(str(tmp_path), max_queue=10)
+    writing, release = threading.Event(), threading.Event()
+    write = log._write
+
+    def blocked_write(data):
+        writing.set()
+        release.wait()
+        write(data)
+
+    log._write = blocked_write
+    dropped_before = METRICS.to_json()['counters'].get('querylog_dropped', 0)
+    log.log('search', query='pertama')
+    # Penulis tertahan di event pertama, jadi antrian terisi sampai penuh
+    writing.wait()
+    for i in range(15):
+        log.log('search', query=f"q{i}")
+    assert log.dropped == 5
+    assert METRICS.to_json()['counters']['querylog_dropped'] - dropped_before == 5
+
+    release.set()
+    log.close()
+    # 11 pencarian + event ringkasan dari close()
+    assert log.stats()['written'] == 12
+    report = aggregate(read_events([str(tmp_path)]))
+    assert report['searches'] == 11
+    assert report['dropped_events'] == 5
+
+def test_truncated_line_is_skipped(tmp_path):
+    log = QueryLog(str(tmp_path))
+    log.log('search', query='utuh', total=0)
+    log.close()
+    segment, = glob.glob(os.path.join(str(tmp_path), SEGMENT_PATTERN))
+    with open(segment, 'ab') as f:
+        f.write(b'{"event":"search","query":"terpo')
+    report = aggregate(read_events([str(tmp_path)]))
+    assert report['top_queries'] == [('utuh', 1)]
+    assert report['zero_result_queries'] == [('utuh', 1)]
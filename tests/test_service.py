@@ -0,0 +1,76 @@
+import http.client
+import json
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from advisor.coalesce import SearchCoalescer
+from advisor.engine import SearchResult
+from advisor.service import ServiceHandler, parse_search_request
+
+class FakeEngine:
+    version = 'v1'
+
+    def __init__(self):
+        self.requests = []
+
+    def search_batch(self, requests):
+        self.requests.extend(requests)
+        if any(request['user_input'] == 'meledak' for request in requests):
+            raise RuntimeError('skor gagal')
+        return [SearchResult([], [], [], 0, request['page']) for request in requests]
+
+class FakeFollower:
+    def __init__(self, engine):
+        self.engine = engine
+
+    def current(self):
+        return self.engine
+
+@pytest.fixture
+def service():
+    engine = FakeEngine()
+    coalescer = SearchCoalescer(lambda: engine, max_wait=0.001)
+    handler = type('TestServiceHandler', (ServiceHandler,), {'follower': FakeFollower(engine), 'coalescer': coalescer})
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server, engine
+    server.shutdown()
+    server.server_close()
+    coalescer.close()
+
+def post(server, path, payload):
+    connection = http.client.HTTPConnection(*server.server_address, timeout=5)
+    try:
+        connection.request('POST', path, json.dumps(payload).encode('utf-8'), {'Content-Type': 'application/json'})
+        response = connection.getresponse()
+        return response.status, json.loads(response.read())
+    finally:
+        connection.close()
+
+@pytest.mark.parametrize('payload', [
+    {'user_input': 'data', 'program': ['Informatika']},
+    {'user_input': 'data', 'program': 3},
+    {'user_input': 'data', 'selected_keywords': 'coding'},
+    {'user_input': 'data', 'semester': [1]},
+    {'user_input': ['data']},
+    {'user_input': 'data', 'warna': 'biru'},
+])
+def test_invalid_search_request_is_rejected(payload):
+    with pytest.raises((ValueError, TypeError)):
+        parse_search_request(json.dumps(payload).encode('utf-8'))
+
+def test_invalid_program_returns_400_without_reaching_engine(service):
+    server, engine = service
+    status, body = post(server, '/search', {'user_input': 'data', 'program': ['a']})
+    assert status == 400 and 'program' in body['error']
+    assert engine.requests == []
+
+def test_unexpected_error_returns_json_500(service):
+    server, engine = service
+    status, body = post(server, '/search', {'user_input': 'meledak'})
+    assert status == 500 and 'RuntimeError' in body['error']
+    status, body = post(server, '/search', {'user_input': 'data', 'program': 'Informatika', 'page': 1})
+    assert status == 200 and body['page'] == 1